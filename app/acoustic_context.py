@@ -0,0 +1,76 @@
+"""작업 단위 음향 분석 컨텍스트
+
+같은 오디오에 대해 SoundAnalyzer(음량/음높이 등급)와 불안도 음성 특징이
+각자 Sound / Pitch / Intensity / PointProcess를 다시 계산하지 않도록,
+Praat 객체를 파라미터 조합별로 한 번만 계산하고 공유합니다.
+여러 분석 단계가 동시에 접근해도 같은 객체는 한 번만 계산됩니다 (스레드 안전).
+
+Pitch / PointProcess는 (pitch_floor, pitch_ceiling)을 키로 따로 캐시합니다.
+억양 등급(SoundAnalyzer, scoring.acoustic_features)은 Praat 기본값 75-600Hz,
+불안도 음성 특징(anxiety.voice_feature)은 75-500Hz를 써서 두 Pitch는 일부러 별개이며,
+한쪽 설정을 바꾸면 등급/저장된 특징이 달라지므로 맞추지 않습니다.
+두 분석이 함께 쓰는 것은 Sound이고, 같은 설정끼리는 Pitch/Intensity/PointProcess도 공유합니다.
+"""
+import threading
+
+import numpy as np
+import parselmouth
+from parselmouth.praat import call
+
+
+class AcousticContext:
+    def __init__(self, audio: np.ndarray, sample_rate: float):
+        """audio: mono PCM 배열, sample_rate: 샘플링 레이트"""
+        self._audio = audio
+        self.sample_rate = sample_rate
+        self._cache = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_sound(cls, snd: parselmouth.Sound) -> "AcousticContext":
+        """이미 로딩된 parselmouth.Sound로 컨텍스트 생성"""
+        context = cls(None, snd.sampling_frequency)
+        context._cache[("sound",)] = snd
+        return context
+
+    def _memo(self, key: tuple, factory):
+        if key in self._cache:
+            return self._cache[key]
+        with self._lock:
+            lock = self._locks.setdefault(key, threading.Lock())
+        with lock:
+            if key not in self._cache:
+                self._cache[key] = factory()
+            return self._cache[key]
+
+    @property
+    def sound(self) -> parselmouth.Sound:
+        return self._memo(
+            ("sound",),
+            lambda: parselmouth.Sound(self._audio.astype(np.float64), sampling_frequency=self.sample_rate),
+        )
+
+    def pitch(self, pitch_floor: float = 75.0, pitch_ceiling: float = 600.0) -> parselmouth.Pitch:
+        """Sound.to_pitch (autocorrelation), 기본값은 parselmouth 기본값과 동일"""
+        return self._memo(
+            ("pitch", pitch_floor, pitch_ceiling),
+            lambda: self.sound.to_pitch(pitch_floor=pitch_floor, pitch_ceiling=pitch_ceiling),
+        )
+
+    def intensity(self, minimum_pitch: float = 100.0) -> parselmouth.Intensity:
+        """Sound.to_intensity, 기본값은 parselmouth 기본값과 동일"""
+        return self._memo(
+            ("intensity", minimum_pitch),
+            lambda: self.sound.to_intensity(minimum_pitch=minimum_pitch),
+        )
+
+    def point_process(self, pitch_floor: float, pitch_ceiling: float):
+        """
+        주기 PointProcess
+        "To PointProcess (periodic, cc)"와 같은 결과이지만 같은 설정의 Pitch를 재사용
+        """
+        return self._memo(
+            ("point_process", pitch_floor, pitch_ceiling),
+            lambda: call([self.sound, self.pitch(pitch_floor, pitch_ceiling)], "To PointProcess (cc)"),
+        )
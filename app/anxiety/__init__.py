@@ -1,4 +1,6 @@
 """불안도 분석 모듈"""
-from .anxiety_score import anxiety_analysis
+from .anxiety_score import (
+    anxiety_analysis, extract_visual_anxiety_features, combine_anxiety_features, visual_features_from_series,
+)
 
-__all__ = ['anxiety_analysis']
+__all__ = ['anxiety_analysis', 'extract_visual_anxiety_features', 'combine_anxiety_features', 'visual_features_from_series']
@@ -110,38 +110,75 @@ def get_anxiety_grade(density_ratio: float):
     else:                       
         return "A", "매우 안정"
     
-def anxiety_analysis(video_file_path: str, audio_path: str, window_size: float = 1.0):
-    """불안도 분석 메인 함수"""
+def extract_visual_anxiety_features(video_file_path: str, window_size: float = 1.0, executor=None):
+    """
+    영상에서 윈도우별 눈깜빡임 / 머리 움직임 스파이크 횟수 추출
+    executor(프로세스풀)를 주면 긴 영상을 구간별로 나누어 병렬 분석
+    """
+    ear_series, head_movement_per_frame, fps = extract_visual_features(video_file_path, executor=executor)
+    return visual_features_from_series(ear_series, head_movement_per_frame, fps, window_size=window_size)
+
+
+def visual_features_from_series(ear_series, head_movement_per_frame, fps: float, window_size: float = 1.0):
+    """
+    프레임별 EAR / 머리 움직임 시계열로 윈도우별 눈깜빡임 / 머리 움직임 스파이크 횟수 계산
+    (저장된 시계열로 재채점할 때도 사용, 영상 분석에 실패했으면 None)
+    """
+    if ear_series is None or head_movement_per_frame is None:
+        return None
+    blink_series, _, _ = analyze_blinks_from_ear_series(ear_series, fps, window_size=window_size)
+    head_spikes_series, _ = analyze_head_movement_spikes(head_movement_per_frame, fps, window_size=window_size)
+    return blink_series, head_spikes_series
+
+
+def combine_anxiety_features(voice_features, visual_features=None, is_audio_only: bool = False):
+    """
+    음성 특징 (f0, jitter, shimmer)과 시각 특징 (blink, head)을 합쳐 불안 점수 계산
+    is_audio_only이면 시각 특징 없이 음성만으로 계산
+    """
+    if voice_features is None or (visual_features is None and not is_audio_only):
+        # 특징 추출 단계가 실패한 경우
+        return "N/A", "분석 실패", 0, np.array([]), 0.0
+
+    f0_series, jitter_series, shimmer_series = voice_features
+    if not is_audio_only:
+        blink_series, head_spikes_series = visual_features
+    else:
+        blink_series = np.zeros(len(f0_series))
+        head_spikes_series = np.zeros(len(f0_series))
+
+    min_len = min(len(f0_series), len(blink_series), len(head_spikes_series))
+
+    return calculate_anxiety_scores(
+        blink_series[:min_len],
+        f0_series[:min_len],
+        jitter_series[:min_len],
+        shimmer_series[:min_len],
+        head_spikes_series[:min_len],
+        is_audio_only=is_audio_only
+    )
+
+
+def anxiety_analysis(video_file_path: str, audio, window_size: float = 1.0, sample_rate: float = None):
+    """
+    불안도 분석 메인 함수
+    audio: 파일 경로, mono PCM 배열 (배열이면 sample_rate 필요) 또는 AcousticContext
+    """
     is_audio_only = video_file_path.lower().endswith(".wav")
 
     try:
         # --- 1. 음성 특징 추출 ---
-        f0_series, jitter_series, shimmer_series = extract_features_by_window(
-            audio_path, window_size=window_size
+        voice_features = extract_features_by_window(
+            audio, window_size=window_size, sample_rate=sample_rate
         )
 
         # --- 2. 시각 특징 추출 ---
+        visual_features = None
         if not is_audio_only:
-            ear_series, head_movement_per_frame, fps = extract_visual_features(video_file_path)
-            blink_series, _, _ = analyze_blinks_from_ear_series(ear_series, fps, window_size=window_size)
-            head_spikes_series, _ = analyze_head_movement_spikes(head_movement_per_frame, fps, window_size=window_size)
-        else:
-            blink_series = np.zeros(len(f0_series))
-            head_spikes_series = np.zeros(len(f0_series))
-
-        min_len = min(len(f0_series), len(blink_series), len(head_spikes_series))
+            visual_features = extract_visual_anxiety_features(video_file_path, window_size=window_size)
 
         # --- 3. 불안 점수 측정 ---
-        result = calculate_anxiety_scores(
-            blink_series[:min_len],
-            f0_series[:min_len],
-            jitter_series[:min_len],
-            shimmer_series[:min_len],
-            head_spikes_series[:min_len],
-            is_audio_only=is_audio_only
-        )
-
-        return result
+        return combine_anxiety_features(voice_features, visual_features, is_audio_only=is_audio_only)
 
     except Exception as e:
         print(f"불안도 분석 중 오류 발생: {e}")
@@ -150,21 +187,18 @@ def anxiety_analysis(video_file_path: str, audio_path: str, window_size: float =
 
 if __name__ == "__main__":
 
-    import os
-    from pydub import AudioSegment
-    
+    from config import ANALYSIS_SAMPLE_RATE
+    from utils.audio import decode_audio
+
     VIDEO_FILE_PATH = "./sample_voices/FER_sample.mp4"
     WINDOW_SIZE = 1.0
-    TEMP_AUDIO_PATH = "temp_audio_for_analysis.wav"
 
     try:
-        # 오디오 추출
-        audio = AudioSegment.from_file(VIDEO_FILE_PATH, format="mp4")
-        audio = audio.set_channels(1)
-        audio.export(TEMP_AUDIO_PATH, format="wav")
-        
+        # 오디오 추출 (임시 wav 없이 메모리로 디코딩)
+        audio = decode_audio(VIDEO_FILE_PATH, ANALYSIS_SAMPLE_RATE)
+
         anxiety_grade, anxiety_comment, final_score, anxiety_series, strong_events_ratio = anxiety_analysis(
-            VIDEO_FILE_PATH, TEMP_AUDIO_PATH, window_size=WINDOW_SIZE
+            VIDEO_FILE_PATH, audio, window_size=WINDOW_SIZE, sample_rate=ANALYSIS_SAMPLE_RATE
         )
 
         print("\n--- 최종 분석 결과 ---")
@@ -175,10 +209,4 @@ if __name__ == "__main__":
 
 
     except Exception as e:
-        print(f"\n프로세스 중 심각한 오류 발생: {e}")
-
-    finally:
-        # --- [단계 7] 임시 오디오 파일 삭제 ---
-        if os.path.exists(TEMP_AUDIO_PATH):
-            os.remove(TEMP_AUDIO_PATH)
-            print(f"\n임시 오디오 파일 '{TEMP_AUDIO_PATH}' 삭제 완료.")
\ No newline at end of file
+        print(f"\n프로세스 중 심각한 오류 발생: {e}")
\ No newline at end of file
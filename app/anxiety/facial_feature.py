@@ -3,104 +3,335 @@ import mediapipe as mp
 import numpy as np
 import math
 import os
+import queue
+import threading
+from concurrent.futures import BrokenExecutor
 from scipy.signal import find_peaks
 
+from config import (
+    FACE_MESH_POOL_SIZE, VISUAL_ANALYSIS_FPS, VISUAL_MAX_WIDTH, VISUAL_ROI_MARGIN,
+    VISUAL_SHARD_SECONDS, VISUAL_SHARD_OVERLAP_SECONDS, VISUAL_FRAME_QUEUE_SIZE,
+)
+from model_registry import ObjectPool
+
 # --- MediaPipe 설정 ---
 mp_face_mesh = mp.solutions.face_mesh
 mp_drawing = mp.solutions.drawing_utils
 
+def create_face_mesh():
+    # 풀의 인스턴스는 여러 작업/구간에서 재사용되고 매번 다른 크기의 얼굴 영역(ROI)을 받으므로
+    # 이전 입력의 추적 상태가 남지 않도록 프레임마다 독립적으로 검출 (static_image_mode)
+    return mp_face_mesh.FaceMesh(
+        static_image_mode=True,
+        max_num_faces=1,
+        refine_landmarks=True,
+        min_detection_confidence=0.5
+    )
+
+# 작업마다 그래프를 새로 만들지 않도록 프로세스 안에서 재사용
+face_mesh_pool = ObjectPool(create_face_mesh, FACE_MESH_POOL_SIZE)
+
+def warmup_face_mesh_pool():
+    """영상 분석 워커 프로세스 시작 시 FaceMesh 인스턴스를 미리 생성 (ProcessPoolExecutor initializer)"""
+    face_mesh_pool.fill()
+
+def face_mesh_worker_ready(barrier, timeout: float = 600) -> int:
+    """
+    영상 분석 워커 준비 확인용 작업 (initializer가 끝난 프로세스에서만 실행됨)
+    워커 수만큼 제출하면 모두 barrier에서 만나야 끝나므로 작업마다 서로 다른 프로세스에서 실행됨
+    반환: 프로세스 id
+    """
+    barrier.wait(timeout)
+    return os.getpid()
+
 # --- 랜드마크 인덱스 ---
 LEFT_EYE_INDICES = [362, 385, 387, 263, 373, 380]
 RIGHT_EYE_INDICES = [33, 160, 158, 133, 153, 144]
 NOSE_TIP_INDEX = 1
 
+# EAR / 머리 움직임 계산에 필요한 랜드마크만 (프레임, len(LANDMARK_INDICES), 2) 배열로 모아서 한 번에 계산
+LANDMARK_INDICES = RIGHT_EYE_INDICES + LEFT_EYE_INDICES + [NOSE_TIP_INDEX]
+RIGHT_EYE_SLICE = slice(0, 6)
+LEFT_EYE_SLICE = slice(6, 12)
+NOSE_TIP_SLOT = 12
+DEFAULT_EAR = 0.3  # 첫 얼굴이 감지되기 전까지 사용할 EAR
+
 # --- 헬퍼 함수 ---
-def get_landmark_point_2d(landmarks, idx, frame_shape):
-    if not landmarks or idx >= len(landmarks): return None
-    landmark = landmarks[idx]
-    x = landmark.x * frame_shape[1]
-    y = landmark.y * frame_shape[0]
-    return (int(x), int(y))
-
-def euclidean_distance(point1, point2):
-    if point1 is None or point2 is None: return 0.0
-    return math.sqrt((point1[0] - point2[0])**2 + (point1[1] - point2[1])**2)
-
-def calculate_ear(face_landmarks, frame_shape):
-    if not face_landmarks: return 0.0
-    try:
-        p1_right = get_landmark_point_2d(face_landmarks, RIGHT_EYE_INDICES[3], frame_shape)
-        p4_right = get_landmark_point_2d(face_landmarks, RIGHT_EYE_INDICES[0], frame_shape)
-        p2_right = get_landmark_point_2d(face_landmarks, RIGHT_EYE_INDICES[1], frame_shape)
-        p6_right = get_landmark_point_2d(face_landmarks, RIGHT_EYE_INDICES[5], frame_shape)
-        p3_right = get_landmark_point_2d(face_landmarks, RIGHT_EYE_INDICES[2], frame_shape)
-        p5_right = get_landmark_point_2d(face_landmarks, RIGHT_EYE_INDICES[4], frame_shape)
-        if None in [p1_right, p2_right, p3_right, p4_right, p5_right, p6_right]: right_ear = 0.0
-        else:
-            right_vertical_dist1 = euclidean_distance(p2_right, p6_right)
-            right_vertical_dist2 = euclidean_distance(p3_right, p5_right)
-            right_horizontal_dist = euclidean_distance(p1_right, p4_right)
-            right_ear = (right_vertical_dist1 + right_vertical_dist2) / (2.0 * right_horizontal_dist) if right_horizontal_dist else 0.0
-
-        p1_left = get_landmark_point_2d(face_landmarks, LEFT_EYE_INDICES[3], frame_shape)
-        p4_left = get_landmark_point_2d(face_landmarks, LEFT_EYE_INDICES[0], frame_shape)
-        p2_left = get_landmark_point_2d(face_landmarks, LEFT_EYE_INDICES[1], frame_shape)
-        p6_left = get_landmark_point_2d(face_landmarks, LEFT_EYE_INDICES[5], frame_shape)
-        p3_left = get_landmark_point_2d(face_landmarks, LEFT_EYE_INDICES[2], frame_shape)
-        p5_left = get_landmark_point_2d(face_landmarks, LEFT_EYE_INDICES[4], frame_shape)
-        if None in [p1_left, p2_left, p3_left, p4_left, p5_left, p6_left]: left_ear = 0.0
-        else:
-            left_vertical_dist1 = euclidean_distance(p2_left, p6_left)
-            left_vertical_dist2 = euclidean_distance(p3_left, p5_left)
-            left_horizontal_dist = euclidean_distance(p1_left, p4_left)
-            left_ear = (left_vertical_dist1 + left_vertical_dist2) / (2.0 * left_horizontal_dist) if left_horizontal_dist else 0.0
-
-        if right_ear > 0 and left_ear > 0: ear = (left_ear + right_ear) / 2.0
-        elif right_ear > 0: ear = right_ear
-        elif left_ear > 0: ear = left_ear
-        else: ear = 0.0
-    except IndexError: ear = 0.0
-    return ear
+def _pairwise_distance(points: np.ndarray, i: int, j: int) -> np.ndarray:
+    """(프레임, 점, 2) 배열에서 프레임마다 i번째 점과 j번째 점 사이 거리"""
+    diff = points[:, i].astype(np.float64) - points[:, j].astype(np.float64)
+    return np.sqrt(diff[:, 0] ** 2 + diff[:, 1] ** 2)
+
+def _eye_aspect_ratio(eye: np.ndarray) -> np.ndarray:
+    """눈 랜드마크 6개 (프레임, 6, 2) → 프레임별 EAR (가로 길이가 0이면 0)"""
+    vertical = _pairwise_distance(eye, 1, 5) + _pairwise_distance(eye, 2, 4)
+    horizontal = _pairwise_distance(eye, 3, 0)
+    return np.divide(vertical, 2.0 * horizontal, out=np.zeros(len(eye)), where=horizontal > 0)
+
+def calculate_ear_series(points: np.ndarray) -> np.ndarray:
+    """
+    샘플별 EAR (양쪽 눈 평균, 한쪽만 유효하면 그 값)
+    얼굴이 감지되지 않은 샘플(NaN)은 직전에 유효했던 EAR을 사용
+    """
+    if len(points) == 0:
+        return np.zeros(0)
+    detected = ~np.isnan(points[:, NOSE_TIP_SLOT, 0])
+    filled = np.nan_to_num(points)
+    right = _eye_aspect_ratio(filled[:, RIGHT_EYE_SLICE])
+    left = _eye_aspect_ratio(filled[:, LEFT_EYE_SLICE])
+    ear = np.where(
+        (right > 0) & (left > 0), (left + right) / 2.0,
+        np.where(right > 0, right, np.where(left > 0, left, 0.0)),
+    )
+
+    # 미감지 샘플: 그 이전까지 0보다 컸던 마지막 EAR (없으면 DEFAULT_EAR)
+    good = detected & (ear > 0)
+    last_good = np.maximum.accumulate(np.where(good, np.arange(len(ear)), -1))
+    carried = np.where(last_good >= 0, ear[np.maximum(last_good, 0)], DEFAULT_EAR)
+    return np.where(detected, ear, carried)
+
+def calculate_nose_displacement(frame_indices: np.ndarray, nose_points: np.ndarray, total_frames: int) -> np.ndarray:
+    """
+    샘플 프레임의 코끝 좌표 (샘플, 2)를 모든 프레임으로 선형 보간했을 때의 프레임 간 이동 거리
+    두 샘플 사이 이동량은 사이 프레임들에 균등 분배하고, 미감지(NaN) 샘플과 맞닿은 구간은 0
+    """
+    displacement = np.zeros(total_frames)
+    if len(frame_indices) < 2:
+        return displacement
+    pairs = np.stack([nose_points[1:], nose_points[:-1]], axis=1)
+    step_distance = _pairwise_distance(pairs, 0, 1) / np.diff(frame_indices)
+    # 프레임 f (frame_indices[k-1] < f <= frame_indices[k])는 k번째 구간 값
+    per_segment = np.concatenate(([0.0], np.nan_to_num(step_distance, nan=0.0), [0.0]))
+    segment = np.searchsorted(frame_indices, np.arange(total_frames), side="left")
+    displacement[:] = per_segment[segment]
+    return displacement
 
 # --- 시각 특징 추출 함수 ---
-def extract_visual_features(video_path: str):
+def _face_box(landmarks, crop_box):
+    """랜드마크 전체를 감싸는 원본 프레임 기준 박스 (x0, y0, x1, y1)"""
+    x0, y0, x1, y1 = crop_box
+    xs = [lm.x for lm in landmarks]
+    ys = [lm.y for lm in landmarks]
+    w, h = x1 - x0, y1 - y0
+    return (x0 + min(xs) * w, y0 + min(ys) * h, x0 + max(xs) * w, y0 + max(ys) * h)
+
+def _expand_box(face_box, frame_shape, margin: float):
+    """얼굴 박스를 margin 비율만큼 넓혀 프레임 안으로 자른 정수 박스"""
+    fx0, fy0, fx1, fy1 = face_box
+    mx = (fx1 - fx0) * margin
+    my = (fy1 - fy0) * margin
+    x0 = max(0, int(fx0 - mx))
+    y0 = max(0, int(fy0 - my))
+    x1 = min(frame_shape[1], int(fx1 + mx) + 1)
+    y1 = min(frame_shape[0], int(fy1 + my) + 1)
+    if x1 - x0 < 16 or y1 - y0 < 16:
+        return None
+    return (x0, y0, x1, y1)
+
+def _run_face_mesh(face_mesh, frame, crop_box, max_width: int):
+    """
+    frame의 crop_box 영역을 (필요 시 축소해서) FaceMesh에 넣고 첫 얼굴의 랜드마크 반환
+    랜드마크 좌표는 crop_box 기준 정규화 좌표
+    """
+    x0, y0, x1, y1 = crop_box
+    crop = frame[y0:y1, x0:x1]
+    if max_width and crop.shape[1] > max_width:
+        scale = max_width / crop.shape[1]
+        crop = cv2.resize(crop, (max_width, max(1, int(crop.shape[0] * scale))), interpolation=cv2.INTER_AREA)
+    rgb_frame = cv2.cvtColor(crop, cv2.COLOR_BGR2RGB)
+    rgb_frame.flags.writeable = False
+    results = face_mesh.process(rgb_frame)
+    if not results.multi_face_landmarks:
+        return None
+    return results.multi_face_landmarks[0].landmark
+
+def _landmark_points(landmarks, crop_box) -> np.ndarray:
+    """
+    LANDMARK_INDICES 랜드마크의 원본 프레임 픽셀 좌표 (len(LANDMARK_INDICES), 2)
+    crop 크기 기준으로 정수 픽셀로 자른 뒤 crop 위치만큼 이동 (EAR은 이동에 무관)
+    """
+    x0, y0, x1, y1 = crop_box
+    normalized = np.array([(landmarks[i].x, landmarks[i].y) for i in LANDMARK_INDICES])
+    return np.trunc(normalized * (x1 - x0, y1 - y0)) + (x0, y0)
+
+def _put_until_stopped(frames: queue.Queue, item, stop: threading.Event) -> bool:
+    while not stop.is_set():
+        try:
+            frames.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+def _open_at(video_path: str, start: int):
+    """
+    start 프레임부터 읽도록 연 VideoCapture
+    프레임 간 압축된 영상은 탐색 위치가 정확하지 않을 수 있으므로, 탐색 후 위치가 start가 아니면
+    처음부터 grab으로 순서대로 이동 (프레임 인덱스가 실제 프레임과 어긋나지 않도록)
+    """
     cap = cv2.VideoCapture(video_path)
-    if not cap.isOpened(): return None, None, 0
+    if start > 0 and cap.isOpened():
+        cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+        if int(cap.get(cv2.CAP_PROP_POS_FRAMES)) != start:
+            cap.release()
+            cap = cv2.VideoCapture(video_path)
+            for _ in range(start):
+                if not cap.grab(): break
+    return cap
+
+def _decode_frames(video_path: str, start: int, end, step: int, frames: queue.Queue, stop: threading.Event):
+    """
+    디코딩 스레드: [start, end) 구간에서 step 배수 프레임만 꺼내 (frame_index, frame)으로 큐에 넣음
+    끝나면 (다음 프레임 인덱스, None)을 넣어 종료를 알림 (end가 None이면 영상 끝까지)
+    """
+    cap = _open_at(video_path, start)
+    index = start
+    try:
+        while cap.isOpened() and (end is None or index < end) and not stop.is_set():
+            if index % step != 0:
+                # 분석하지 않는 프레임은 디코딩 결과를 꺼내지 않음
+                if not cap.grab(): break
+            else:
+                ret, frame = cap.read()
+                if not ret: break
+                if not _put_until_stopped(frames, (index, frame), stop): break
+            index += 1
+    finally:
+        cap.release()
+        _put_until_stopped(frames, (index, None), stop)
+
+def _landmark_shard(video_path: str, start: int, end, keep_from: int, step: int, max_width: int, use_roi: bool,
+                    capacity: int = 0):
+    """
+    [start, end) 프레임 구간 분석 (프로세스풀에서 실행 가능)
+    디코딩은 별도 스레드에서 미리 진행하고 이 스레드는 FaceMesh만 실행
+    keep_from 이전 프레임은 얼굴 추적 준비용(겹침 구간)으로만 쓰고 결과에서 제외
+    반환: (샘플 프레임 인덱스, 랜드마크 배열 (샘플, len(LANDMARK_INDICES), 2) - 미감지는 NaN,
+           마지막 프레임 다음 인덱스)
+    """
+    frames = queue.Queue(maxsize=VISUAL_FRAME_QUEUE_SIZE)
+    stop = threading.Event()
+    decoder = threading.Thread(target=_decode_frames, args=(video_path, start, end, step, frames, stop), daemon=True)
+    decoder.start()
+
+    frame_indices = np.zeros(max(capacity, 1), dtype=np.int64)
+    points = np.full((max(capacity, 1), len(LANDMARK_INDICES), 2), np.nan, dtype=np.float32)
+    count = 0
+    end_index = start
+    try:
+        with face_mesh_pool.checkout() as face_mesh:
+            roi_box = None
+            while True:
+                frame_index, frame = frames.get()
+                if frame is None:
+                    end_index = frame_index
+                    break
+
+                full_box = (0, 0, frame.shape[1], frame.shape[0])
+                crop_box = roi_box if use_roi and roi_box else full_box
+                landmarks = _run_face_mesh(face_mesh, frame, crop_box, max_width)
+                if landmarks is None and crop_box != full_box:
+                    crop_box = full_box
+                    landmarks = _run_face_mesh(face_mesh, frame, crop_box, max_width)
+                if landmarks is not None:
+                    roi_box = _expand_box(_face_box(landmarks, crop_box), frame.shape, VISUAL_ROI_MARGIN)
+                else:
+                    roi_box = None
+
+                if frame_index < keep_from:
+                    continue
+                if count == len(frame_indices):
+                    # 프레임 수 추정이 틀린 경우에만 두 배로 확장
+                    frame_indices = np.concatenate([frame_indices, np.zeros_like(frame_indices)])
+                    points = np.concatenate([points, np.full_like(points, np.nan)])
+                frame_indices[count] = frame_index
+                if landmarks is not None:
+                    points[count] = _landmark_points(landmarks, crop_box)
+                count += 1
+    finally:
+        stop.set()
+        decoder.join()
+
+    return frame_indices[:count], points[:count], end_index
+
+def extract_landmarks(
+    video_path: str,
+    analysis_fps: float = VISUAL_ANALYSIS_FPS,
+    max_width: int = VISUAL_MAX_WIDTH,
+    use_roi: bool = True,
+    executor=None,
+    shard_seconds: float = VISUAL_SHARD_SECONDS,
+):
+    """
+    영상의 샘플 프레임마다 LANDMARK_INDICES 랜드마크 좌표 추출
+
+    - analysis_fps: FaceMesh를 실행할 프레임 레이트 (0이면 모든 프레임), 나머지 프레임은 디코딩만 건너뜀(grab)
+    - max_width: FaceMesh 입력 이미지 최대 가로 길이 (0이면 원본 크기)
+    - use_roi: 직전 샘플의 얼굴 주변만 잘라서 FaceMesh 실행 (놓치면 전체 프레임에서 재탐색)
+    - executor: 주어지면 영상을 shard_seconds 길이 구간으로 나누어 병렬 분석 (프로세스풀 권장)
+      각 구간은 앞 구간과 VISUAL_SHARD_OVERLAP_SECONDS만큼 겹쳐 읽어 얼굴 추적 상태를 준비
+    반환: (샘플 프레임 인덱스, 랜드마크 배열 float32 (샘플, len(LANDMARK_INDICES), 2), 전체 프레임 수, fps)
+    좌표는 원본 프레임 픽셀 단위, 얼굴이 감지되지 않은 샘플은 NaN / 영상을 열 수 없으면 None
+    """
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened(): return None
     fps = cap.get(cv2.CAP_PROP_FPS)
     if fps == 0: fps = 30
-    ear_series = []
-    head_movement_per_frame = []
-    with mp_face_mesh.FaceMesh(
-        static_image_mode=False,
-        max_num_faces=1,
-        refine_landmarks=True,
-        min_detection_confidence=0.5
-    ) as face_mesh:
-        last_good_ear = 0.3
-        prev_nose_tip = None
-        while cap.isOpened():
-            ret, frame = cap.read()
-            if not ret: break
-            frame_shape = frame.shape
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            rgb_frame.flags.writeable = False
-            results = face_mesh.process(rgb_frame)
-            rgb_frame.flags.writeable = True
-            current_ear = last_good_ear
-            current_nose_tip = None
-            displacement = 0.0
-            if results.multi_face_landmarks:
-                landmarks = results.multi_face_landmarks[0].landmark
-                current_ear = calculate_ear(landmarks, frame_shape)
-                last_good_ear = current_ear if current_ear > 0 else last_good_ear
-                current_nose_tip = get_landmark_point_2d(landmarks, NOSE_TIP_INDEX, frame_shape)
-                if current_nose_tip and prev_nose_tip:
-                    displacement = euclidean_distance(current_nose_tip, prev_nose_tip)
-            ear_series.append(current_ear)
-            head_movement_per_frame.append(displacement)
-            prev_nose_tip = current_nose_tip
+    frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
     cap.release()
-    return np.array(ear_series), np.array(head_movement_per_frame), fps
+    step = max(1, int(round(fps / analysis_fps))) if analysis_fps > 0 else 1
+
+    # 구간 나누기 (프레임 수를 알 수 없거나 짧으면 한 구간, 마지막 구간은 영상 끝까지)
+    shard_frames = max(step, int(shard_seconds * fps) // step * step)
+    overlap_frames = int(VISUAL_SHARD_OVERLAP_SECONDS * fps)
+    if executor is None or frame_count <= 0:
+        bounds = [(0, None)]
+    else:
+        starts = list(range(0, frame_count, shard_frames))
+        bounds = [(s, s + shard_frames) for s in starts[:-1]] + [(starts[-1], None)]
+
+    shard_args = [
+        (video_path, max(0, start - overlap_frames), end, start, step, max_width, use_roi,
+         -(-((end or frame_count) - start) // step))
+        for start, end in bounds
+    ]
+    shards = None
+    if executor is not None:
+        try:
+            futures = [executor.submit(_landmark_shard, *args) for args in shard_args]
+            shards = [future.result() for future in futures]
+        except BrokenExecutor:
+            # 작업 프로세스가 비정상 종료된 경우 현재 프로세스에서 순차 처리
+            shards = None
+    if shards is None:
+        shards = [_landmark_shard(*args) for args in shard_args]
+
+    frame_indices = np.concatenate([shard[0] for shard in shards])
+    points = np.concatenate([shard[1] for shard in shards])
+    return frame_indices, points, shards[-1][2], fps
+
+def extract_visual_features(
+    video_path: str,
+    analysis_fps: float = VISUAL_ANALYSIS_FPS,
+    max_width: int = VISUAL_MAX_WIDTH,
+    use_roi: bool = True,
+    executor=None,
+    shard_seconds: float = VISUAL_SHARD_SECONDS,
+):
+    """
+    영상에서 프레임별 EAR / 머리 움직임(코끝 이동 거리) 추출 (인자는 extract_landmarks 참고)
+    샘플 사이 프레임의 EAR / 코끝 좌표는 선형 보간하므로,
+    반환 배열은 항상 원본 fps 기준 프레임 수 길이이고 깜빡임/머리 움직임 분석 함수는 그대로 사용
+    """
+    extracted = extract_landmarks(video_path, analysis_fps, max_width, use_roi, executor, shard_seconds)
+    if extracted is None: return None, None, 0
+    frame_indices, points, total_frames, fps = extracted
+    if len(frame_indices) == 0:
+        return np.array([]), np.array([]), fps
+
+    ear_series = np.interp(np.arange(total_frames), frame_indices, calculate_ear_series(points))
+    head_movement_per_frame = calculate_nose_displacement(frame_indices, points[:, NOSE_TIP_SLOT], total_frames)
+    return ear_series, head_movement_per_frame, fps
 
 # --- 깜빡임 분석 함수 ---
 def analyze_blinks_from_ear_series(ear_series: np.ndarray, fps: float, window_size: float = 1.0):
@@ -187,5 +418,25 @@ if __name__ == "__main__":
             print(f"   > 감지된 머리 움직임 스파이크 수: {len(head_spike_indices)}")
             print("\n--- Head Movement Spikes per Window ---")
             print(head_spikes_per_window) # 윈도우별 횟수 출력
+
+            # 4. 샘플링/ROI 분석 정확도: 모든 프레임을 원본 크기로 분석한 결과와 비교
+            import time
+            print("\n4. 전체 프레임 분석과 비교 중...")
+            started = time.perf_counter()
+            full_ear, full_head, _ = extract_visual_features(VIDEO_FILE_PATH, analysis_fps=0, max_width=0, use_roi=False)
+            full_time = time.perf_counter() - started
+            started = time.perf_counter()
+            extract_visual_features(VIDEO_FILE_PATH)
+            sampled_time = time.perf_counter() - started
+
+            full_blinks, full_peaks, _ = analyze_blinks_from_ear_series(full_ear, fps, window_size=WINDOW_SIZE)
+            full_head_spikes, _ = analyze_head_movement_spikes(full_head, fps, window_size=WINDOW_SIZE)
+            n = min(len(full_blinks), len(blinks_per_window))
+            m = min(len(full_head_spikes), len(head_spikes_per_window))
+            print(f"   > 소요 시간: 전체 {full_time:.1f}s / 샘플링 {sampled_time:.1f}s ({full_time / max(sampled_time, 1e-9):.1f}배)")
+            print(f"   > EAR 평균 절대 오차: {np.mean(np.abs(full_ear - ear_series)):.4f}")
+            print(f"   > 깜빡임 수: 전체 {len(full_peaks)} / 샘플링 {len(blink_peaks)}, "
+                  f"윈도우 일치율 {np.mean(full_blinks[:n] == blinks_per_window[:n]):.3f}")
+            print(f"   > 머리 움직임 스파이크 윈도우 일치율: {np.mean(full_head_spikes[:m] == head_spikes_per_window[:m]):.3f}")
     else:
         print(f"Error: '{VIDEO_FILE_PATH}' 파일을 찾을 수 없습니다.")
\ No newline at end of file
@@ -3,30 +3,98 @@ from parselmouth.praat import call
 import numpy as np
 import os
 
+from acoustic_context import AcousticContext
+from config import VOICE_FEATURE_MODE
+
 # Praat 분석을 위한 상수 정의
 PITCH_FLOOR = 75.0
-PITCH_CEILING = 500.0
+PITCH_CEILING = 500.0  # 억양 등급용 Pitch(75-600Hz)와 다른 설정 → AcousticContext에서 별도 키로 캐시
+PITCH_ANALYSIS_PERIODS = 3.0  # Praat autocorrelation Pitch 분석 창 길이 (PITCH_FLOOR 주기 수)
 
 # Jitter/Shimmer 계산은 '주파수(Hz)'가 아닌 '주기(sec)'를 인수로 받습니다.
 SHORTEST_PERIOD = 1.0 / PITCH_CEILING  # (1 / 500Hz)
 LONGEST_PERIOD = 1.0 / PITCH_FLOOR     # (1 / 75Hz)
 
-def extract_features_by_window(audio_path: str, window_size: float = 1.0):
-    """
-    오디오 파일을 window_size(초) 단위로 분할하여
-    각 구간의 평균 F0, Jitter(local), Shimmer(local)를 추출합니다.
-    """
-    
-    if not os.path.exists(audio_path):
-        print(f"Error: Audio file not found at {audio_path}")
-        return np.array([]), np.array([]), np.array([])
-        
+def load_context(audio, sample_rate: float = None):
+    """파일 경로, mono PCM 배열 또는 AcousticContext를 AcousticContext로 변환 (실패 시 None)"""
+    if isinstance(audio, AcousticContext):
+        return audio
+    if isinstance(audio, np.ndarray):
+        return AcousticContext(audio, sample_rate)
+
+    if not os.path.exists(audio):
+        print(f"Error: Audio file not found at {audio}")
+        return None
+
     try:
-        snd = parselmouth.Sound(audio_path)
+        return AcousticContext.from_sound(parselmouth.Sound(audio))
     except parselmouth.PraatError as e:
         print(f"Error loading audio file: {e}")
+        return None
+
+def extract_features_by_window(audio, window_size: float = 1.0, sample_rate: float = None, mode: str = VOICE_FEATURE_MODE):
+    """
+    오디오를 window_size(초) 단위로 분할하여
+    각 구간의 평균 F0, Jitter(local), Shimmer(local)를 추출합니다.
+    audio: 파일 경로, mono PCM 배열 (배열이면 sample_rate 필요) 또는 AcousticContext
+    mode: "whole" - 전체 신호에서 Pitch/PointProcess를 한 번만 계산하고 윈도우별로 집계
+          "window" - 윈도우마다 잘라서 Pitch/PointProcess를 새로 계산
+    두 방식 모두 길이 int(duration // window_size)인 배열 3개를 반환합니다.
+    """
+
+    context = load_context(audio, sample_rate)
+    if context is None:
         return np.array([]), np.array([]), np.array([])
 
+    if mode == "whole":
+        return _extract_features_whole_signal(context, window_size)
+    if mode == "window":
+        return _extract_features_per_window(context.sound, window_size)
+    raise ValueError(f"지원되지 않는 음성 특징 추출 방식입니다: {mode}")
+
+def _nan_to_zero(value):
+    # NaN 값 처리 (음성 구간이 너무 짧으면 NaN이 뜰 수 있음)
+    if isinstance(value, float) and np.isnan(value):
+        return 0.0
+    return value
+
+def _extract_features_whole_signal(context: AcousticContext, window_size: float):
+    snd = context.sound
+    duration = snd.get_total_duration()
+    num_windows = int(duration // window_size)
+
+    # --- F0: 전체 Pitch 1회 계산 후 프레임 시각으로 윈도우에 배정해 평균 ---
+    # 분석 창(3 / PITCH_FLOOR초)이 윈도우 안에 모두 들어가는 프레임만 사용 (윈도우마다 잘라서 계산할 때와 같은 프레임,
+    # 경계에 걸친 프레임을 쓰면 앞 윈도우의 목소리가 무음 윈도우의 F0로 잡힘)
+    pitch = context.pitch(PITCH_FLOOR, PITCH_CEILING)
+    f0_values = pitch.selected_array['frequency']
+    times = pitch.xs()
+    window_index = np.floor(times / window_size).astype(int)
+    half_frame = PITCH_ANALYSIS_PERIODS / PITCH_FLOOR / 2
+    inside = (times - half_frame >= window_index * window_size) & (times + half_frame <= (window_index + 1) * window_size)
+    voiced = (f0_values != 0) & inside & (window_index < num_windows)
+
+    f0_sums = np.bincount(window_index[voiced], weights=f0_values[voiced], minlength=num_windows)
+    f0_counts = np.bincount(window_index[voiced], minlength=num_windows)
+    f0_series = np.divide(f0_sums, f0_counts, out=np.zeros(num_windows), where=f0_counts > 0)
+
+    # --- Jitter & Shimmer: 전체 PointProcess 1회 생성 후 윈도우 시간 범위로 조회 ---
+    # "To PointProcess (periodic, cc)"와 같지만 위 Pitch를 재사용 (AcousticContext.point_process)
+    point_process = context.point_process(PITCH_FLOOR, PITCH_CEILING)
+
+    jitter_series = np.zeros(num_windows)
+    shimmer_series = np.zeros(num_windows)
+    for i in range(num_windows):
+        start = i * window_size
+        end = start + window_size
+        jitter = call(point_process, "Get jitter (local)", start, end, SHORTEST_PERIOD, LONGEST_PERIOD, 1.3)
+        shimmer = call([snd, point_process], "Get shimmer (local)", start, end, SHORTEST_PERIOD, LONGEST_PERIOD, 1.3, 1.6)
+        jitter_series[i] = _nan_to_zero(jitter)
+        shimmer_series[i] = _nan_to_zero(shimmer)
+
+    return f0_series, jitter_series, shimmer_series
+
+def _extract_features_per_window(snd, window_size: float):
     duration = snd.get_total_duration()
     num_windows = int(duration // window_size)
     
@@ -61,15 +129,9 @@ def extract_features_by_window(audio_path: str, window_size: float = 1.0):
         # 3. Shimmer 계산:
         shimmer = call([segment, point_process], "Get shimmer (local)", 0, 0, SHORTEST_PERIOD, LONGEST_PERIOD, 1.3, 1.6)
 
-        # NaN 값 처리 (음성 구간이 너무 짧으면 NaN이 뜰 수 있음)
-        if isinstance(jitter, float) and np.isnan(jitter):
-            jitter = 0.0
-        if isinstance(shimmer, float) and np.isnan(shimmer):
-            shimmer = 0.0
-
         f0_series.append(f0_mean)
-        jitter_series.append(jitter)
-        shimmer_series.append(shimmer)
+        jitter_series.append(_nan_to_zero(jitter))
+        shimmer_series.append(_nan_to_zero(shimmer))
 
     return np.array(f0_series), np.array(jitter_series), np.array(shimmer_series)
 
@@ -4,3 +4,112 @@ import os
 UPLOAD_DIR = os.getenv("UPLOAD_DIR", "uploads")
 DEFAULT_TARGET_TIME = "6:00"
 
+# 업로드 스트리밍 버퍼 크기 (바이트) - 업로드당 최대 메모리 사용량
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", 1024 * 1024))
+
+# 분할 업로드 세션 보관 기간 (초) - 마지막 청크 수신 후 이 시간이 지난 미완료 세션은 삭제
+UPLOAD_SESSION_TTL = float(os.getenv("UPLOAD_SESSION_TTL", 24 * 3600))
+
+# 분석용 PCM 샘플링 레이트 (Whisper 입력 기준 16kHz)
+ANALYSIS_SAMPLE_RATE = int(os.getenv("ANALYSIS_SAMPLE_RATE", 16000))
+# ffmpeg 디코딩 제한 시간 (초, 넘으면 프로세스를 종료하고 작업 실패 처리)
+AUDIO_DECODE_TIMEOUT = float(os.getenv("AUDIO_DECODE_TIMEOUT", 600))
+
+# 작업 상태 저장소 ("sqlite": 여러 워커 프로세스가 공유, "memory": 단일 프로세스 전용)
+JOB_STORE_BACKEND = os.getenv("JOB_STORE_BACKEND", "sqlite")
+JOB_DB_PATH = os.getenv("JOB_DB_PATH", os.path.join(UPLOAD_DIR, "jobs.sqlite3"))
+# 분석 중인 작업의 생존 신호: 워커가 JOB_HEARTBEAT_INTERVAL(초)마다 자기 작업의 갱신 시각을 기록하고,
+# JOB_LEASE_SECONDS 동안 갱신되지 않은 processing 작업은 워커가 중단된 것으로 보고 오류 처리 (합류 대상에서도 제외)
+JOB_HEARTBEAT_INTERVAL = float(os.getenv("JOB_HEARTBEAT_INTERVAL", 30))
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", 120))
+
+# 작업별 분석 특징(시계열) 저장 위치 - 채점 기준만 바꿔 재채점할 때 사용 (/rescore)
+FEATURE_STORE_DIR = os.getenv("FEATURE_STORE_DIR", os.path.join(UPLOAD_DIR, "features"))
+
+# 같은 파일 + 같은 분석 조건의 결과 캐시 (보관 기간(초), 최대 디스크 사용량(바이트))
+# 분석 중인 같은 요청은 RESULT_CACHE_INFLIGHT_MAX_AGE(초) 이내에 시작된 작업에만 합류
+RESULT_CACHE_ENABLED = os.getenv("RESULT_CACHE_ENABLED", "true").lower() == "true"
+RESULT_CACHE_DIR = os.getenv("RESULT_CACHE_DIR", os.path.join(UPLOAD_DIR, "result_cache"))
+RESULT_CACHE_TTL = float(os.getenv("RESULT_CACHE_TTL", 7 * 24 * 3600))
+RESULT_CACHE_MAX_BYTES = int(os.getenv("RESULT_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+RESULT_CACHE_INFLIGHT_MAX_AGE = float(os.getenv("RESULT_CACHE_INFLIGHT_MAX_AGE", 3600))
+
+# 분석 스케줄러 (동시 분석 슬롯 수, 대기열 크기, 작업 1건 예상 소요 시간 초기값(초))
+ANALYSIS_SLOTS = int(os.getenv("ANALYSIS_SLOTS", 2))
+ANALYSIS_QUEUE_SIZE = int(os.getenv("ANALYSIS_QUEUE_SIZE", 16))
+ANALYSIS_ESTIMATED_DURATION = float(os.getenv("ANALYSIS_ESTIMATED_DURATION", 180))
+
+# 분석 단계 병렬 실행 (단계용 스레드 수, 영상 분석용 프로세스 수 - 0이면 스레드에서 실행)
+STAGE_THREADS = int(os.getenv("STAGE_THREADS", ANALYSIS_SLOTS * 4))
+VISUAL_PROCESS_WORKERS = int(os.getenv("VISUAL_PROCESS_WORKERS", ANALYSIS_SLOTS))
+
+# 음성 인식 백엔드 ("openai-whisper" 또는 "faster-whisper" - CTranslate2 기반, CPU int8 지원)
+STT_BACKEND = os.getenv("STT_BACKEND", "openai-whisper")
+STT_MODEL_SIZE = os.getenv("STT_MODEL_SIZE", "medium")
+STT_COMPUTE_TYPE = os.getenv("STT_COMPUTE_TYPE", "int8")  # faster-whisper 전용 (int8, int8_float16, float16, float32)
+STT_CPU_THREADS = int(os.getenv("STT_CPU_THREADS", 0))  # 0이면 라이브러리 기본값
+
+# 긴 녹음 처리: 침묵 제거(VAD) 후 조각 단위 인식 (조각 최대 길이(초), 병렬 인식 프로세스 수 - 0이면 순차)
+STT_VAD_ENABLED = os.getenv("STT_VAD_ENABLED", "false").lower() == "true"
+STT_CHUNK_SECONDS = float(os.getenv("STT_CHUNK_SECONDS", 30))
+STT_PARALLEL_WORKERS = int(os.getenv("STT_PARALLEL_WORKERS", 0))
+
+# 모델 로딩 (서버 시작 시 백그라운드 워밍업 여부, 프로세스당 FaceMesh 인스턴스 풀 크기)
+MODEL_WARMUP = os.getenv("MODEL_WARMUP", "true").lower() == "true"
+FACE_MESH_POOL_SIZE = int(os.getenv("FACE_MESH_POOL_SIZE", 2))
+
+# 불안도 음성 특징 추출 방식 ("whole": 전체 신호에서 Pitch/PointProcess 1회 계산, "window": 윈도우마다 계산)
+VOICE_FEATURE_MODE = os.getenv("VOICE_FEATURE_MODE", "whole")
+
+# 영상 분석 (FaceMesh 실행 프레임 레이트 - 0이면 모든 프레임, 분석 이미지 최대 가로 길이 - 0이면 원본)
+VISUAL_ANALYSIS_FPS = float(os.getenv("VISUAL_ANALYSIS_FPS", 10))
+VISUAL_MAX_WIDTH = int(os.getenv("VISUAL_MAX_WIDTH", 640))
+VISUAL_ROI_MARGIN = float(os.getenv("VISUAL_ROI_MARGIN", 0.4))  # 얼굴 영역 주변 여유 (얼굴 크기 대비)
+VISUAL_SHARD_SECONDS = float(os.getenv("VISUAL_SHARD_SECONDS", 60))  # 긴 영상을 나누어 병렬 처리할 구간 길이
+VISUAL_SHARD_OVERLAP_SECONDS = float(os.getenv("VISUAL_SHARD_OVERLAP_SECONDS", 1.0))  # 구간 앞 추적 준비용 겹침
+VISUAL_FRAME_QUEUE_SIZE = int(os.getenv("VISUAL_FRAME_QUEUE_SIZE", 8))  # 디코딩 스레드 → FaceMesh 프레임 큐 크기
+
+# LLM 호출 (API 주소 - 로컬 테스트 서버 등, 호출당 제한 시간(초), 429/5xx 재시도 횟수, 동시 호출 / 연결 수 제한)
+GPT_BASE_URL = os.getenv("GPT_BASE_URL") or None
+GPT_TIMEOUT = float(os.getenv("GPT_TIMEOUT", 60))
+GPT_MAX_RETRIES = int(os.getenv("GPT_MAX_RETRIES", 3))
+GPT_RETRY_BASE_DELAY = float(os.getenv("GPT_RETRY_BASE_DELAY", 1.0))
+GPT_MAX_CONCURRENCY = int(os.getenv("GPT_MAX_CONCURRENCY", 8))
+GPT_MAX_CONNECTIONS = int(os.getenv("GPT_MAX_CONNECTIONS", 16))
+
+# LLM 응답 캐시 (temperature=0 호출만, 메모리 LRU 항목 수, SQLite 디스크 캐시 위치 / 보관 기간(초))
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+LLM_CACHE_SIZE = int(os.getenv("LLM_CACHE_SIZE", 1024))
+LLM_CACHE_DB_PATH = os.getenv("LLM_CACHE_DB_PATH", os.path.join(UPLOAD_DIR, "llm_cache.sqlite3"))
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", 30 * 24 * 3600))
+
+# STT 교정 방식 ("full": 전체 대본을 한 번에 교정, "gated": avg_logprob이 임계값보다 낮은 segment만 교정)
+# gated: 앞뒤 STT_CORRECTION_CONTEXT개 segment를 문맥으로 함께 보내고, 요청당 최대 STT_CORRECTION_BATCH_SIZE개 교정
+STT_CORRECTION_MODE = os.getenv("STT_CORRECTION_MODE", "full")
+STT_CORRECTION_LOGPROB_THRESHOLD = float(os.getenv("STT_CORRECTION_LOGPROB_THRESHOLD", -0.5))
+STT_CORRECTION_CONTEXT = int(os.getenv("STT_CORRECTION_CONTEXT", 1))
+STT_CORRECTION_BATCH_SIZE = int(os.getenv("STT_CORRECTION_BATCH_SIZE", 20))
+
+# 발표 분석 LLM 호출 방식 ("separate": STT 교정 후 분석 - 2회 호출, "combined": 교정과 분석을 구조화 출력 1회 호출로)
+LLM_ANALYSIS_MODE = os.getenv("LLM_ANALYSIS_MODE", "separate")
+
+# 긴 대본 처리: 이 글자 수 이상이면 문장 경계에서 약 LLM_CHUNK_CHARS 글자씩 나누어 동시에 교정/분석한 뒤 종합
+# 이때는 구간마다 전체 교정 → 분석으로 처리하므로 LLM_ANALYSIS_MODE / STT_CORRECTION_MODE="gated"가 적용되지 않음 (0이면 사용 안 함)
+LLM_LONG_TRANSCRIPT_CHARS = int(os.getenv("LLM_LONG_TRANSCRIPT_CHARS", 3000))
+LLM_CHUNK_CHARS = int(os.getenv("LLM_CHUNK_CHARS", 1200))
+
+# 대본 비교 방식 ("full": 두 대본 전체 전송, "diff": 문장 단위로 비교해 바뀐 부분과 앞뒤 COMPARE_DIFF_CONTEXT 문장만 전송)
+# diff에서 바뀐 문장 비율이 COMPARE_DIFF_MAX_RATIO를 넘으면 전체 전송이 더 짧으므로 full로 처리
+COMPARE_MODE = os.getenv("COMPARE_MODE", "diff")
+COMPARE_DIFF_CONTEXT = int(os.getenv("COMPARE_DIFF_CONTEXT", 1))
+COMPARE_DIFF_MAX_RATIO = float(os.getenv("COMPARE_DIFF_MAX_RATIO", 0.6))
+
+# SSE 스트리밍: 토픽마다 보관할 최근 이벤트 수 (늦게 구독한 클라이언트에게 다시 전달)
+EVENT_HISTORY_SIZE = int(os.getenv("EVENT_HISTORY_SIZE", 4096))
+# SSE 연결 유지용 주석 전송 및 작업 저장소 재확인 간격 (초)
+SSE_KEEPALIVE_SECONDS = float(os.getenv("SSE_KEEPALIVE_SECONDS", 15))
+
+# 작업 결과 롱폴링 (GET /result/{job_id}?wait=초 + If-None-Match): 최대 대기 시간,
+# 다른 워커에서 실행 중인 작업의 변경을 확인하는 작업 저장소 조회 간격 (초)
+LONG_POLL_MAX_SECONDS = float(os.getenv("LONG_POLL_MAX_SECONDS", 30))
+JOB_POLL_INTERVAL_SECONDS = float(os.getenv("JOB_POLL_INTERVAL_SECONDS", 1.0))
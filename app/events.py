@@ -0,0 +1,111 @@
+"""프로세스 내 이벤트 브로커 (SSE 스트리밍용)
+
+분석 작업 스레드나 LLM 루프 스레드가 publish한 이벤트를, API 핸들러(uvicorn 이벤트 루프)에서
+subscribe한 구독자에게 전달합니다.
+- 토픽마다 최근 EVENT_HISTORY_SIZE개 이벤트를 보관해, 늦게 구독한 클라이언트도 처음부터 받을 수 있음
+- close(topic) 후에는 구독자에게 종료를 알리고 보관한 이벤트를 삭제
+
+이벤트는 이 워커 프로세스 안에서만 전달됩니다.
+다른 워커에서 실행 중인 작업은 작업 저장소를 주기적으로 확인해 최종 결과를 전달합니다.
+"""
+import asyncio
+import json
+import threading
+from collections import deque
+from typing import Optional
+
+from config import EVENT_HISTORY_SIZE
+
+_CLOSED = object()
+
+
+def format_sse(event: str, data) -> str:
+    """SSE 메시지 한 개 (data는 JSON 직렬화)"""
+    payload = json.dumps(data, ensure_ascii=False, default=lambda v: v.tolist())
+    return f"event: {event}\ndata: {payload}\n\n"
+
+
+class Subscription:
+    """구독 하나 (구독한 이벤트 루프에서만 사용)"""
+
+    def __init__(self, broker: "EventBroker", topic: str):
+        self.broker = broker
+        self.topic = topic
+        self.closed = False
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+
+    def _deliver(self, item):
+        # 발행 스레드에서 호출
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, item)
+
+    async def get(self, timeout: float = None) -> Optional[tuple]:
+        """다음 이벤트 (event, data), 토픽이 닫혔거나 timeout이 지나면 None"""
+        if self.closed:
+            return None
+        try:
+            item = await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        if item is _CLOSED:
+            self.closed = True
+            return None
+        return item
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class EventBroker:
+    def __init__(self, history_size: int = EVENT_HISTORY_SIZE):
+        self.history_size = history_size
+        self._topics = {}  # topic -> {"history": deque, "subscribers": set}
+        self._lock = threading.Lock()
+
+    def _topic(self, topic: str) -> dict:
+        entry = self._topics.get(topic)
+        if entry is None:
+            entry = {"history": deque(maxlen=self.history_size), "subscribers": set()}
+            self._topics[topic] = entry
+        return entry
+
+    def subscribe(self, topic: str) -> Subscription:
+        """구독 시작 (이벤트 루프 안에서 호출), 보관 중인 이벤트부터 순서대로 전달"""
+        subscription = Subscription(self, topic)
+        with self._lock:
+            entry = self._topic(topic)
+            for item in entry["history"]:
+                subscription._deliver(item)
+            entry["subscribers"].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            entry = self._topics.get(subscription.topic)
+            if entry is None:
+                return
+            entry["subscribers"].discard(subscription)
+            if not entry["subscribers"] and not entry["history"]:
+                del self._topics[subscription.topic]
+
+    def publish(self, topic: str, event: str, data) -> None:
+        """이벤트 발행 (어느 스레드에서나 호출 가능)"""
+        item = (event, data)
+        with self._lock:
+            entry = self._topic(topic)
+            entry["history"].append(item)
+            subscribers = list(entry["subscribers"])
+        for subscription in subscribers:
+            subscription._deliver(item)
+
+    def close(self, topic: str) -> None:
+        """토픽 종료 (구독자에게 종료 알림 후 보관한 이벤트 삭제)"""
+        with self._lock:
+            entry = self._topics.pop(topic, None)
+        if entry is None:
+            return
+        for subscription in entry["subscribers"]:
+            subscription._deliver(_CLOSED)
+
+
+broker = EventBroker()
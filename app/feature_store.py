@@ -0,0 +1,122 @@
+"""작업별 분석 특징(시계열) 저장소
+
+채점 기준(임계값, 가중치, 등급 구간)만 바꿔 다시 채점할 때 Whisper / Praat / MediaPipe를
+다시 실행하지 않도록, 분석 중에 만든 원본 시계열을 작업마다 저장합니다.
+
+FEATURE_STORE_DIR/{job_id}/ 디렉토리를 사용합니다.
+- meta.json : job_id, 원본 파일 내용 해시, 저장 시각, 배열이 아닌 값(Whisper segments, fps 등)
+- {name}.npy : 배열 특징 (np.load(mmap_mode="r")로 필요한 부분만 읽음)
+
+특징은 파일 내용에서만 정해지므로, FEATURE_STORE_DIR/.by_hash/{content_hash}에 마지막으로 저장한 job_id를
+기록해 같은 파일을 분석한 다른 작업(결과 캐시로 완료된 작업 등)도 내용 해시로 특징을 찾을 수 있습니다.
+"""
+import json
+import os
+import re
+import shutil
+import time
+import uuid
+
+import numpy as np
+
+from config import FEATURE_STORE_DIR
+
+META_NAME = "meta.json"
+HASH_INDEX_DIR = ".by_hash"
+_JOB_ID_PATTERN = re.compile(r"[0-9A-Za-z_-]{1,64}")
+_CONTENT_HASH_PATTERN = re.compile(r"[0-9a-f]{64}")
+
+
+def _feature_dir(job_id: str, store_dir: str) -> str:
+    if not _JOB_ID_PATTERN.fullmatch(job_id):
+        raise FileNotFoundError(f"저장된 분석 특징이 없습니다: {job_id}")
+    return os.path.join(store_dir, job_id)
+
+
+def _hash_index_path(content_hash: str, store_dir: str) -> str:
+    if not content_hash or not _CONTENT_HASH_PATTERN.fullmatch(content_hash):
+        raise FileNotFoundError(f"저장된 분석 특징이 없습니다: {content_hash}")
+    return os.path.join(store_dir, HASH_INDEX_DIR, content_hash)
+
+
+def _write_hash_index(content_hash: str, job_id: str, store_dir: str):
+    """content_hash → job_id 기록 (임시 파일에 쓴 뒤 교체)"""
+    index_path = _hash_index_path(content_hash, store_dir)
+    os.makedirs(os.path.dirname(index_path), exist_ok=True)
+    tmp_path = f"{index_path}.{uuid.uuid4().hex}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(job_id)
+    os.replace(tmp_path, index_path)
+
+
+def save_features(job_id: str, content_hash: str, features: dict, store_dir: str = FEATURE_STORE_DIR) -> str:
+    """
+    특징 저장 (같은 job_id로 다시 저장하면 교체)
+    features의 np.ndarray 값은 .npy 파일로, 나머지 값은 meta.json에 기록
+    """
+    arrays = {name: value for name, value in features.items() if isinstance(value, np.ndarray)}
+    meta = {
+        "job_id": job_id,
+        "content_hash": content_hash,
+        "created_at": time.time(),
+        "arrays": sorted(arrays),
+        "values": {name: value for name, value in features.items() if name not in arrays},
+    }
+
+    # 임시 디렉토리에 모두 기록한 뒤 이름 변경으로 원자적으로 배치
+    os.makedirs(store_dir, exist_ok=True)
+    staging_dir = os.path.join(store_dir, f".staging_{uuid.uuid4().hex}")
+    os.makedirs(staging_dir)
+    try:
+        for name, value in arrays.items():
+            np.save(os.path.join(staging_dir, f"{name}.npy"), value, allow_pickle=False)
+        with open(os.path.join(staging_dir, META_NAME), "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+
+        feature_dir = _feature_dir(job_id, store_dir)
+        if os.path.exists(feature_dir):
+            shutil.rmtree(feature_dir, ignore_errors=True)
+        os.rename(staging_dir, feature_dir)
+    except Exception:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        raise
+
+    if content_hash and _CONTENT_HASH_PATTERN.fullmatch(content_hash):
+        _write_hash_index(content_hash, job_id, store_dir)
+    return feature_dir
+
+
+def load_features(job_id: str, store_dir: str = FEATURE_STORE_DIR, mmap: bool = True) -> dict:
+    """
+    저장된 특징을 save_features에 넘긴 형태의 dict로 반환 (배열은 기본적으로 읽기 전용 memmap)
+    content_hash는 "content_hash" 키로 함께 반환
+    """
+    feature_dir = _feature_dir(job_id, store_dir)
+    try:
+        with open(os.path.join(feature_dir, META_NAME), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"저장된 분석 특징이 없습니다: {job_id}")
+
+    features = dict(meta["values"])
+    for name in meta["arrays"]:
+        features[name] = np.load(os.path.join(feature_dir, f"{name}.npy"), mmap_mode="r" if mmap else None)
+    features["content_hash"] = meta["content_hash"]
+    return features
+
+
+def load_features_by_hash(content_hash: str, store_dir: str = FEATURE_STORE_DIR, mmap: bool = True) -> dict:
+    """
+    같은 내용의 파일로 마지막에 저장된 특징 (load_features와 같은 형태)
+    인덱스가 가리키는 작업의 특징이 지워졌거나 다른 내용으로 교체되었으면 FileNotFoundError
+    """
+    try:
+        with open(_hash_index_path(content_hash, store_dir), "r", encoding="utf-8") as f:
+            job_id = f.read().strip()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"저장된 분석 특징이 없습니다: {content_hash}")
+
+    features = load_features(job_id, store_dir, mmap)
+    if features["content_hash"] != content_hash:
+        raise FileNotFoundError(f"저장된 분석 특징이 없습니다: {content_hash}")
+    return features
@@ -1,30 +1,246 @@
-from openai import OpenAI
+from openai import AsyncOpenAI, APIConnectionError, APIStatusError
 from dotenv import load_dotenv
+import asyncio
+import difflib
+import httpx
 import json
 import os
+import random
 import re
+import threading
+from collections import Counter
+
+from pydantic import ValidationError
+
+from config import (
+    GPT_BASE_URL, GPT_TIMEOUT, GPT_MAX_RETRIES, GPT_RETRY_BASE_DELAY, GPT_MAX_CONCURRENCY, GPT_MAX_CONNECTIONS,
+    LLM_CACHE_ENABLED, STT_CORRECTION_MODE, STT_CORRECTION_LOGPROB_THRESHOLD, STT_CORRECTION_CONTEXT,
+    STT_CORRECTION_BATCH_SIZE, LLM_ANALYSIS_MODE, LLM_LONG_TRANSCRIPT_CHARS, LLM_CHUNK_CHARS,
+    COMPARE_MODE, COMPARE_DIFF_CONTEXT, COMPARE_DIFF_MAX_RATIO,
+)
+from llm_cache import LLMCache, make_llm_cache_key
+from llm_schemas import CombinedAnalysis, json_schema_format
 
 load_dotenv()  # .env 파일 로드
 
 gpt_api_key = os.getenv("GPT_API_KEY")
-client = OpenAI(api_key=gpt_api_key)
 
+# --- LLM 호출 전용 이벤트 루프 ---
+# 분석 작업(스레드)과 API 핸들러(uvicorn 이벤트 루프)가 같은 연결 풀과 동시 호출 제한을 공유하도록
+# 비동기 클라이언트는 전용 스레드의 이벤트 루프 하나에서만 사용
+_loop = None
+_loop_lock = threading.Lock()
+_client = None
+_semaphore = None
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="llm-loop", daemon=True).start()
+            _loop = loop
+        return _loop
+
+
+def _get_client() -> AsyncOpenAI:
+    # LLM 루프 안에서만 호출되므로 잠금 불필요
+    global _client, _semaphore
+    if _client is None:
+        http_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=GPT_MAX_CONNECTIONS, max_keepalive_connections=GPT_MAX_CONNECTIONS),
+            timeout=httpx.Timeout(GPT_TIMEOUT),
+        )
+        # 재시도는 _is_retryable 기준으로 직접 처리
+        _client = AsyncOpenAI(api_key=gpt_api_key, base_url=GPT_BASE_URL, http_client=http_client, max_retries=0)
+        _semaphore = asyncio.Semaphore(GPT_MAX_CONCURRENCY)
+    return _client
+
+
+def _is_retryable(error: Exception) -> bool:
+    """429 / 5xx / 연결 오류 / 시간 초과만 재시도"""
+    if isinstance(error, APIStatusError):
+        return error.status_code == 429 or error.status_code >= 500
+    return isinstance(error, APIConnectionError)  # APITimeoutError 포함
+
+
+def _retry_delay(error: Exception, attempt: int) -> float:
+    """지수 백오프 + full jitter (서버가 Retry-After를 주면 그 이상 대기)"""
+    delay = random.uniform(0, GPT_RETRY_BASE_DELAY * (2 ** attempt))
+    if isinstance(error, APIStatusError):
+        try:
+            delay = max(delay, float(error.response.headers.get("retry-after", 0)))
+        except ValueError:
+            pass
+    return delay
+
+
+async def _stream_completion(client: AsyncOpenAI, request: dict, on_delta) -> str:
+    """스트리밍 호출, 토큰 조각이 도착할 때마다 on_delta(조각) 호출 후 전체 응답 반환"""
+    parts = []
+    stream = await client.chat.completions.create(stream=True, **request)
+    async for chunk in stream:
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta.content
+        if delta:
+            parts.append(delta)
+            on_delta(delta)
+    return "".join(parts)
+
+
+async def _call_gpt(prompt: str, model: str, temperature: float, timeout: float, response_format: dict = None,
+                    on_delta=None) -> str:
+    client = _get_client()
+    request = {
+        "model": model,
+        "messages": [{"role": "user", "content": prompt}],
+        "temperature": temperature,
+        "timeout": timeout,
+    }
+    if response_format:
+        request["response_format"] = response_format
+    sent = []
+
+    def forward(delta):
+        sent.append(delta)
+        on_delta(delta)
+
+    for attempt in range(GPT_MAX_RETRIES + 1):
+        try:
+            async with _semaphore:
+                if on_delta is None:
+                    response = await client.chat.completions.create(**request)
+                    content = response.choices[0].message.content
+                else:
+                    content = await _stream_completion(client, request, forward)
+            break
+        except Exception as e:
+            # 이미 전달한 조각이 있으면 재시도하면 응답이 중복되므로 그대로 실패
+            if attempt == GPT_MAX_RETRIES or not _is_retryable(e) or sent:
+                raise
+            await asyncio.sleep(_retry_delay(e, attempt))
+
+    content = content.strip()
+    if response_format:
+        # 구조화 출력은 스키마대로 JSON만 반환되므로 그대로 사용
+        return content
+    # 코드 블록 제거
+    content = re.sub(r"```json\n?|```", "", content).strip()
+    return content
+
+
+# --- 응답 캐시 ---
+# 템플릿의 출력 형식이나 의미를 바꾸면 버전을 올려 이전 응답을 재사용하지 않도록 함
+PROMPT_VERSIONS = {
+    "stt_edit": 1, "stt_segment_edit": 1, "analysis": 1, "combined_analysis": 1,
+    "analysis_chunk": 1, "analysis_reduce": 1, "compare": 1, "compare_diff": 1,
+}
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache():
+    """LLM 응답 캐시 (LLM_CACHE_ENABLED가 꺼져 있으면 None)"""
+    global _cache
+    if not LLM_CACHE_ENABLED:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = LLMCache()
+        return _cache
 
 
-def call_gpt(prompt: str, model="gpt-4o-mini", temperature=0.0) -> str:
+def _cache_key(prompt: str, model: str, temperature: float, template: str):
+    # temperature=0 이고 템플릿 이름이 주어진 호출만 캐시
+    if template is None or temperature != 0 or get_llm_cache() is None:
+        return None
+    return make_llm_cache_key(model, template, PROMPT_VERSIONS[template], prompt)
+
+
+def _loads_or_none(content: str):
+    try:
+        data = json.loads(content)
+    except json.JSONDecodeError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _json_with(*keys):
+    """응답이 keys를 모두 가진 JSON 객체인지 확인하는 validate 함수"""
+    def validate(content: str) -> bool:
+        data = _loads_or_none(content)
+        return data is not None and all(key in data for key in keys)
+    return validate
+
+
+def call_gpt(prompt: str, model="gpt-4o-mini", temperature=0.0, timeout: float = GPT_TIMEOUT, template: str = None,
+             response_format: dict = None, on_delta=None, validate=None) -> str:
     """
-    GPT 호출 공통 함수
+    GPT 호출 공통 함수 (동기 - 분석 작업 스레드용)
+    template(PROMPT_VERSIONS의 이름)을 주면 temperature=0 응답을 캐시에서 재사용
+    validate(응답) -> bool을 주면 호출한 쪽에서 파싱/검증할 수 있는 응답만 캐시에 저장
+    (형식이 깨진 응답이 캐시되어 같은 요청마다 실패 결과가 반복되지 않도록)
+    response_format을 주면 구조화 출력(JSON Schema)으로 호출
+    on_delta를 주면 스트리밍으로 호출하고 토큰 조각마다 on_delta(조각) 호출 (LLM 루프 스레드에서 호출됨,
+    캐시 적중 시에는 전체 응답으로 한 번 호출), 반환값은 스트리밍 여부와 관계없이 전체 응답
     """
-    response = client.chat.completions.create(
-        model=model,
-        messages=[{"role": "user", "content": prompt}],
-        temperature=temperature
+    key = _cache_key(prompt, model, temperature, template)
+    if key:
+        cached = get_llm_cache().get(key)
+        if cached is not None:
+            if on_delta:
+                on_delta(cached)
+            return cached
+    future = asyncio.run_coroutine_threadsafe(
+        _call_gpt(prompt, model, temperature, timeout, response_format, on_delta), _get_loop()
     )
-    content = response.choices[0].message.content.strip()
-    # 코드 블록 제거
-    content = re.sub(r"```json\n?|```", "", content).strip()
+    content = future.result()
+    if key and (validate is None or validate(content)):
+        get_llm_cache().put(key, content)
     return content
 
+
+async def call_gpt_async(prompt: str, model="gpt-4o-mini", temperature=0.0, timeout: float = GPT_TIMEOUT,
+                         template: str = None, response_format: dict = None, on_delta=None, validate=None) -> str:
+    """
+    GPT 호출 공통 함수 (비동기 - API 핸들러용, 호출하는 이벤트 루프를 막지 않음)
+    캐시의 SQLite 조회/저장도 스레드에서 실행 (call_gpt_many에서는 LLM 루프에서 호출됨)
+    """
+    key = _cache_key(prompt, model, temperature, template)
+    if key:
+        cached = await get_llm_cache().get_async(key)
+        if cached is not None:
+            if on_delta:
+                on_delta(cached)
+            return cached
+    future = asyncio.run_coroutine_threadsafe(
+        _call_gpt(prompt, model, temperature, timeout, response_format, on_delta), _get_loop()
+    )
+    content = await asyncio.wrap_future(future)
+    if key and (validate is None or validate(content)):
+        await get_llm_cache().put_async(key, content)
+    return content
+
+
+def call_gpt_many(prompts: list, **kwargs) -> list:
+    """
+    여러 프롬프트를 동시에 호출하고 순서대로 응답 반환 (동기 - 분석 작업 스레드용)
+    동시 호출 수는 GPT_MAX_CONCURRENCY로 제한됨
+    """
+    futures = [asyncio.run_coroutine_threadsafe(call_gpt_async(prompt, **kwargs), _get_loop()) for prompt in prompts]
+    return [future.result() for future in futures]
+
+
+def close_client():
+    """서버 종료 시 연결 풀 정리"""
+    global _client
+    if _loop is None or _client is None:
+        return
+    client, _client = _client, None
+    asyncio.run_coroutine_threadsafe(client.close(), _loop).result(timeout=5)
+
 stt_edit_prompt = """
 다음 문장은 STT 결과입니다.
 너의 역할은 최소한의 교정만 수행하는 것입니다.
@@ -45,11 +261,86 @@ stt_edit_prompt = """
 def correct_stt_result(stt_result: str) -> str:
     """STT 결과를 최소한의 교정만 수행하여 수정"""
     prompt = stt_edit_prompt.format(stt_result=stt_result)
-    content = call_gpt(prompt, temperature=0)
+    content = call_gpt(prompt, temperature=0, template="stt_edit", validate=_json_with("corrected_sentence"))
     try:
         return json.loads(content)["corrected_sentence"]
     except (json.JSONDecodeError, KeyError):
         return "[오류] corrected_sentence 추출 실패"
+
+stt_segment_edit_prompt = """
+다음은 STT 결과의 일부 구간입니다. 각 구간은 id와 text로 되어 있습니다.
+너의 역할은 "fix": true 인 구간만 최소한으로 교정하는 것입니다.
+"fix": false 인 구간은 앞뒤 문맥 참고용이며 출력하지 마세요.
+
+규칙:
+- 잘못 인식된 단어만 수정 (유사 발음, 조사 누락, 단어 생략 등)
+- 말투, 어순, 표현은 절대 변경하지 마세요
+- 구간을 합치거나 나누지 말고, 입력의 id를 그대로 사용하세요
+- JSON 형식으로만 출력
+- 띄어쓰기/맞춤법은 필요할 때만 수정
+
+입력 구간:
+{segments}
+
+출력 예시:
+{{"corrected_segments": [{{"id": 3, "text": "수정된 문장"}}]}}
+"""
+
+def correct_stt_segments(
+    segments: list,
+    threshold: float = STT_CORRECTION_LOGPROB_THRESHOLD,
+    context: int = STT_CORRECTION_CONTEXT,
+    batch_size: int = STT_CORRECTION_BATCH_SIZE,
+) -> str:
+    """
+    Whisper segment 중 avg_logprob이 threshold보다 낮은 구간만 교정하고 전체 대본 반환
+    신뢰도가 높은 구간은 그대로 두고, 교정 대상은 앞뒤 context개 구간을 문맥으로 붙여
+    batch_size개씩 묶어 동시에 요청한 뒤 원래 순서대로 이어 붙임
+    응답에서 빠졌거나 형식이 잘못된 구간은 원문 유지
+    """
+    texts = [seg.get("text", "") for seg in segments]
+    targets = [
+        i for i, seg in enumerate(segments)
+        if texts[i].strip() and seg.get("avg_logprob", 0.0) < threshold
+    ]
+
+    batches = [targets[i:i + batch_size] for i in range(0, len(targets), batch_size)]
+    prompts = []
+    for batch in batches:
+        fix = set(batch)
+        shown = sorted({
+            j for i in batch for j in range(max(0, i - context), min(len(segments), i + context + 1))
+            if texts[j].strip()
+        })
+        items = [{"id": j, "text": texts[j].strip(), "fix": j in fix} for j in shown]
+        prompts.append(stt_segment_edit_prompt.format(segments=json.dumps(items, ensure_ascii=False)))
+
+    corrected = list(texts)
+    for batch, content in zip(batches, call_gpt_many(
+        prompts, temperature=0, template="stt_segment_edit", validate=_json_with("corrected_segments"),
+    )):
+        try:
+            items = json.loads(content)["corrected_segments"]
+        except (json.JSONDecodeError, KeyError, TypeError):
+            continue
+        fix = set(batch)
+        for item in items:
+            if not isinstance(item, dict) or item.get("id") not in fix or not isinstance(item.get("text"), str):
+                continue
+            i = item["id"]
+            # Whisper segment 앞 공백(구간 구분)은 원문 그대로 유지
+            leading = texts[i][:len(texts[i]) - len(texts[i].lstrip())]
+            corrected[i] = leading + item["text"].strip()
+
+    return "".join(corrected).strip()
+
+def correct_transcript(text: str, segments: list, mode: str = STT_CORRECTION_MODE) -> str:
+    """STT_CORRECTION_MODE에 따라 전체 대본 교정 또는 신뢰도 낮은 구간만 교정"""
+    if mode == "gated" and segments:
+        return correct_stt_segments(segments)
+    if mode in ("full", "gated"):
+        return correct_stt_result(text)
+    raise ValueError(f"지원되지 않는 STT 교정 방식입니다: {mode}")
     
 analysis_prompt = """
 너는 발표 어시스턴트입니다. 교정된 발표 대본을 받고 다음 작업을 수행하세요:
@@ -131,14 +422,17 @@ compare_prompt = """
 - 전체적인 완성도와 전문성
 """
 
-def get_chat_response(corrected_stt_result: str, current_time: str = "0:00", target_time: str = "6:00"):
-    """교정된 STT 결과를 기반으로 발표 분석 및 피드백 제공"""
+def get_chat_response(corrected_stt_result: str, current_time: str = "0:00", target_time: str = "6:00", on_delta=None):
+    """교정된 STT 결과를 기반으로 발표 분석 및 피드백 제공 (on_delta: 스트리밍 토큰 조각 콜백)"""
     prompt = analysis_prompt.format(
         corrected_stt_result=corrected_stt_result,
         current_time=current_time,
         target_time=target_time
     )
-    content = call_gpt(prompt, temperature=0)
+    content = call_gpt(
+        prompt, temperature=0, template="analysis", on_delta=on_delta,
+        validate=_json_with("adjusted_script", "feedback", "predicted_questions"),
+    )
     try:
         return json.loads(content)
     except (json.JSONDecodeError, KeyError):
@@ -148,10 +442,391 @@ def get_chat_response(corrected_stt_result: str, current_time: str = "0:00", tar
             "predicted_questions": None
         }
     
+combined_analysis_prompt = """
+너는 발표 어시스턴트입니다. 발표 녹음의 STT 결과를 받고 다음 작업을 순서대로 수행하세요:
+
+1. STT 교정 (corrected_sentence):
+   - 잘못 인식된 단어만 수정 (유사 발음, 조사 누락, 단어 생략 등)
+   - 말투, 어순, 표현은 절대 변경하지 마세요
+   - 띄어쓰기/맞춤법은 필요할 때만 수정
+2. 교정된 대본을 발표체로 자연스럽게 수정하고 목표 발표 시간에 맞추어 길이를 조정합니다 (adjusted_script):
+   - 현재 발표 시간: {current_time} (mm:ss)
+   - 목표 발표 시간: {target_time} (mm:ss)
+   - ±10% 범위 내로 조정합니다.
+   - 현재 > 목표 → 반복 문장 제거, 불필요한 부연 설명 제거, 문장 압축
+   - 현재 < 목표 → 구체적 예시, 관련 사례·비유, 핵심 문장 부연 설명을 추가해 반드시 늘리세요 (반복 제거 금지)
+3. 피드백 제공 (feedback):
+   - frequent_words: 가장 많이 반복된 단어 5개
+   - awkward_sentences: 어색한 문장과 수정
+   - difficulty_issues: 쉬운 표현(too_easy), 어려운 표현(too_difficult) 및 개선안
+4. 예상 질문 3~5개 생성 (predicted_questions)
+
+STT 결과:
+{stt_result}
+"""
+
+def _is_combined_analysis(content: str) -> bool:
+    try:
+        CombinedAnalysis.model_validate_json(content)
+    except ValidationError:
+        return False
+    return True
+
+
+def analyze_transcript_combined(stt_result: str, current_time: str = "0:00", target_time: str = "6:00",
+                                on_delta=None, on_reset=None):
+    """
+    STT 교정과 발표 분석을 구조화 출력 호출 한 번으로 수행 (LLM_ANALYSIS_MODE="combined")
+    반환: (교정된 대본, get_chat_response와 같은 모양의 분석 결과)
+    응답이 스키마 검증에 실패하면 교정 → 분석 2회 호출로 대신 처리
+    이때 on_reset이 있으면 호출해 (이미 보낸 토큰 조각을 버리도록) 알리고 분석 호출을 다시 스트리밍,
+    없으면 대신 처리하는 호출의 토큰 조각은 on_delta로 보내지 않음 (같은 내용이 두 번 이어지지 않도록)
+    """
+    prompt = combined_analysis_prompt.format(stt_result=stt_result, current_time=current_time, target_time=target_time)
+    content = call_gpt(
+        prompt, temperature=0, template="combined_analysis",
+        response_format=json_schema_format("presentation_analysis", CombinedAnalysis), on_delta=on_delta,
+        validate=_is_combined_analysis,
+    )
+    try:
+        analysis = CombinedAnalysis.model_validate_json(content)
+    except ValidationError as e:
+        print(f"구조화 분석 응답 검증 실패 ({e.error_count()}개 오류), 개별 호출로 재시도")
+        if on_delta and on_reset:
+            on_reset()
+        corrected = correct_stt_result(stt_result)
+        return corrected, get_chat_response(
+            corrected, current_time=current_time, target_time=target_time, on_delta=on_delta if on_reset else None,
+        )
+
+    result = analysis.model_dump()
+    return result.pop("corrected_sentence"), result
+
+# --- 긴 대본: 구간별 교정/분석(map) 후 예상 질문 종합(reduce) ---
+analysis_chunk_prompt = """
+너는 발표 어시스턴트입니다. 긴 발표 대본을 나눈 {index}/{total}번째 부분(교정 완료)을 받고 다음 작업을 수행하세요:
+
+1. 이 부분을 발표체로 자연스럽게 수정하고 시간에 맞추어 길이를 조정합니다 (adjusted_script):
+   - 이 부분의 현재 발표 시간: {current_time} (mm:ss)
+   - 이 부분의 목표 발표 시간: {target_time} (mm:ss)
+   - ±10% 범위 내로 조정합니다.
+   - 현재 > 목표 → 반복 문장 제거, 불필요한 부연 설명 제거, 문장 압축
+   - 현재 < 목표 → 구체적 예시, 관련 사례·비유, 핵심 문장 부연 설명을 추가해 반드시 늘리세요 (반복 제거 금지)
+   - 앞뒤 부분과 이어지므로 새로운 인사말이나 맺음말을 추가하지 마세요
+2. 어색한 문장과 수정, 쉬운 표현(too_easy) / 어려운 표현(too_difficult) 및 개선안
+3. 이 부분의 핵심 내용 요약 1~2문장 (summary)
+
+JSON 형식으로 출력 (다른 텍스트 금지):
+{{
+  "adjusted_script": "...",
+  "awkward_sentences": [{{"original": "...", "suggestion": "..."}}],
+  "difficulty_issues": [{{"type": "too_easy", "sentence": "...", "suggestion": "..."}}],
+  "summary": "..."
+}}
+
+입력 문장:
+{chunk}
+"""
+
+analysis_reduce_prompt = """
+너는 발표 어시스턴트입니다. 다음은 한 발표 대본을 순서대로 나눈 각 부분의 요약입니다.
+발표 전체 내용을 바탕으로 청중이 할 만한 예상 질문 3~5개를 생성하세요.
+
+JSON 형식으로 출력 (다른 텍스트 금지):
+{{"predicted_questions": ["", "", ""]}}
+
+부분별 요약:
+{summaries}
+"""
+
+_SENTENCE_END = re.compile(r"([.?!…]|[다요죠])[\"')\]]*\s*$")
+_JOSA_SUFFIXES = ("에서", "으로", "은", "는", "이", "가", "을", "를", "의", "에", "로", "와", "과", "도")
+
+
+def split_transcript_chunks(text: str, segments: list = None, max_chars: int = LLM_CHUNK_CHARS) -> list:
+    """
+    대본을 약 max_chars 글자 단위 구간 목록으로 분할
+    Whisper segment(없으면 문장) 단위로 이어 붙이다가 max_chars를 넘은 뒤 문장이 끝나는 곳에서 자르고,
+    문장 끝이 계속 나오지 않으면 2 * max_chars에서 자름 (너무 짧은 마지막 구간은 앞 구간에 합침)
+    """
+    if segments:
+        units = [seg.get("text", "") for seg in segments if seg.get("text", "").strip()]
+    else:
+        units = [unit + " " for unit in re.split(r"(?<=[.?!])\s+", text) if unit.strip()]
+
+    chunks, current, length = [], [], 0
+    for unit in units:
+        current.append(unit)
+        length += len(unit)
+        if length >= max_chars and (_SENTENCE_END.search(unit) or length >= 2 * max_chars):
+            chunks.append("".join(current).strip())
+            current, length = [], 0
+    if current:
+        tail = "".join(current).strip()
+        if chunks and len(tail) < max_chars // 4:
+            chunks[-1] = f"{chunks[-1]} {tail}"
+        else:
+            chunks.append(tail)
+    return chunks
+
+
+def count_frequent_words(text: str, n: int = 5) -> list:
+    """가장 많이 반복된 단어 n개 (문장부호와 흔한 조사를 떼고 두 글자 이상만)"""
+    words = []
+    for token in re.findall(r"[\w]+", text):
+        for suffix in _JOSA_SUFFIXES:
+            if token.endswith(suffix) and len(token) - len(suffix) >= 2:
+                token = token[:-len(suffix)]
+                break
+        if len(token) >= 2:
+            words.append(token)
+    return [word for word, _ in Counter(words).most_common(n)]
+
+
+def _parse_mmss(value: str):
+    try:
+        minutes, seconds = value.split(":")
+        return int(minutes) * 60 + int(seconds)
+    except (AttributeError, ValueError):
+        return None
+
+
+def _format_mmss(seconds: float) -> str:
+    seconds = int(round(seconds))
+    return f"{seconds // 60}:{seconds % 60:02d}"
+
+
+def _share_time(value: str, ratio: float) -> str:
+    """mm:ss 시간을 구간 길이 비율만큼 나눔 (형식이 다르면 그대로)"""
+    seconds = _parse_mmss(value)
+    return value if seconds is None else _format_mmss(seconds * ratio)
+
+
+async def _map_chunk(chunk: str, index: int, total: int, ratio: float, current_time: str, target_time: str):
+    """구간 하나를 교정한 뒤 바로 분석 (구간끼리는 동시에 진행)"""
+    content = await call_gpt_async(
+        stt_edit_prompt.format(stt_result=chunk), temperature=0, template="stt_edit",
+        validate=_json_with("corrected_sentence"),
+    )
+    corrected = (_loads_or_none(content) or {}).get("corrected_sentence") or chunk
+
+    prompt = analysis_chunk_prompt.format(
+        index=index, total=total, chunk=corrected,
+        current_time=_share_time(current_time, ratio), target_time=_share_time(target_time, ratio),
+    )
+    analysis = _loads_or_none(await call_gpt_async(
+        prompt, temperature=0, template="analysis_chunk", validate=_json_with("adjusted_script"),
+    )) or {}
+    return corrected, analysis
+
+
+async def _map_reduce(chunks: list, current_time: str, target_time: str, on_delta=None):
+    total_chars = sum(len(chunk) for chunk in chunks)
+    mapped = await asyncio.gather(*[
+        _map_chunk(chunk, i + 1, len(chunks), len(chunk) / total_chars, current_time, target_time)
+        for i, chunk in enumerate(chunks)
+    ])
+
+    summaries = "\n".join(
+        f"{i + 1}. {analysis.get('summary') or corrected[:200]}" for i, (corrected, analysis) in enumerate(mapped)
+    )
+    reduced = _loads_or_none(await call_gpt_async(
+        analysis_reduce_prompt.format(summaries=summaries), temperature=0, template="analysis_reduce",
+        on_delta=on_delta, validate=_json_with("predicted_questions"),
+    )) or {}
+    return mapped, reduced
+
+
+def analyze_long_transcript(stt_result: str, segments: list = None, current_time: str = "0:00",
+                            target_time: str = "6:00", on_delta=None):
+    """
+    긴 대본 교정 + 분석 (map-reduce)
+    - map: 문장 경계로 나눈 구간마다 교정 → 분석을 이어서 수행, 구간들은 동시에 (GPT_MAX_CONCURRENCY 제한)
+    - reduce: 구간 요약만 모아 예상 질문 생성
+    - frequent_words는 교정된 전체 대본에서 직접 계산
+    on_delta는 마지막 reduce 호출(예상 질문)의 토큰 조각만 받음
+    반환: (교정된 대본, get_chat_response와 같은 모양의 분석 결과)
+    소요 시간은 대본 길이가 아니라 가장 느린 구간 + 짧은 reduce 호출 한 번으로 결정됨
+    """
+    chunks = split_transcript_chunks(stt_result, segments)
+    if not chunks:
+        return stt_result, {"adjusted_script": None, "feedback": None, "predicted_questions": None}
+    future = asyncio.run_coroutine_threadsafe(_map_reduce(chunks, current_time, target_time, on_delta), _get_loop())
+    mapped, reduced = future.result()
+
+    corrected = " ".join(corrected for corrected, _ in mapped)
+    feedback = {"frequent_words": count_frequent_words(corrected), "awkward_sentences": [], "difficulty_issues": []}
+    for _, analysis in mapped:
+        feedback["awkward_sentences"].extend(analysis.get("awkward_sentences") or [])
+        feedback["difficulty_issues"].extend(analysis.get("difficulty_issues") or [])
+    return corrected, {
+        "adjusted_script": " ".join(
+            analysis.get("adjusted_script") or corrected for corrected, analysis in mapped
+        ),
+        "feedback": feedback,
+        "predicted_questions": reduced.get("predicted_questions"),
+    }
+
+
+def analyze_presentation(stt_result: str, segments: list = None, current_time: str = "0:00",
+                         target_time: str = "6:00", mode: str = LLM_ANALYSIS_MODE, on_delta=None,
+                         long_transcript_chars: int = LLM_LONG_TRANSCRIPT_CHARS, on_reset=None):
+    """
+    분석 작업의 LLM 단계 (교정 + 분석)
+    - 대본이 long_transcript_chars 이상 (0이면 사용 안 함): 구간별 map-reduce
+      구간마다 전체 교정 후 분석하므로 mode와 STT_CORRECTION_MODE="gated"보다 우선함 (로그로 남김)
+    - mode "combined": 구조화 출력 1회 호출
+    - mode "separate": STT 교정(STT_CORRECTION_MODE) 후 분석
+    on_delta를 주면 피드백 생성 호출을 스트리밍하며 토큰 조각마다 호출
+    on_reset: 피드백 생성을 처음부터 다시 스트리밍할 때 호출 ("combined" 응답 검증 실패 시)
+    반환: (교정된 대본, 분석 결과)
+    """
+    if mode not in ("combined", "separate"):
+        raise ValueError(f"지원되지 않는 LLM 분석 방식입니다: {mode}")
+    if long_transcript_chars and len(stt_result) >= long_transcript_chars:
+        print(
+            f"긴 대본({len(stt_result)}자 >= {long_transcript_chars}자)은 구간별 분석으로 처리 "
+            f"(LLM_ANALYSIS_MODE={mode}, STT_CORRECTION_MODE={STT_CORRECTION_MODE} 대신 구간별 전체 교정 → 분석)"
+        )
+        return analyze_long_transcript(
+            stt_result, segments, current_time=current_time, target_time=target_time, on_delta=on_delta
+        )
+    if mode == "combined":
+        return analyze_transcript_combined(
+            stt_result, current_time=current_time, target_time=target_time, on_delta=on_delta, on_reset=on_reset,
+        )
+    corrected = correct_transcript(stt_result, segments)
+    return corrected, get_chat_response(
+        corrected, current_time=current_time, target_time=target_time, on_delta=on_delta
+    )
+
+
+compare_diff_prompt = """
+당신은 발표 코칭 전문가입니다.  
+사용자가 같은 발표의 이전 대본을 수정해서 이번 대본을 만들었습니다.
+이번 발표는 전체 {total}문장 중 {unchanged}문장이 이전 발표와 같고, 아래에는 바뀐 부분만 앞뒤 문맥과 함께 주어집니다.
+바뀐 부분을 중심으로 이번 발표가 이전 발표에 비해 어떻게 발전했는지 분석하고,
+아직 개선해야 할 부분을 중심으로 피드백을 제공합니다.  
+
+'이전 발표', '이번 발표'라는 자연스러운 표현을 사용하세요.  
+
+발표의 성격에 따라 청중 참여나 상호작용은 필수 요소가 아닙니다.
+설득형 발표라면 청중 참여를 권장할 수 있으나, 정보 전달형 발표라면 명확한 구조와 논리적 흐름을 더 중점적으로 평가하세요
+
+출력은 반드시 아래 JSON 형식을 따르세요.  
+불필요한 설명이나 서두는 포함하지 마세요.  
+
+바뀐 부분:
+{changes}
+
+출력 형식 예시:
+{{
+  "improvements_made": "이번 발표가 이전 발표에 비해 발전한 점",
+  "areas_to_improve": "이번 발표에서 여전히 보완이 필요한 부분",
+  "overall_feedback": "이번 발표에 대한 종합 평가"
+}}
+
+평가 기준:
+- 발표 구조의 완성도 (도입, 전개, 결론의 논리적 연결)
+- 내용의 구체성과 깊이 (핵심 주제에 대한 이해, 예시의 적절성)
+- 논리적 흐름과 설득력 (근거의 타당성, 메시지의 일관성)
+- 언어 표현의 명확성과 자연스러움
+- 전달력과 자신감 
+- 전체적인 완성도와 전문성
+"""
+
+_DIFF_LABELS = {"replace": "수정", "delete": "삭제", "insert": "추가"}
+
+
+def split_sentences(script: str) -> list:
+    """대본을 문장 목록으로 분할 (줄바꿈과 들여쓰기는 무시)"""
+    sentences = []
+    for line in script.splitlines():
+        sentences.extend(part.strip() for part in re.split(r"(?<=[.?!])\s+", line) if part.strip())
+    return sentences
+
+
+def diff_scripts(script1: str, script2: str, context: int = COMPARE_DIFF_CONTEXT):
+    """
+    두 대본을 문장 단위로 정렬해 바뀐 부분 목록 반환
+    각 항목: {"type": replace/delete/insert, "before": 이전 문장들, "after": 이번 문장들,
+             "context_before" / "context_after": 이번 대본의 앞뒤 문장 context개}
+    반환: (바뀐 부분 목록, 이번 대본 문장 수, 바뀌지 않은 문장 수)
+    """
+    before, after = split_sentences(script1), split_sentences(script2)
+    matcher = difflib.SequenceMatcher(None, before, after, autojunk=False)
+    changes, unchanged = [], 0
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            unchanged += i2 - i1
+            continue
+        changes.append({
+            "type": tag,
+            "before": before[i1:i2],
+            "after": after[j1:j2],
+            "context_before": after[max(0, j1 - context):j1],
+            "context_after": after[j2:j2 + context],
+        })
+    return changes, len(after), unchanged
+
+
+def _format_changes(changes: list) -> str:
+    lines = []
+    for n, change in enumerate(changes, start=1):
+        lines.append(f"[변경 {n}] ({_DIFF_LABELS[change['type']]})")
+        if change["context_before"]:
+            lines.append(f"- 앞 문맥: {' '.join(change['context_before'])}")
+        if change["before"]:
+            lines.append(f"- 이전 발표: {' '.join(change['before'])}")
+        if change["after"]:
+            lines.append(f"- 이번 발표: {' '.join(change['after'])}")
+        if change["context_after"]:
+            lines.append(f"- 뒤 문맥: {' '.join(change['context_after'])}")
+    return "\n".join(lines)
+
+
+def _build_compare_prompt(script1: str, script2: str, mode: str = COMPARE_MODE):
+    """
+    (프롬프트, 템플릿 이름) 반환, 두 대본이 문장 단위로 같으면 (None, None)
+    diff 모드는 바뀐 문장 비율이 COMPARE_DIFF_MAX_RATIO 이하일 때만 사용
+    """
+    if mode == "diff":
+        changes, total, unchanged = diff_scripts(script1, script2)
+        if not changes:
+            return None, None
+        if total and (total - unchanged) / total <= COMPARE_DIFF_MAX_RATIO:
+            prompt = compare_diff_prompt.format(total=total, unchanged=unchanged, changes=_format_changes(changes))
+            return prompt, "compare_diff"
+    elif mode != "full":
+        raise ValueError(f"지원되지 않는 비교 방식입니다: {mode}")
+    return compare_prompt.format(script1=script1, script2=script2), "compare"
+
+
+def _unchanged_compare_result():
+    return {
+        "improvements_made": "이전 발표와 대본이 같습니다.",
+        "areas_to_improve": None,
+        "overall_feedback": "대본을 수정한 뒤 다시 비교해 주세요.",
+    }
+
+
 def get_compare_result(script1: str, script2: str):
-    """두 발표 대본을 비교하여 피드백 제공"""
-    prompt = compare_prompt.format(script1=script1, script2=script2)
-    content = call_gpt(prompt, temperature=0)
+    """두 발표 대본을 비교하여 피드백 제공 (COMPARE_MODE="diff"이면 바뀐 부분만 전송)"""
+    prompt, template = _build_compare_prompt(script1, script2)
+    if prompt is None:
+        return _unchanged_compare_result()
+    content = call_gpt(prompt, temperature=0, template=template, validate=_json_with())
+    return _parse_compare_result(content)
+
+async def get_compare_result_async(script1: str, script2: str, on_delta=None):
+    """get_compare_result의 비동기 버전 (/compare 핸들러용, on_delta: 스트리밍 토큰 조각 콜백)"""
+    prompt, template = _build_compare_prompt(script1, script2)
+    if prompt is None:
+        return _unchanged_compare_result()
+    content = await call_gpt_async(prompt, temperature=0, template=template, on_delta=on_delta, validate=_json_with())
+    return _parse_compare_result(content)
+
+def _parse_compare_result(content: str):
     try:
         return json.loads(content)
     except (json.JSONDecodeError, KeyError):
@@ -0,0 +1,335 @@
+"""분석 작업 상태 저장소
+
+uvicorn --workers N 으로 여러 프로세스를 띄워도 어느 워커에서든 같은 작업을 조회할 수 있도록
+작업 상태를 프로세스 밖(SQLite, WAL 모드)에 저장합니다.
+
+작업 레코드는 /result 응답과 같은 모양의 dict 입니다.
+    {"status": "processing"}
+    {"status": "completed", "result": {...}}
+    {"status": "error", "error": "..."}
+
+분석 중인 작업은 단계가 끝날 때마다 진행 상황과 부분 결과를 함께 기록합니다 (update).
+    {"status": "processing", "progress": 0.5, "stages": {...}, "partial": {...}}
+
+레코드가 바뀔 때마다(create / transition / update) 1씩 증가하는 version을 함께 저장하고,
+get 결과에 "version" 키로 포함합니다 (/result의 ETag, 롱폴링 변경 감지에 사용).
+
+cache_key(같은 파일 + 같은 분석 조건)를 함께 저장하면, 분석 중인 같은 요청이
+새 작업을 만들지 않고 기존 작업에 합류할 수 있습니다 (create_or_attach).
+
+processing 작업은 실행 중인 워커가 주기적으로 heartbeat를 기록합니다.
+lease(초) 동안 갱신되지 않은 작업은 워커가 중단(재시작, 비정상 종료)된 것으로 보고
+expire_stale로 오류 처리하며, create_or_attach의 합류 대상에서도 제외합니다.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from config import JOB_STORE_BACKEND, JOB_DB_PATH, JOB_LEASE_SECONDS
+
+
+def _json_default(value):
+    # numpy 스칼라/배열(np.float64, np.int64, ndarray 등)을 JSON으로 저장
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _dumps(data: dict) -> str:
+    return json.dumps(data, ensure_ascii=False, default=_json_default)
+
+
+STALE_JOB_ERROR = "작업을 처리하던 서버가 중단되었습니다. 다시 시도해주세요."
+
+
+def _fields(record: dict) -> dict:
+    # status / version은 저장소가 따로 관리
+    return {k: v for k, v in record.items() if k not in ("status", "version")}
+
+
+class JobStore:
+    """작업 저장소 인터페이스"""
+
+    def create(self, job_id: str, record: dict) -> None:
+        raise NotImplementedError
+
+    def get(self, job_id: str) -> Optional[dict]:
+        raise NotImplementedError
+
+    def get_status(self, job_id: str) -> Optional[str]:
+        record = self.get(job_id)
+        return record["status"] if record else None
+
+    def get_version(self, job_id: str) -> Optional[int]:
+        record = self.get(job_id)
+        return record["version"] if record else None
+
+    def transition(self, job_id: str, from_status: str, record: dict) -> bool:
+        """현재 상태가 from_status일 때만 record로 교체 (원자적), 성공 여부 반환"""
+        raise NotImplementedError
+
+    def update(self, job_id: str, fields: dict) -> bool:
+        """상태는 그대로 두고 레코드에 필드를 병합 (원자적), 작업이 없으면 False"""
+        raise NotImplementedError
+
+    def delete(self, job_id: str) -> None:
+        """작업 삭제 (대기열에 넣지 못한 작업 정리용)"""
+        raise NotImplementedError
+
+    def create_or_attach(self, job_id: str, record: dict, cache_key: str, max_age: float) -> str:
+        """
+        max_age(초) 이내에 시작되어 lease 안에 갱신된 같은 cache_key의 processing 작업이 있으면 그 job_id 반환,
+        없으면 job_id로 작업을 생성하고 job_id 반환 (확인과 생성은 원자적)
+        """
+        raise NotImplementedError
+
+    def heartbeat(self, job_ids) -> None:
+        """processing 작업들의 갱신 시각 기록 (version은 그대로)"""
+        raise NotImplementedError
+
+    def expire_stale(self) -> int:
+        """lease 동안 갱신되지 않은 processing 작업을 오류로 전이, 전이한 수 반환"""
+        raise NotImplementedError
+
+
+class MemoryJobStore(JobStore):
+    """단일 프로세스용 메모리 저장소"""
+
+    def __init__(self, lease: float = JOB_LEASE_SECONDS):
+        self.lease = lease
+        self._jobs = {}
+        self._touched = {}  # job_id -> 마지막 갱신 시각
+        self._inflight = {}  # cache_key -> (job_id, 생성 시각)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _record(record: dict, version: int) -> dict:
+        return {"status": record["status"], **_fields(record), "version": version}
+
+    def create(self, job_id: str, record: dict) -> None:
+        with self._lock:
+            self._jobs[job_id] = self._record(record, 1)
+            self._touched[job_id] = time.time()
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            record = self._jobs.get(job_id)
+            return dict(record) if record else None
+
+    def transition(self, job_id: str, from_status: str, record: dict) -> bool:
+        with self._lock:
+            current = self._jobs.get(job_id)
+            if not current or current["status"] != from_status:
+                return False
+            self._jobs[job_id] = self._record(record, current["version"] + 1)
+            self._touched[job_id] = time.time()
+            return True
+
+    def update(self, job_id: str, fields: dict) -> bool:
+        with self._lock:
+            current = self._jobs.get(job_id)
+            if not current:
+                return False
+            current.update(_fields(fields))
+            current["version"] += 1
+            self._touched[job_id] = time.time()
+            return True
+
+    def delete(self, job_id: str) -> None:
+        with self._lock:
+            self._jobs.pop(job_id, None)
+            self._touched.pop(job_id, None)
+
+    def create_or_attach(self, job_id: str, record: dict, cache_key: str, max_age: float) -> str:
+        with self._lock:
+            now = time.time()
+            existing_id, created_at = self._inflight.get(cache_key, (None, 0.0))
+            existing = self._jobs.get(existing_id)
+            if (existing and existing["status"] == "processing" and now - created_at <= max_age
+                    and now - self._touched.get(existing_id, 0.0) <= self.lease):
+                return existing_id
+            self._jobs[job_id] = self._record(record, 1)
+            self._touched[job_id] = now
+            self._inflight[cache_key] = (job_id, now)
+            return job_id
+
+    def heartbeat(self, job_ids) -> None:
+        with self._lock:
+            now = time.time()
+            for job_id in job_ids:
+                current = self._jobs.get(job_id)
+                if current and current["status"] == "processing":
+                    self._touched[job_id] = now
+
+    def expire_stale(self) -> int:
+        with self._lock:
+            deadline = time.time() - self.lease
+            stale = [
+                job_id for job_id, record in self._jobs.items()
+                if record["status"] == "processing" and self._touched.get(job_id, 0.0) < deadline
+            ]
+            for job_id in stale:
+                version = self._jobs[job_id]["version"] + 1
+                self._jobs[job_id] = self._record({"status": "error", "error": STALE_JOB_ERROR}, version)
+            return len(stale)
+
+
+class SQLiteJobStore(JobStore):
+    """
+    SQLite(WAL) 저장소
+    - job_id는 PRIMARY KEY라 조회가 인덱스로 처리됨
+    - 상태 전이는 WHERE status=? 조건부 UPDATE 한 번으로 원자적으로 처리
+    - 스레드마다 별도 커넥션 사용
+    """
+
+    def __init__(self, db_path: str, lease: float = JOB_LEASE_SECONDS):
+        self.db_path = db_path
+        self.lease = lease
+        self._local = threading.local()
+        db_dir = os.path.dirname(os.path.abspath(db_path))
+        os.makedirs(db_dir, exist_ok=True)
+
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id     TEXT PRIMARY KEY,
+                status     TEXT NOT NULL,
+                data       TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status)")
+        # cache_key 컬럼이 없는 이전 버전 DB 갱신
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(jobs)")]
+        if "cache_key" not in columns:
+            conn.execute("ALTER TABLE jobs ADD COLUMN cache_key TEXT")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_cache_key ON jobs (cache_key)")
+        if "version" not in columns:
+            conn.execute("ALTER TABLE jobs ADD COLUMN version INTEGER NOT NULL DEFAULT 1")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _split(record: dict):
+        return record["status"], _dumps(_fields(record))
+
+    def create(self, job_id: str, record: dict) -> None:
+        status, data = self._split(record)
+        now = time.time()
+        self._conn().execute(
+            "INSERT OR REPLACE INTO jobs (job_id, status, data, created_at, updated_at, version) "
+            "VALUES (?, ?, ?, ?, ?, 1)",
+            (job_id, status, data, now, now),
+        )
+
+    def get(self, job_id: str) -> Optional[dict]:
+        row = self._conn().execute("SELECT status, data, version FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        return {"status": row[0], **json.loads(row[1]), "version": row[2]}
+
+    def get_status(self, job_id: str) -> Optional[str]:
+        row = self._conn().execute("SELECT status FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return row[0] if row else None
+
+    def get_version(self, job_id: str) -> Optional[int]:
+        row = self._conn().execute("SELECT version FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return row[0] if row else None
+
+    def transition(self, job_id: str, from_status: str, record: dict) -> bool:
+        status, data = self._split(record)
+        cur = self._conn().execute(
+            "UPDATE jobs SET status = ?, data = ?, updated_at = ?, version = version + 1 "
+            "WHERE job_id = ? AND status = ?",
+            (status, data, time.time(), job_id, from_status),
+        )
+        return cur.rowcount == 1
+
+    def update(self, job_id: str, fields: dict) -> bool:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT data FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+            if row is None:
+                conn.execute("ROLLBACK")
+                return False
+            data = json.loads(row[0])
+            data.update(_fields(fields))
+            conn.execute(
+                "UPDATE jobs SET data = ?, updated_at = ?, version = version + 1 WHERE job_id = ?",
+                (_dumps(data), time.time(), job_id),
+            )
+            conn.execute("COMMIT")
+            return True
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def delete(self, job_id: str) -> None:
+        self._conn().execute("DELETE FROM jobs WHERE job_id = ?", (job_id,))
+
+    def create_or_attach(self, job_id: str, record: dict, cache_key: str, max_age: float) -> str:
+        status, data = self._split(record)
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            now = time.time()
+            row = conn.execute(
+                "SELECT job_id FROM jobs WHERE cache_key = ? AND status = 'processing' AND created_at >= ? "
+                "AND updated_at >= ? ORDER BY created_at DESC LIMIT 1",
+                (cache_key, now - max_age, now - self.lease),
+            ).fetchone()
+            if row is not None:
+                conn.execute("COMMIT")
+                return row[0]
+            conn.execute(
+                "INSERT OR REPLACE INTO jobs (job_id, status, data, created_at, updated_at, cache_key, version) "
+                "VALUES (?, ?, ?, ?, ?, ?, 1)",
+                (job_id, status, data, now, now, cache_key),
+            )
+            conn.execute("COMMIT")
+            return job_id
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def heartbeat(self, job_ids) -> None:
+        job_ids = list(job_ids)
+        if not job_ids:
+            return
+        placeholders = ", ".join("?" * len(job_ids))
+        self._conn().execute(
+            f"UPDATE jobs SET updated_at = ? WHERE status = 'processing' AND job_id IN ({placeholders})",
+            (time.time(), *job_ids),
+        )
+
+    def expire_stale(self) -> int:
+        cur = self._conn().execute(
+            "UPDATE jobs SET status = 'error', data = ?, updated_at = ?, version = version + 1 "
+            "WHERE status = 'processing' AND updated_at < ?",
+            (_dumps({"error": STALE_JOB_ERROR}), time.time(), time.time() - self.lease),
+        )
+        return cur.rowcount
+
+
+def create_job_store(backend: str = JOB_STORE_BACKEND) -> JobStore:
+    """설정에 맞는 작업 저장소 생성"""
+    if backend == "sqlite":
+        return SQLiteJobStore(JOB_DB_PATH)
+    if backend == "memory":
+        return MemoryJobStore()
+    raise ValueError(f"지원되지 않는 작업 저장소입니다: {backend}")
@@ -0,0 +1,132 @@
+"""LLM 응답 캐시
+
+temperature=0 호출은 같은 프롬프트에 사실상 같은 응답을 주므로, 응답을 저장해 두고 재사용합니다.
+- 1단계: 프로세스 메모리 LRU (LLM_CACHE_SIZE 항목)
+- 2단계: SQLite 디스크 캐시 (여러 워커 프로세스 공유, LLM_CACHE_TTL이 지나면 만료)
+
+키는 모델 이름, 프롬프트 템플릿 이름/버전, 완성된 프롬프트의 SHA-256으로 만듭니다.
+이벤트 루프에서는 get_async / put_async를 사용합니다 (메모리는 바로 확인하고 SQLite 읽기/쓰기는 스레드에서 실행).
+템플릿의 출력 형식이나 의미를 바꿀 때는 gpt.PROMPT_VERSIONS의 버전을 올리면 이전 응답이 재사용되지 않습니다.
+"""
+import asyncio
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from config import LLM_CACHE_SIZE, LLM_CACHE_DB_PATH, LLM_CACHE_TTL
+
+
+def make_llm_cache_key(model: str, template: str, version: int, prompt: str) -> str:
+    prompt_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+    return f"{model}:{template}:v{version}:{prompt_hash}"
+
+
+class LLMCache:
+    def __init__(self, max_entries: int = LLM_CACHE_SIZE, db_path: str = LLM_CACHE_DB_PATH, ttl: float = LLM_CACHE_TTL):
+        self.max_entries = max_entries
+        self.db_path = db_path
+        self.ttl = ttl
+        self._memory = OrderedDict()  # key -> (저장 시각, 응답)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key        TEXT PRIMARY KEY,
+                response   TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )
+            """
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_created_at ON llm_cache (created_at)")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn = conn
+        return conn
+
+    def _count(self, name: str):
+        with self._lock:
+            self._counters[name] += 1
+
+    def _remember(self, key: str, created_at: float, response: str):
+        with self._lock:
+            self._memory[key] = (created_at, response)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _get_memory(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and time.time() - entry[0] <= self.ttl:
+                self._memory.move_to_end(key)
+                self._counters["memory_hits"] += 1
+                return entry[1]
+        return None
+
+    def _get_disk(self, key: str) -> Optional[str]:
+        now = time.time()
+        row = self._conn().execute(
+            "SELECT response, created_at FROM llm_cache WHERE key = ? AND created_at >= ?", (key, now - self.ttl)
+        ).fetchone()
+        if row is None:
+            self._count("misses")
+            return None
+        self._remember(key, row[1], row[0])
+        self._count("disk_hits")
+        return row[0]
+
+    def _put_disk(self, key: str, response: str, created_at: float):
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO llm_cache (key, response, created_at) VALUES (?, ?, ?)", (key, response, created_at)
+        )
+        conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (created_at - self.ttl,))
+
+    def get(self, key: str) -> Optional[str]:
+        """캐시된 응답 (없거나 만료되었으면 None)"""
+        cached = self._get_memory(key)
+        return cached if cached is not None else self._get_disk(key)
+
+    def put(self, key: str, response: str):
+        """응답 저장 (디스크의 만료 항목도 함께 정리)"""
+        now = time.time()
+        self._remember(key, now, response)
+        self._put_disk(key, response, now)
+
+    async def get_async(self, key: str) -> Optional[str]:
+        """get과 같지만 메모리에 없을 때만 SQLite 조회를 스레드에서 실행 (이벤트 루프를 막지 않음)"""
+        cached = self._get_memory(key)
+        return cached if cached is not None else await asyncio.to_thread(self._get_disk, key)
+
+    async def put_async(self, key: str, response: str):
+        """put과 같지만 메모리에 바로 기록하고 SQLite 쓰기는 스레드에서 실행"""
+        now = time.time()
+        self._remember(key, now, response)
+        await asyncio.to_thread(self._put_disk, key, response, now)
+
+    def stats(self) -> dict:
+        with self._lock:
+            counters = dict(self._counters)
+            memory_entries = len(self._memory)
+        lookups = sum(counters.values())
+        hits = counters["memory_hits"] + counters["disk_hits"]
+        return {
+            **counters,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "memory_entries": memory_entries,
+        }
@@ -0,0 +1,45 @@
+"""LLM 구조화 출력(JSON Schema) 모델
+
+response_format의 json_schema로 출력 형식을 강제하고, 응답은 같은 모델로 검증합니다.
+strict 모드는 모든 필드가 필수이고 추가 필드가 없어야 하므로 extra="forbid"로 정의합니다.
+"""
+from typing import List, Literal
+
+from pydantic import BaseModel, ConfigDict
+
+
+class _StrictModel(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+
+class AwkwardSentence(_StrictModel):
+    original: str
+    suggestion: str
+
+
+class DifficultyIssue(_StrictModel):
+    type: Literal["too_easy", "too_difficult"]
+    sentence: str
+    suggestion: str
+
+
+class Feedback(_StrictModel):
+    frequent_words: List[str]
+    awkward_sentences: List[AwkwardSentence]
+    difficulty_issues: List[DifficultyIssue]
+
+
+class CombinedAnalysis(_StrictModel):
+    """STT 교정 + 발표 분석 한 번에 (LLM_ANALYSIS_MODE="combined")"""
+    corrected_sentence: str
+    adjusted_script: str
+    feedback: Feedback
+    predicted_questions: List[str]
+
+
+def json_schema_format(name: str, model: type) -> dict:
+    """chat.completions.create의 response_format 인자"""
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": name, "strict": True, "schema": model.model_json_schema()},
+    }
@@ -1,20 +1,58 @@
+import asyncio
+import hashlib
 import json
+import multiprocessing
 import os
+import threading
+import time
 import uuid
-from typing import Dict
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from contextlib import asynccontextmanager
+from functools import partial
 
-from fastapi import FastAPI, File, Form, UploadFile, BackgroundTasks
+from fastapi import FastAPI, File, Form, Header, Request, Response, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
 
-from anxiety.anxiety_score import anxiety_analysis
-from config import UPLOAD_DIR, DEFAULT_TARGET_TIME
-from gpt import correct_stt_result, get_chat_response, get_compare_result
-from utils.file_handler import save_upload_file, merge_chunks, convert_to_wav
-from voice_analysis import SoundAnalyzer
-from whisper_utils import transcribe_audio, calculate_pronunciation_score, calculate_wpm
+from anxiety.facial_feature import extract_visual_features, face_mesh_worker_ready, warmup_face_mesh_pool
+from acoustic_context import AcousticContext
+from anxiety.voice_feature import extract_features_by_window
+from config import (
+    UPLOAD_DIR, DEFAULT_TARGET_TIME, ANALYSIS_SAMPLE_RATE, STAGE_THREADS, VISUAL_PROCESS_WORKERS, MODEL_WARMUP,
+    RESULT_CACHE_ENABLED, RESULT_CACHE_INFLIGHT_MAX_AGE, SSE_KEEPALIVE_SECONDS, LONG_POLL_MAX_SECONDS,
+    JOB_POLL_INTERVAL_SECONDS, STT_BACKEND, STT_MODEL_SIZE, STT_CORRECTION_MODE, LLM_ANALYSIS_MODE,
+    LLM_LONG_TRANSCRIPT_CHARS, JOB_HEARTBEAT_INTERVAL,
+)
+from events import broker, format_sse
+from feature_store import save_features, load_features, load_features_by_hash
+from gpt import analyze_presentation, get_compare_result_async, close_client, get_llm_cache, PROMPT_VERSIONS
+from job_store import create_job_store
+from model_registry import registry
+from pipeline import Stage, run_stages
+from result_cache import ResultCache, make_cache_key
+from scoring import (
+    collect_features, grade_features, segment_features, acoustic_features, anxiety_features,
+    speech_grades, prosody_grades, anxiety_grades, SCORING_VERSION,
+)
+from scheduler import AnalysisScheduler, QueueFullError, PRIORITY_AUDIO_ONLY, PRIORITY_VIDEO
+from utils.audio import decode_audio, SUPPORTED_EXTENSIONS
+from utils.file_handler import save_upload_file, file_sha256
+from utils.upload_session import create_session, save_chunk, get_session_status, finalize_session, reset_session
+from whisper_utils import transcribe_audio
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 모델은 요청 처리와 별개로 백그라운드에서 로딩 (/ready로 준비 상태 확인)
+    if MODEL_WARMUP:
+        registry.warmup()
+    threading.Thread(target=_job_heartbeat, name="job-heartbeat", daemon=True).start()
+    yield
+    close_client()
 
-app = FastAPI()
+
+app = FastAPI(lifespan=lifespan)
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
 app.add_middleware(
@@ -25,127 +63,646 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-jobs: Dict[str, dict] = {}
+jobs = create_job_store()
+scheduler = AnalysisScheduler()
+result_cache = ResultCache()
+
+# 분석 단계 실행용 풀 (모든 작업이 공유)
+stage_threads = ThreadPoolExecutor(max_workers=STAGE_THREADS, thread_name_prefix="analysis-stage")
+# 영상 분석 프로세스는 시작할 때 FaceMesh 풀을 채운 뒤에 작업을 받음 (initializer)
+visual_processes = (
+    ProcessPoolExecutor(
+        max_workers=VISUAL_PROCESS_WORKERS, mp_context=multiprocessing.get_context("spawn"),
+        initializer=warmup_face_mesh_pool,
+    )
+    if VISUAL_PROCESS_WORKERS > 0 else None
+)
+
+
+def _warmup_visual_workers():
+    """
+    영상 분석 프로세스를 모두 띄우고 각 프로세스의 FaceMesh 풀이 채워질 때까지 대기
+    확인 작업들이 barrier에서 서로를 기다리므로 워커 수만큼의 서로 다른 프로세스가 준비되어야 끝남
+    """
+    if visual_processes is None:
+        warmup_face_mesh_pool()
+        return True
+    with multiprocessing.get_context("spawn").Manager() as manager:
+        barrier = manager.Barrier(VISUAL_PROCESS_WORKERS)
+        futures = [visual_processes.submit(face_mesh_worker_ready, barrier) for _ in range(VISUAL_PROCESS_WORKERS)]
+        pids = {future.result() for future in futures}
+    if len(pids) != VISUAL_PROCESS_WORKERS:
+        raise RuntimeError(f"영상 분석 프로세스 준비 확인 실패 ({len(pids)}/{VISUAL_PROCESS_WORKERS})")
+    return True
+
+
+registry.register("face_mesh", _warmup_visual_workers)
+
+
+def _job_heartbeat():
+    """
+    이 워커가 맡은 작업의 생존 신호를 JOB_HEARTBEAT_INTERVAL마다 기록하고,
+    중단된 워커가 남긴 processing 작업(JOB_LEASE_SECONDS 동안 갱신 없음)을 오류로 정리
+    """
+    while True:
+        try:
+            jobs.heartbeat(scheduler.job_ids())
+            expired = jobs.expire_stale()
+            if expired:
+                print(f"중단된 작업 {expired}개를 오류로 처리했습니다.")
+        except Exception as e:
+            print(f"작업 생존 신호 기록 실패: {e}")
+        time.sleep(JOB_HEARTBEAT_INTERVAL)
 
 
 # ----------------- API -----------------
 
+@app.get("/ready")
+def ready():
+    """모델 로딩이 끝났는지 확인 (롤링 배포 readiness probe용)"""
+    status = registry.status()
+    if not registry.is_ready():
+        return JSONResponse(status_code=503, content={"status": "loading", "models": status})
+    return {"status": "ready", "models": status}
+
+
+@app.get("/stats")
+def stats():
+    """캐시 적중 현황 (이 워커 프로세스 기준)"""
+    llm_cache = get_llm_cache()
+    return {"llm_cache": llm_cache.stats() if llm_cache else None}
+
+
 @app.post("/compare")
 async def compare_scripts(script1: str = Form(...), script2: str = Form(...)):
     try:
-        result = get_compare_result(script1, script2)
+        result = await get_compare_result_async(script1, script2)
         return JSONResponse(content=result)
     except Exception as e:
         return JSONResponse(status_code=500, content={"error": str(e)})
 
 
+@app.post("/compare/stream")
+async def compare_scripts_stream(script1: str = Form(...), script2: str = Form(...)):
+    """
+    /compare의 SSE 버전: 생성되는 토큰을 바로 전달하고 마지막에 /compare와 같은 JSON 전달
+    이벤트: delta {"text": 조각} ..., result {...} 또는 error {"error": ...}
+    """
+    topic = f"compare:{uuid.uuid4().hex}"
+    subscription = broker.subscribe(topic)
+
+    async def run():
+        try:
+            result = await get_compare_result_async(script1, script2, on_delta=partial(_publish_delta, topic))
+            broker.publish(topic, "result", result)
+        except Exception as e:
+            broker.publish(topic, "error", {"error": str(e)})
+        finally:
+            broker.close(topic)
+
+    task = asyncio.create_task(run())
+    return StreamingResponse(_sse_events(subscription, task=task), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
 @app.post("/analysis")
 async def transcribe(
-    background_tasks: BackgroundTasks,
+    request: Request,
     video: UploadFile = File(...),
     metadata: str = Form(...),
     chunk_index: int = Form(default=None),
     total_chunks: int = Form(default=None),
     original_filename: str = Form(default=None),
+    upload_id: str = Form(default=None),
 ):
-    job_id = str(uuid.uuid4())
-    jobs[job_id] = {"status": "processing"}
-
-
     ext = os.path.splitext(video.filename)[1].lower()
 
     # 청크 병합
     if chunk_index is not None and total_chunks is not None and original_filename:
-        # chunked upload
-        chunk_filename = f"{original_filename}_chunk_{chunk_index}{ext}"
-        save_upload_file(video, chunk_filename, UPLOAD_DIR)
-        uploaded_chunks = [
-            name for name in os.listdir(UPLOAD_DIR) if name.startswith(original_filename + "_chunk_")
-        ]
-        if len(uploaded_chunks) < total_chunks:
+        # chunked upload (기존 클라이언트 호환)
+        # 클라이언트가 upload_id를 보내면 그 값으로, 아니면 파일명 / 청크 수 / 클라이언트 주소로 세션 구분
+        client_key = upload_id or (request.client.host if request.client else "")
+        session_key = f"{original_filename}:{total_chunks}:{ext}:{client_key}".encode("utf-8")
+        session_id = "legacy_" + hashlib.sha256(session_key).hexdigest()[:32]
+        try:
+            create_session(os.path.splitext(original_filename)[0] + ext, total_chunks, UPLOAD_DIR, upload_id=session_id)
+            if upload_id is None and chunk_index == 0:
+                # upload_id 없이 이미 받은 0번 청크가 다시 오면 중단했던 업로드를 처음부터 다시 보내는 것으로 보고
+                # 이전 수신 표시를 지움 (이전 시도의 청크가 섞이지 않도록)
+                if 0 not in get_session_status(session_id, UPLOAD_DIR)["missing_chunks"]:
+                    reset_session(session_id, UPLOAD_DIR)
+            status = await save_chunk(session_id, chunk_index, video, UPLOAD_DIR)
+        except FileNotFoundError as e:
+            return JSONResponse(status_code=404, content={"error": str(e)})
+        except ValueError as e:
+            return JSONResponse(status_code=400, content={"error": str(e)})
+        if not status["complete"]:
             return {"status": "chunk_received", "chunk_index": chunk_index}
 
-        save_path = merge_chunks(original_filename, total_chunks, ext, UPLOAD_DIR)
+        try:
+            save_path = await run_in_threadpool(finalize_session, session_id, UPLOAD_DIR)
+        except FileNotFoundError:
+            # 동시에 도착한 다른 청크 요청이 이미 병합을 시작함
+            return {"status": "chunk_received", "chunk_index": chunk_index}
+        job_id = str(uuid.uuid4())
+        content_hash = await run_in_threadpool(file_sha256, save_path)
+    else:
+        # 일반 업로드 (저장하면서 내용 해시 계산)
+        job_id = str(uuid.uuid4())
+        digest = hashlib.sha256()
+        save_path = await save_upload_file(video, f"temp_{job_id}{ext}", UPLOAD_DIR, digest=digest)
+        content_hash = digest.hexdigest()
+
+    # 결과 캐시 조회와 작업 등록은 SQLite를 쓰므로 이벤트 루프 밖에서 실행
+    return await run_in_threadpool(start_analysis_job, job_id, save_path, metadata, content_hash)
+
+
+# ----------------- 분할 업로드 세션 -----------------
+
+@app.post("/upload")
+def create_upload(filename: str = Form(...), total_chunks: int = Form(...)):
+    try:
+        manifest = create_session(filename, total_chunks, UPLOAD_DIR)
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"error": str(e)})
+    return {"upload_id": manifest["upload_id"], "total_chunks": manifest["total_chunks"]}
+
+
+@app.put("/upload/{upload_id}/chunks/{chunk_index}")
+async def upload_chunk(upload_id: str, chunk_index: int, video: UploadFile = File(...)):
+    try:
+        status = await save_chunk(upload_id, chunk_index, video, UPLOAD_DIR)
+    except FileNotFoundError as e:
+        return JSONResponse(status_code=404, content={"error": str(e)})
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"error": str(e)})
+    return {
+        "upload_id": upload_id,
+        "chunk_index": chunk_index,
+        "received_chunks": status["received_chunks"],
+        "total_chunks": status["total_chunks"],
+    }
+
+
+@app.get("/upload/{upload_id}")
+def get_upload_status(upload_id: str):
+    try:
+        return get_session_status(upload_id, UPLOAD_DIR)
+    except FileNotFoundError as e:
+        return JSONResponse(status_code=404, content={"error": str(e)})
+
+
+@app.post("/upload/{upload_id}/complete")
+async def complete_upload(upload_id: str, metadata: str = Form(...)):
+    try:
+        save_path = await run_in_threadpool(finalize_session, upload_id, UPLOAD_DIR)
+    except FileNotFoundError as e:
+        return JSONResponse(status_code=404, content={"error": str(e)})
+    except ValueError as e:
+        return JSONResponse(status_code=409, content={"error": str(e)})
+
+    content_hash = await run_in_threadpool(file_sha256, save_path)
+    return await run_in_threadpool(start_analysis_job, str(uuid.uuid4()), save_path, metadata, content_hash)
+
+
+# 분석 결과에 영향을 주는 버전 / 설정 (결과 캐시 키에 포함)
+ANALYSIS_VERSIONS = {
+    "scoring": SCORING_VERSION,
+    "prompts": PROMPT_VERSIONS,
+    "stt": [STT_BACKEND, STT_MODEL_SIZE],
+    "llm": [LLM_ANALYSIS_MODE, STT_CORRECTION_MODE, LLM_LONG_TRANSCRIPT_CHARS],
+}
+
+
+def _parse_target_time(metadata: str) -> str:
+    if not metadata:
+        return DEFAULT_TARGET_TIME
+    return json.loads(metadata).get("target_time", DEFAULT_TARGET_TIME)
+
+
+def _remove_upload(save_path: str):
+    try:
+        os.remove(save_path)
+    except FileNotFoundError:
+        pass
+
+
+def start_analysis_job(job_id: str, save_path: str, metadata: str, content_hash: str):
+    """
+    업로드가 끝난 파일로 분석 작업 등록
+    같은 파일 + 같은 분석 조건의 결과가 캐시에 있으면 바로 반환하고,
+    같은 요청이 분석 중이면 새 작업 대신 그 작업의 job_id 반환 (두 경우 모두 업로드 파일은 삭제)
+    """
+    ext = os.path.splitext(save_path)[1].lower()
+    if ext not in SUPPORTED_EXTENSIONS:
+        return JSONResponse(status_code=400, content={"error": "지원되지 않는 파일 형식입니다. wav 또는 mp4만 허용됩니다."})
+
+    cache_key = None
+    if RESULT_CACHE_ENABLED:
+        try:
+            cache_key = make_cache_key(content_hash, ext, _parse_target_time(metadata), ANALYSIS_VERSIONS)
+        except (ValueError, AttributeError):
+            # 메타데이터 오류는 분석 작업에서 그대로 오류로 기록
+            cache_key = None
+
+    if cache_key:
+        cached = result_cache.get(cache_key)
+        if cached is not None:
+            _remove_upload(save_path)
+            # 특징은 원래 분석한 작업에 저장되어 있으므로 /rescore는 content_hash로 찾음
+            jobs.create(job_id, {"status": "completed", "result": cached, "cached": True, "content_hash": content_hash})
+            return {"job_id": job_id, "status": "completed", "cached": True, "result": cached}
+
+        owner_id = jobs.create_or_attach(
+            job_id, {"status": "processing", "content_hash": content_hash}, cache_key, RESULT_CACHE_INFLIGHT_MAX_AGE,
+        )
+        if owner_id != job_id:
+            _remove_upload(save_path)
+            queue_position = (scheduler.status(owner_id) or {}).get("queue_position")
+            return {"job_id": owner_id, "status": "processing", "attached": True, "queue_position": queue_position}
     else:
-        # 일반 업로드
-        save_path = save_upload_file(video, f"temp_{job_id}{ext}", UPLOAD_DIR)
+        jobs.create(job_id, {"status": "processing", "content_hash": content_hash})
+
+    # 분석 대기열에 추가 (디코딩도 작업 안에서 수행하므로 업로드 저장 직후 바로 응답)
+    # 음성만 있는 작업은 영상 분석이 없어 짧으므로 먼저 처리
+    priority = PRIORITY_AUDIO_ONLY if ext == ".wav" else PRIORITY_VIDEO
+    try:
+        queue_position = scheduler.submit(
+            job_id, process_audio_job, save_path, metadata, content_hash, cache_key, priority=priority
+        )
+    except QueueFullError as e:
+        # 대기열에 들어가지 못한 작업은 남기지 않음 (같은 요청이 이 작업에 합류하지 않도록)
+        jobs.delete(job_id)
+        _remove_upload(save_path)
+        wait = round(e.estimated_wait)
+        return JSONResponse(
+            status_code=429,
+            content={"error": str(e), "estimated_wait_seconds": wait},
+            headers={"Retry-After": str(wait)},
+        )
+
+    return {"job_id": job_id, "status": "processing", "save_path": save_path, "queue_position": queue_position}
+
+
+# ----------------- SSE -----------------
+
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def _job_topic(job_id: str) -> str:
+    return f"job:{job_id}"
 
-    # wav 변환
-    wav_path = convert_to_wav(save_path)
 
-    # 백그라운드 분석 작업 추가
-    background_tasks.add_task(process_audio_job, job_id, save_path, wav_path, metadata)
-    return {"job_id": job_id, "status": "processing", "save_path": save_path}
+def _publish_delta(topic: str, text: str):
+    broker.publish(topic, "delta", {"text": text})
+
+
+def _publish_reset(topic: str):
+    broker.publish(topic, "reset", {})
+
+
+def _progress_event(job_id: str, job: dict):
+    """분석 중인 작업의 진행 상황 SSE 이벤트 (대기 중이면 대기 순번 포함)"""
+    return "progress", {
+        "version": job["version"],
+        "progress": job.get("progress", 0.0),
+        "stages": job.get("stages", {}),
+        "partial": job.get("partial", {}),
+        **(scheduler.status(job_id) or {}),
+    }
+
+
+def _final_job_event(job: dict):
+    """끝난 작업의 마지막 SSE 이벤트 (processing이면 None)"""
+    if job["status"] == "completed":
+        return "result", job["result"]
+    if job["status"] == "error":
+        return "error", {"error": job.get("error")}
+    return None
+
+
+async def _sse_events(subscription, task=None, job_id: str = None, version: int = 0):
+    """
+    구독한 이벤트를 SSE로 전달 (토픽이 닫히면 종료)
+    SSE_KEEPALIVE_SECONDS 동안 이벤트가 없으면 연결 유지용 주석을 보내고,
+    job_id가 있으면 작업 저장소를 다시 확인해 (다른 워커에서 실행 중인 작업이면) 진행 상황 / 최종 결과를 전달
+    (version: 클라이언트에게 이미 전달한 작업 레코드 version, 이보다 오래된 progress 이벤트는 보내지 않음)
+    클라이언트가 연결을 끊으면 task를 취소
+    """
+    try:
+        while True:
+            item = await subscription.get(timeout=SSE_KEEPALIVE_SECONDS)
+            if item is not None:
+                if item[0] == "progress":
+                    # 보관 이벤트 재전달 중 이미 보낸 상태(연결 직후 현재 상태 포함)보다 오래된 진행 상황은 건너뜀
+                    if item[1]["version"] <= version:
+                        continue
+                    version = item[1]["version"]
+                yield format_sse(*item)
+                continue
+            if subscription.closed:
+                return
+            if job_id is not None:
+                job = await run_in_threadpool(jobs.get, job_id)
+                final = _final_job_event(job) if job else ("error", {"error": f"작업을 찾을 수 없습니다: {job_id}"})
+                if final:
+                    yield format_sse(*final)
+                    return
+                if job["version"] > version:
+                    version = job["version"]
+                    yield format_sse(*_progress_event(job_id, job))
+                    continue
+            yield ": keepalive\n\n"
+    finally:
+        subscription.close()
+        if task is not None:
+            task.cancel()
 
 
 # ----------------- 백그라운드 작업 -----------------
 
-def process_audio_job(job_id: str, save_path: str, wav_path: str, metadata: str):
+def _transcribe_stage(audio):
+    result = transcribe_audio(audio, language="ko", sample_rate=ANALYSIS_SAMPLE_RATE)
+    return {"text": result.get("text", "").strip(), "segments": result.get("segments", [])}
+
+
+def _acoustic_stage(audio):
+    # Praat 객체(Sound/Pitch/Intensity/PointProcess)는 이 컨텍스트에서 한 번씩만 계산되어 공유됨
+    context = AcousticContext(audio, ANALYSIS_SAMPLE_RATE)
+    context.sound  # Sound 변환은 이 단계에서 (이후 단계들은 바로 Pitch/Intensity 계산)
+    return context
+
+
+def _prosody_stage(context):
+    # 목소리 크기/억양용 Intensity·Pitch와 등급을 단계 스레드에서 계산 (voice_anxiety의 Pitch와 설정이 달라 병렬 실행)
+    # 반환: (저장할 특징, 부분 결과로 바로 전달할 등급)
+    features = acoustic_features(context)
+    return features, prosody_grades(features)
+
+
+def _voice_anxiety_stage(context):
+    return extract_features_by_window(context)
+
+
+def _partial_result(name: str, finished: dict, is_audio_only: bool) -> dict:
+    """
+    끝난 단계들로 바로 계산할 수 있는 결과 필드 (최종 결과 JSON 필드 이름 그대로)
+    단계 완료 콜백(run_stages 스레드)에서 호출되므로 Praat 등 무거운 계산은 각 단계 안에서 끝내 둠
+    """
+    if name == "whisper":
+        transcript = finished["whisper"]
+        return {"transcription": transcript["text"], **speech_grades(segment_features(transcript["segments"]))}
+    if name == "prosody":
+        return finished["prosody"][1]
+    if name in ("voice_anxiety", "visual") and "voice_anxiety" in finished and (is_audio_only or "visual" in finished):
+        return anxiety_grades(anxiety_features(finished["voice_anxiety"], finished.get("visual"), is_audio_only))
+    if name == "llm":
+        corrected_transcription, analysis_result = finished["llm"]
+        return {
+            "corrected_transcription": corrected_transcription,
+            "adjusted_script": analysis_result.get("adjusted_script"),
+            "feedback": analysis_result.get("feedback"),
+            "predicted_questions": analysis_result.get("predicted_questions"),
+        }
+    return {}
+
+
+def _publish_progress(job_id: str, fields: dict):
+    """진행 상황을 작업 저장소에 기록하고 (version 증가) 이 워커의 구독자에게 전달"""
+    if not jobs.update(job_id, fields):
+        return
+    broker.publish(_job_topic(job_id), "progress", {**fields, "version": jobs.get_version(job_id)})
+
+
+def _llm_stage(job_id, target_time, transcript):
+    # 교정 + 분석 (대본 길이와 LLM_ANALYSIS_MODE에 따라 방식 선택)
+    # 피드백 생성 토큰은 /result/{job_id}/stream 구독자에게 바로 전달
+    return analyze_presentation(
+        transcript["text"], transcript["segments"], current_time="0:00", target_time=target_time,
+        on_delta=partial(_publish_delta, _job_topic(job_id)), on_reset=partial(_publish_reset, _job_topic(job_id)),
+    )
+
+
+def _is_cacheable(results: dict, result: dict) -> bool:
+    """
+    모든 단계가 성공한 결과만 결과 캐시에 저장
+    (선택 단계 실패, 불안도 분석 실패, LLM 응답 파싱 실패로 비거나 오류 문구가 들어간 결과는 다음 요청에서 다시 분석)
+    """
+    if any(value is None for value in results.values()):
+        return False
+    if result.get("anxiety_comment") == "분석 실패":
+        return False
+    llm_fields = ("corrected_transcription", "adjusted_script", "feedback", "predicted_questions")
+    return all(
+        result.get(field) is not None and not str(result[field]).startswith("[오류]") for field in llm_fields
+    )
+
+
+def process_audio_job(job_id: str, save_path: str, metadata: str, content_hash: str, cache_key: str = None):
+    """
+    분석 작업 본체 (스케줄러 워커 스레드에서 실행되므로 이벤트 루프를 막지 않음)
+
+    단계 의존성:
+        decode ─┬─ whisper ── llm
+                └─ acoustic ─┬─ prosody
+                             └─ voice_anxiety
+        visual (영상만)
+
+    각 단계는 원본 시계열만 만들고, 등급은 마지막에 scoring.grade_features로 계산
+    단계가 끝날 때마다 그 단계로 계산할 수 있는 부분 결과(대본, 발음/속도, 목소리 크기/억양, 불안도, 피드백)와
+    진행률을 작업 레코드에 기록하고 구독자에게 전달 (/result 롱폴링, /result/{job_id}/stream)
+    시계열은 feature_store에 저장되어 채점 기준 변경 시 /rescore로 재채점 가능
+    cache_key가 있으면 모든 단계가 성공한 결과만 결과 캐시에 저장
+    """
     try:
-        target_time = DEFAULT_TARGET_TIME
-        if metadata:
-            meta_data = json.loads(metadata)
-            target_time = meta_data.get("target_time", DEFAULT_TARGET_TIME)
-
-        # ----------------- Whisper -----------------
-        result = transcribe_audio(wav_path, language="ko")
-        segments = result.get("segments", [])
-        all_text = result.get("text", "")
-
-        pron_score, pron_grade, pron_comment = calculate_pronunciation_score(segments)
-        wpm, wpm_grade, wpm_comment = calculate_wpm(segments)
-
-        # ----------------- SoundAnalyzer -----------------
-        analyzer = SoundAnalyzer(wav_path, threshold=60)
-        intensity_grade, avg_db, intensity_comment = analyzer.evaluate_intensity()
-        pitch_grade, avg_pitch, pitch_comment = analyzer.evaluate_pitch_score()
-
-        # ----------------- STT 보정 & GPT -----------------
-        corrected_transcription = correct_stt_result(all_text.strip())
-        analysis_result = get_chat_response(corrected_transcription, current_time="0:00", target_time=target_time)
-
-        # ----------------- 불안 분석 -----------------
-        anxiety_grade, anxiety_comment, final_score, anxiety_series, strong_events_ratio = anxiety_analysis(save_path, wav_path)
-
-        jobs[job_id] = {
-            "status": "completed",
-            "result": {
-                "transcription": all_text.strip(),
-                "corrected_transcription": corrected_transcription,
-                "pronounciation_grade" : pron_grade, #추가
-                "pronounciation_score": round(pron_score, 4),
-                "pronounciation_text": pron_comment, #추가
-                "intensity_grade": intensity_grade,
-                "intensity_db": round(avg_db, 2),
-                "intensity_text": intensity_comment,
-                "pitch_grade": pitch_grade,
-                "pitch_avg": round(avg_pitch, 2),
-                "pitch_text": pitch_comment,
-                "wpm_grade": wpm_grade,
-                "wpm_avg": round(wpm, 2),
-                "wpm_comment": wpm_comment,
-                "anxiety_grade": anxiety_grade,
-                "anxiety_ratio": round(strong_events_ratio, 6),
-                "anxiety_comment": anxiety_comment,
-                "adjusted_script": analysis_result.get("adjusted_script"),
-                "feedback": analysis_result.get("feedback"),
-                "predicted_questions": analysis_result.get("predicted_questions"),
-            },
+        target_time = _parse_target_time(metadata)
+
+        is_audio_only = save_path.lower().endswith(".wav")
+        stages = {
+            # 모든 분석기가 공유하는 mono PCM (ffmpeg 파이프 스트리밍)
+            "decode": Stage(decode_audio, save_path, ANALYSIS_SAMPLE_RATE),
+            "whisper": Stage(_transcribe_stage, deps=["decode"]),
+            "acoustic": Stage(_acoustic_stage, deps=["decode"]),
+            "prosody": Stage(_prosody_stage, deps=["acoustic"]),
+            "voice_anxiety": Stage(_voice_anxiety_stage, deps=["acoustic"], optional=True),
+            "llm": Stage(_llm_stage, job_id, target_time, deps=["whisper"]),
         }
+        if not is_audio_only:
+            # MediaPipe 영상 분석은 오디오와 무관하므로 디코딩과 동시에 시작
+            # (영상을 구간별로 나누어 영상 분석 프로세스풀에서 병렬 처리)
+            stages["visual"] = Stage(partial(extract_visual_features, executor=visual_processes), save_path, optional=True)
+
+        finished, partial_result = {}, {}
+        _publish_progress(job_id, {"progress": 0.0, "stages": {}, "partial": {}})
+
+        def on_stage_done(name, stage_result):
+            finished[name] = stage_result
+            try:
+                partial_result.update(_partial_result(name, finished, is_audio_only))
+                _publish_progress(job_id, {
+                    "progress": round(len(finished) / len(stages), 2),
+                    "stages": {done: "failed" if value is None else "done" for done, value in finished.items()},
+                    "partial": dict(partial_result),
+                })
+            except Exception as e:
+                # 진행 상황 전달 실패는 분석 결과에 영향 없음
+                print(f"진행 상황 기록 실패 ({job_id}, {name}): {e}")
+
+        results = run_stages(stages, stage_threads, on_stage_done=on_stage_done)
+
+        transcript = results["whisper"]
+        corrected_transcription, analysis_result = results["llm"]
+        features = collect_features(
+            transcript["segments"], results["prosody"][0], results["voice_anxiety"], results.get("visual"), is_audio_only,
+        )
+        try:
+            save_features(job_id, content_hash, features)
+        except Exception as e:
+            # 특징 저장 실패는 재채점만 불가능해질 뿐 분석 결과에는 영향 없음
+            print(f"분석 특징 저장 실패 ({job_id}): {e}")
+
+        result = {
+            "transcription": transcript["text"],
+            "corrected_transcription": corrected_transcription,
+            **grade_features(features),
+            "adjusted_script": analysis_result.get("adjusted_script"),
+            "feedback": analysis_result.get("feedback"),
+            "predicted_questions": analysis_result.get("predicted_questions"),
+        }
+        jobs.transition(job_id, "processing", {"status": "completed", "result": result})
+        broker.publish(_job_topic(job_id), "result", result)
+
+        if cache_key and _is_cacheable(results, result):
+            try:
+                result_cache.put(cache_key, result)
+            except Exception as e:
+                print(f"결과 캐시 저장 실패 ({job_id}): {e}")
 
     except Exception as e:
-        jobs[job_id] = {"status": "error", "error": str(e)}
+        jobs.transition(job_id, "processing", {"status": "error", "error": str(e)})
+        broker.publish(_job_topic(job_id), "error", {"error": str(e)})
+    finally:
+        # 파일 정리 (특징은 feature_store에 저장되어 있으므로 원본 업로드는 남기지 않음)
+        _remove_upload(save_path)
+        broker.close(_job_topic(job_id))
+
+
+@app.post("/rescore/{job_id}")
+def rescore(job_id: str):
+    """
+    저장된 분석 특징으로 등급만 다시 계산 (Whisper / Praat / MediaPipe / GPT 재실행 없음)
+    채점 기준을 바꾼 뒤 기존 작업 결과를 갱신할 때 사용
+    이 작업의 특징이 없으면 같은 내용의 파일로 저장된 특징(content_hash)을 사용
+    """
+    job = jobs.get(job_id)
+    if not job:
+        return JSONResponse(status_code=404, content={"error": f"작업을 찾을 수 없습니다: {job_id}"})
+    if job["status"] != "completed":
+        return JSONResponse(status_code=409, content={"error": "완료된 작업만 재채점할 수 있습니다."})
+    try:
+        features = load_features(job_id)
+    except FileNotFoundError as e:
+        # 이 작업의 특징이 없으면 같은 내용의 파일을 분석한 다른 작업의 특징 사용
+        try:
+            features = load_features_by_hash(job.get("content_hash"))
+        except FileNotFoundError:
+            return JSONResponse(status_code=404, content={"error": str(e)})
+
+    result = {**job.get("result", {}), **grade_features(features)}
+    jobs.update(job_id, {"result": result})
+    return {"job_id": job_id, "status": "completed", "result": result}
+
 
+def _etag(job: dict) -> str:
+    return f'W/"{job["version"]}"'
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags or etag[2:] in tags
+
+
+async def _wait_for_job_change(job_id: str, version: int, timeout: float):
+    """
+    작업 레코드의 version이 바뀌거나 timeout이 지날 때까지 대기
+    이 워커에서 실행 중인 작업은 이벤트로 바로 깨어나고, 다른 워커의 작업은 JOB_POLL_INTERVAL_SECONDS마다 확인
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    subscription = broker.subscribe(_job_topic(job_id))
+    try:
+        while await run_in_threadpool(jobs.get_version, job_id) == version:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            if subscription.closed:
+                await asyncio.sleep(min(remaining, JOB_POLL_INTERVAL_SECONDS))
+                continue
+            item = await subscription.get(timeout=min(remaining, JOB_POLL_INTERVAL_SECONDS))
+            # 토큰 조각(delta / reset)은 레코드를 바꾸지 않으므로 이어서 대기
+            while item is not None and item[0] in ("delta", "reset") and loop.time() < deadline:
+                item = await subscription.get(timeout=max(0.0, min(deadline - loop.time(), JOB_POLL_INTERVAL_SECONDS)))
     finally:
-        # 파일 정리
-        for path in [wav_path]:
-            if os.path.exists(path):
-                os.remove(path)
+        subscription.close()
 
 
 @app.get("/result/{job_id}")
-def get_result(job_id: str):
-    job = jobs.get(job_id)
+async def get_result(job_id: str, response: Response, wait: float = 0, if_none_match: str = Header(None)):
+    """
+    작업 상태 / 결과 조회 (분석 중이면 진행률과 부분 결과 포함)
+    응답 ETag는 작업 레코드 version이라 진행 상황이 바뀔 때마다 바뀜
+    If-None-Match가 현재 ETag와 같으면 wait초(최대 LONG_POLL_MAX_SECONDS) 동안 변경을 기다리고,
+    그래도 바뀌지 않았으면 304 (대기 순번은 ETag에 반영되지 않음)
+    """
+    job = await run_in_threadpool(jobs.get, job_id)
     if not job:
         return {"status": "not_found"}
+    if wait > 0 and _etag_matches(if_none_match, _etag(job)):
+        await _wait_for_job_change(job_id, job["version"], min(wait, LONG_POLL_MAX_SECONDS))
+        job = await run_in_threadpool(jobs.get, job_id) or job
+
+    etag = _etag(job)
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    if job["status"] == "processing":
+        # 이 워커의 대기열에 있는 작업이면 대기 순번 표시
+        job.update(scheduler.status(job_id) or {})
+    response.headers["ETag"] = etag
     return job
+
+
+@app.get("/result/{job_id}/stream")
+async def stream_result(job_id: str):
+    """
+    분석 작업의 진행 상황과 피드백 생성 과정을 SSE로 전달
+    이벤트:
+    - progress {"version", "progress", "stages", "partial"}: 연결 직후 현재 상태, 이후 단계가 끝날 때마다
+      (partial은 지금까지 계산된 결과 필드 전체이므로 마지막 progress만 사용하면 됨)
+    - delta {"text": 조각}: 피드백 생성 토큰
+    - reset {}: 피드백 생성을 처음부터 다시 시작함 (지금까지 받은 delta는 버림)
+    - 마지막에 result {/result의 result와 같은 JSON} 또는 error {"error": ...}
+    이미 끝난 작업이면 result / error 하나만 전달
+    """
+    # 구독 후 상태를 확인해야 그 사이에 끝난 작업의 마지막 이벤트를 놓치지 않음
+    subscription = broker.subscribe(_job_topic(job_id))
+    job = await run_in_threadpool(jobs.get, job_id)
+    if not job:
+        subscription.close()
+        return JSONResponse(status_code=404, content={"error": f"작업을 찾을 수 없습니다: {job_id}"})
+
+    final = _final_job_event(job)
+    if final:
+        subscription.close()
+
+        async def single():
+            yield format_sse(*final)
+
+        return StreamingResponse(single(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+    async def events():
+        yield format_sse(*_progress_event(job_id, job))
+        async for message in _sse_events(subscription, job_id=job_id, version=job["version"]):
+            yield message
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
@@ -0,0 +1,117 @@
+"""모델 레지스트리
+
+무거운 모델(Whisper 등)을 import 시점이 아니라 처음 사용할 때 로딩하고,
+서버 시작 시 백그라운드 워밍업 / 준비 상태 조회(/ready)를 지원합니다.
+FaceMesh처럼 작업마다 새로 만들면 비싼 객체는 ObjectPool로 재사용합니다.
+"""
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Callable, Iterable, Optional
+
+
+class ModelRegistry:
+    def __init__(self):
+        self._factories = {}
+        self._models = {}
+        self._errors = {}
+        self._loading = set()
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, factory: Callable) -> None:
+        """모델 생성 함수 등록 (이 시점에는 로딩하지 않음)"""
+        with self._lock:
+            self._factories[name] = factory
+            self._locks.setdefault(name, threading.Lock())
+
+    def get(self, name: str):
+        """모델 반환, 아직 로딩되지 않았으면 이 자리에서 로딩 (동시에 호출돼도 한 번만 로딩)"""
+        model = self._models.get(name)
+        if model is not None:
+            return model
+
+        with self._locks[name]:
+            if name in self._models:
+                return self._models[name]
+            with self._lock:
+                self._loading.add(name)
+            try:
+                model = self._factories[name]()
+            except Exception as e:
+                self._errors[name] = str(e)
+                raise
+            finally:
+                with self._lock:
+                    self._loading.discard(name)
+            self._models[name] = model
+            self._errors.pop(name, None)
+            return model
+
+    def warmup(self, names: Optional[Iterable[str]] = None, background: bool = True) -> None:
+        """등록된 모델을 미리 로딩 (background=True면 별도 스레드에서)"""
+        names = list(names) if names is not None else list(self._factories)
+
+        def load_all():
+            for name in names:
+                try:
+                    self.get(name)
+                except Exception as e:
+                    print(f"모델 워밍업 실패 ({name}): {e}")
+
+        if background:
+            threading.Thread(target=load_all, name="model-warmup", daemon=True).start()
+        else:
+            load_all()
+
+    def status(self) -> dict:
+        """모델별 상태: loaded / loading / error / not_loaded"""
+        result = {}
+        with self._lock:
+            for name in self._factories:
+                if name in self._models:
+                    result[name] = "loaded"
+                elif name in self._loading:
+                    result[name] = "loading"
+                elif name in self._errors:
+                    result[name] = f"error: {self._errors[name]}"
+                else:
+                    result[name] = "not_loaded"
+        return result
+
+    def is_ready(self) -> bool:
+        return all(name in self._models for name in self._factories)
+
+
+class ObjectPool:
+    """
+    미리 만들어 둔 객체를 빌려주고 돌려받는 풀
+    풀이 비어 있으면 새로 만들고, 반납 시 size를 넘으면 close() 후 버림
+    """
+
+    def __init__(self, factory: Callable, size: int):
+        self._factory = factory
+        self._size = size
+        self._items = queue.LifoQueue()
+
+    def fill(self) -> None:
+        """풀을 size만큼 미리 채움"""
+        while self._items.qsize() < self._size:
+            self._items.put(self._factory())
+
+    @contextmanager
+    def checkout(self):
+        try:
+            item = self._items.get_nowait()
+        except queue.Empty:
+            item = self._factory()
+        try:
+            yield item
+        finally:
+            if self._items.qsize() < self._size:
+                self._items.put(item)
+            elif hasattr(item, "close"):
+                item.close()
+
+
+registry = ModelRegistry()
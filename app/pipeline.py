@@ -0,0 +1,71 @@
+"""분석 단계 의존성 그래프 실행기
+
+각 단계는 의존하는 단계의 결과가 모두 준비되는 즉시 스레드풀에 제출되므로,
+서로 독립적인 단계(Whisper, 음성 분석, 영상 분석 등)는 동시에 실행됩니다.
+전체 소요 시간은 단계 합이 아니라 가장 긴 경로에 가까워집니다.
+(영상 분석처럼 프로세스가 필요한 작업은 단계 함수 안에서 프로세스풀에 나누어 제출)
+"""
+from concurrent.futures import Executor, FIRST_COMPLETED, wait
+from typing import Callable, Dict, Optional
+
+
+class Stage:
+    """
+    분석 단계
+    - func(*args, *[의존 단계 결과...]) 형태로 호출
+    - optional=True 이면 실패해도 전체를 중단하지 않고 결과를 None으로 둠
+    """
+
+    def __init__(self, func: Callable, *args, deps=(), optional: bool = False):
+        self.func = func
+        self.args = args
+        self.deps = tuple(deps)
+        self.optional = optional
+
+
+def run_stages(
+    stages: Dict[str, Stage],
+    thread_pool: Executor,
+    on_stage_done: Optional[Callable[[str, object], None]] = None,
+) -> dict:
+    """
+    모든 단계를 실행하고 {단계 이름: 결과} 반환, 필수 단계가 실패하면 그 예외를 그대로 전파
+    on_stage_done(이름, 결과)는 단계가 끝날 때마다 호출 (실패한 선택 단계는 결과 None, run_stages 호출 스레드에서 실행)
+    """
+    for name, stage in stages.items():
+        unknown = [dep for dep in stage.deps if dep not in stages]
+        if unknown:
+            raise ValueError(f"'{name}' 단계의 의존 단계가 없습니다: {unknown}")
+
+    results = {}
+    pending = dict(stages)
+    running = {}
+
+    while pending or running:
+        for name, stage in list(pending.items()):
+            if all(dep in results for dep in stage.deps):
+                call_args = (*stage.args, *[results[dep] for dep in stage.deps])
+                future = thread_pool.submit(stage.func, *call_args)
+                running[future] = name
+                del pending[name]
+
+        if not running:
+            raise ValueError(f"순환 의존성이 있습니다: {list(pending)}")
+
+        done, _ = wait(running, return_when=FIRST_COMPLETED)
+        for future in done:
+            name = running.pop(future)
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                if stages[name].optional:
+                    print(f"'{name}' 단계 실패 (선택 단계이므로 계속 진행): {e}")
+                    results[name] = None
+                else:
+                    for other in running:
+                        other.cancel()
+                    raise
+            if on_stage_done is not None:
+                on_stage_done(name, results[name])
+
+    return results
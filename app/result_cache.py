@@ -0,0 +1,103 @@
+"""분석 결과 캐시 (같은 파일 + 같은 분석 조건이면 결과 재사용)
+
+캐시 키는 업로드 파일 내용의 SHA-256과 분석 조건(확장자, target_time),
+결과에 영향을 주는 버전(채점 기준, 프롬프트, 모델/분석 방식)으로 만듭니다.
+RESULT_CACHE_DIR/{key}.json 파일 하나가 결과 하나이며,
+- 파일 수정 시각(mtime) = 저장 시각 → RESULT_CACHE_TTL이 지나면 만료
+- 파일 접근 시각(atime) = 마지막 사용 시각 → 용량 초과 시 오래 사용하지 않은 결과부터 삭제
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from typing import Optional
+
+from config import RESULT_CACHE_DIR, RESULT_CACHE_TTL, RESULT_CACHE_MAX_BYTES
+
+
+def make_cache_key(content_hash: str, ext: str, target_time: str, versions: dict = None) -> str:
+    """
+    파일 내용 해시와 분석 조건으로 캐시 키 생성
+    versions: 채점 기준 / 프롬프트 버전 등 (하나라도 바뀌면 다른 키가 되어 이전 결과를 재사용하지 않음)
+    """
+    params = json.dumps(
+        {"content_hash": content_hash, "ext": ext.lower(), "target_time": target_time, "versions": versions or {}},
+        sort_keys=True,
+    )
+    return hashlib.sha256(params.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    def __init__(self, cache_dir: str = RESULT_CACHE_DIR, ttl: float = RESULT_CACHE_TTL,
+                 max_bytes: int = RESULT_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._evict_lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key: str) -> Optional[dict]:
+        """캐시된 결과 (없거나 만료되었으면 None)"""
+        path = self._path(key)
+        try:
+            stat = os.stat(path)
+            if time.time() - stat.st_mtime > self.ttl:
+                os.remove(path)
+                return None
+            with open(path, "r", encoding="utf-8") as f:
+                result = json.load(f)
+            # 마지막 사용 시각 갱신 (저장 시각은 유지)
+            os.utime(path, (time.time(), stat.st_mtime))
+            return result
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def put(self, key: str, result: dict) -> None:
+        """결과 저장 후 만료/용량 초과분 정리"""
+        tmp_path = os.path.join(self.cache_dir, f".{key}.{uuid.uuid4().hex}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, default=lambda v: v.tolist())
+        os.replace(tmp_path, self._path(key))
+        self.evict()
+
+    def evict(self) -> None:
+        """만료된 결과를 삭제하고, 남은 용량이 max_bytes를 넘으면 오래 사용하지 않은 결과부터 삭제"""
+        if not self._evict_lock.acquire(blocking=False):
+            # 다른 스레드가 정리 중
+            return
+        try:
+            now = time.time()
+            entries = []
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if not entry.name.endswith(".json"):
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    if now - stat.st_mtime > self.ttl:
+                        self._remove(entry.path)
+                    else:
+                        entries.append((stat.st_atime, stat.st_size, entry.path))
+
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                self._remove(path)
+                total -= size
+        finally:
+            self._evict_lock.release()
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,105 @@
+"""분석 작업 스케줄러
+
+Starlette 스레드풀(BackgroundTasks) 대신 전용 워커 스레드에서 분석 작업을 실행합니다.
+- 동시에 실행되는 분석 수를 ANALYSIS_SLOTS로 제한
+- 대기열이 가득 차면 QueueFullError (엔드포인트에서 429 응답)
+- priority 값이 작은 작업이 먼저 실행되고, 같은 priority 안에서는 먼저 들어온 순서
+"""
+import heapq
+import itertools
+import threading
+import time
+from typing import Callable, Optional
+
+from config import ANALYSIS_SLOTS, ANALYSIS_QUEUE_SIZE, ANALYSIS_ESTIMATED_DURATION
+
+PRIORITY_AUDIO_ONLY = 0
+PRIORITY_VIDEO = 1
+
+# 작업 소요 시간 이동 평균 가중치
+DURATION_EMA_WEIGHT = 0.2
+
+
+class QueueFullError(Exception):
+    """대기열이 가득 차서 작업을 받을 수 없음"""
+
+    def __init__(self, estimated_wait: float):
+        super().__init__("분석 대기열이 가득 찼습니다. 잠시 후 다시 시도해주세요.")
+        self.estimated_wait = estimated_wait
+
+
+class AnalysisScheduler:
+    def __init__(
+        self,
+        slots: int = ANALYSIS_SLOTS,
+        queue_size: int = ANALYSIS_QUEUE_SIZE,
+        estimated_duration: float = ANALYSIS_ESTIMATED_DURATION,
+    ):
+        self.slots = max(1, slots)
+        self.queue_size = queue_size
+        self.avg_duration = estimated_duration
+        self._queue = []  # (priority, seq, job_id, func, args)
+        self._seq = itertools.count()
+        self._running = 0
+        self._running_ids = set()
+        self._cond = threading.Condition()
+
+        for i in range(self.slots):
+            threading.Thread(target=self._worker, name=f"analysis-slot-{i}", daemon=True).start()
+
+    def submit(self, job_id: str, func: Callable, *args, priority: int = PRIORITY_VIDEO) -> int:
+        """작업을 대기열에 추가하고 대기 순번(0부터) 반환"""
+        with self._cond:
+            if len(self._queue) >= self.queue_size:
+                raise QueueFullError(self._estimate_wait(len(self._queue)))
+            heapq.heappush(self._queue, (priority, next(self._seq), job_id, func, args))
+            self._cond.notify()
+            return self._position(job_id)
+
+    def status(self, job_id: str) -> Optional[dict]:
+        """대기 중인 작업의 순번/대기열 길이/예상 대기 시간, 대기 중이 아니면 None"""
+        with self._cond:
+            position = self._position(job_id)
+            if position is None:
+                return None
+            return {
+                "queue_position": position,
+                "queue_depth": len(self._queue),
+                "estimated_wait_seconds": round(self._estimate_wait(position)),
+            }
+
+    def job_ids(self) -> list:
+        """이 스케줄러가 맡고 있는 (대기 중 + 실행 중) 작업 id"""
+        with self._cond:
+            return [item[2] for item in self._queue] + list(self._running_ids)
+
+    def _position(self, job_id: str) -> Optional[int]:
+        for position, item in enumerate(sorted(self._queue, key=lambda item: item[:2])):
+            if item[2] == job_id:
+                return position
+        return None
+
+    def _estimate_wait(self, position: int) -> float:
+        # 앞선 대기 작업 + 실행 중인 작업이 슬롯 수만큼 병렬로 처리된다고 가정
+        return (position + self._running) / self.slots * self.avg_duration
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                while not self._queue:
+                    self._cond.wait()
+                _, _, job_id, func, args = heapq.heappop(self._queue)
+                self._running += 1
+                self._running_ids.add(job_id)
+
+            started = time.monotonic()
+            try:
+                func(job_id, *args)
+            except Exception as e:
+                print(f"분석 작업 실행 중 오류 발생 ({job_id}): {e}")
+            finally:
+                elapsed = time.monotonic() - started
+                with self._cond:
+                    self._running -= 1
+                    self._running_ids.discard(job_id)
+                    self.avg_duration += DURATION_EMA_WEIGHT * (elapsed - self.avg_duration)
@@ -0,0 +1,118 @@
+"""분석 특징 → 등급 계산
+
+분석 작업과 재채점(/rescore)이 같은 함수로 등급을 계산하므로,
+채점 기준을 바꾼 뒤 저장된 특징으로 다시 채점한 결과는 재분석 결과와 같습니다.
+
+features (feature_store에 그대로 저장되는 형태):
+- segments        : Whisper segment 목록 (발음 점수, WPM)
+- intensity       : Praat Intensity 프레임 값 (dB)
+- pitch           : Praat Pitch 프레임 주파수 (Hz, 무성음 0)
+- f0 / jitter / shimmer : 윈도우별 음성 불안 특징 (추출 실패 시 없음)
+- ear / head      : 프레임별 EAR / 머리 움직임 (영상만, 추출 실패 시 없음)
+- fps, window_size, is_audio_only
+"""
+import numpy as np
+
+from anxiety import combine_anxiety_features, visual_features_from_series
+from voice_analysis import evaluate_intensity_values, evaluate_pitch_values
+from whisper_utils import calculate_pronunciation_score, calculate_wpm
+
+INTENSITY_THRESHOLD = 60
+# 채점 기준(임계값, 가중치, 등급 구간)을 바꾸면 올려서 결과 캐시의 이전 결과를 재사용하지 않도록 함
+SCORING_VERSION = 1
+# 채점에 쓰는 Whisper segment 필드만 저장 (tokens 등 제외)
+SEGMENT_KEYS = ("id", "start", "end", "text", "avg_logprob", "compression_ratio", "no_speech_prob")
+
+
+def segment_features(segments) -> dict:
+    return {"segments": [{key: seg[key] for key in SEGMENT_KEYS if key in seg} for seg in segments]}
+
+
+def acoustic_features(acoustic_context) -> dict:
+    return {
+        "intensity": acoustic_context.intensity().values[0],
+        "pitch": acoustic_context.pitch().selected_array["frequency"],
+    }
+
+
+def anxiety_features(voice_features, visual_series, is_audio_only: bool, window_size: float = 1.0) -> dict:
+    features = {"window_size": window_size, "is_audio_only": is_audio_only}
+    if voice_features is not None:
+        features["f0"], features["jitter"], features["shimmer"] = voice_features
+    if visual_series is not None and visual_series[0] is not None:
+        features["ear"], features["head"], features["fps"] = visual_series
+    return features
+
+
+def collect_features(segments, prosody: dict, voice_features, visual_series, is_audio_only: bool,
+                     window_size: float = 1.0) -> dict:
+    """분석 단계 결과를 저장/채점용 features dict로 정리 (prosody: acoustic_features 결과)"""
+    return {
+        **segment_features(segments),
+        **prosody,
+        **anxiety_features(voice_features, visual_series, is_audio_only, window_size),
+    }
+
+
+def speech_grades(features: dict) -> dict:
+    """발음 / 속도 등급 (segments만 필요)"""
+    pron_score, pron_grade, pron_comment = calculate_pronunciation_score(features["segments"])
+    wpm, wpm_grade, wpm_comment = calculate_wpm(features["segments"])
+    return {
+        "pronounciation_grade" : pron_grade, #추가
+        "pronounciation_score": round(pron_score, 4),
+        "pronounciation_text": pron_comment, #추가
+        "wpm_grade": wpm_grade,
+        "wpm_avg": round(wpm, 2),
+        "wpm_comment": wpm_comment,
+    }
+
+
+def prosody_grades(features: dict) -> dict:
+    """목소리 크기 / 억양 등급 (intensity, pitch만 필요)"""
+    intensity_grade, avg_db, intensity_comment = evaluate_intensity_values(
+        np.asarray(features["intensity"]), INTENSITY_THRESHOLD
+    )
+    pitch_grade, avg_pitch, pitch_comment = evaluate_pitch_values(np.asarray(features["pitch"]))
+    return {
+        "intensity_grade": intensity_grade,
+        "intensity_db": round(avg_db, 2),
+        "intensity_text": intensity_comment,
+        "pitch_grade": pitch_grade,
+        "pitch_avg": round(avg_pitch, 2),
+        "pitch_text": pitch_comment,
+    }
+
+
+def anxiety_grades(features: dict) -> dict:
+    """불안도 등급 (음성 불안 특징, 영상이면 시각 특징까지 끝난 뒤 계산)"""
+    window_size = features.get("window_size", 1.0)
+    is_audio_only = features.get("is_audio_only", False)
+    voice_features = None
+    if "f0" in features:
+        voice_features = (np.asarray(features["f0"]), np.asarray(features["jitter"]), np.asarray(features["shimmer"]))
+    visual_features = None
+    if "ear" in features:
+        visual_features = visual_features_from_series(
+            np.asarray(features["ear"]), np.asarray(features["head"]), features["fps"], window_size=window_size
+        )
+    anxiety_grade, anxiety_comment, _, _, strong_events_ratio = combine_anxiety_features(
+        voice_features, visual_features, is_audio_only=is_audio_only
+    )
+    return {
+        "anxiety_grade": anxiety_grade,
+        "anxiety_ratio": round(strong_events_ratio, 6),
+        "anxiety_comment": anxiety_comment,
+    }
+
+
+def grade_features(features: dict) -> dict:
+    """features로 발음 / 목소리 크기 / 억양 / 속도 / 불안도 등급 계산 (결과 JSON 필드 이름 그대로)"""
+    speech = speech_grades(features)
+    prosody = prosody_grades(features)
+    return {
+        **{key: speech[key] for key in ("pronounciation_grade", "pronounciation_score", "pronounciation_text")},
+        **prosody,
+        **{key: speech[key] for key in ("wpm_grade", "wpm_avg", "wpm_comment")},
+        **anxiety_grades(features),
+    }
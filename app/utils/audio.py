@@ -0,0 +1,66 @@
+"""오디오 디코딩 유틸리티
+
+영상/음성 파일을 한 번만 디코딩해서 모든 분석기(Whisper, SoundAnalyzer, 불안도 음성 특징)가
+같은 mono float32 PCM 배열을 공유하도록 합니다.
+"""
+import os
+import subprocess
+import tempfile
+import threading
+
+import numpy as np
+
+from config import ANALYSIS_SAMPLE_RATE, AUDIO_DECODE_TIMEOUT
+
+SUPPORTED_EXTENSIONS = (".mp4", ".wav")
+PIPE_READ_SIZE = 1 << 20  # ffmpeg 출력 파이프를 읽는 단위 (바이트)
+
+
+def decode_audio(file_path: str, sample_rate: int = ANALYSIS_SAMPLE_RATE,
+                 timeout: float = AUDIO_DECODE_TIMEOUT) -> np.ndarray:
+    """
+    ffmpeg로 mp4/wav 파일을 sample_rate의 mono float32 PCM으로 디코딩
+    timeout(초) 안에 끝나지 않으면 ffmpeg를 종료하고 RuntimeError
+    """
+    ext = os.path.splitext(file_path)[1].lower()
+    if ext not in SUPPORTED_EXTENSIONS:
+        raise ValueError("지원되지 않는 파일 형식입니다. wav 또는 mp4만 허용됩니다.")
+
+    cmd = [
+        "ffmpeg", "-nostdin", "-v", "error",
+        "-i", file_path,
+        "-vn", "-ac", "1", "-ar", str(sample_rate),
+        "-f", "f32le", "-",
+    ]
+    # 원본(mp4)은 ffmpeg가 스트리밍으로 읽고, 파이썬 쪽에는 디코딩된 PCM만 쌓임
+    # 오류 메시지는 임시 파일로 받음 (stderr도 파이프면 메시지가 파이프 버퍼를 넘을 때 stdout 읽기와 서로 멈춤)
+    pcm = bytearray()
+    with tempfile.TemporaryFile() as stderr_file:
+        with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr_file) as proc:
+            timed_out = threading.Event()
+
+            def kill():
+                timed_out.set()
+                proc.kill()
+
+            watchdog = threading.Timer(timeout, kill)
+            watchdog.daemon = True
+            watchdog.start()
+            try:
+                while True:
+                    block = proc.stdout.read(PIPE_READ_SIZE)
+                    if not block:
+                        break
+                    pcm += block
+                returncode = proc.wait()
+            finally:
+                watchdog.cancel()
+        if timed_out.is_set():
+            raise RuntimeError(f"오디오 디코딩 시간 초과 ({timeout:g}초)")
+        if returncode != 0:
+            stderr_file.seek(0)
+            stderr = stderr_file.read()
+            raise RuntimeError(f"오디오 디코딩 실패: {stderr.decode(errors='ignore').strip()}")
+
+    usable = len(pcm) - len(pcm) % 4
+    return np.frombuffer(pcm, dtype=np.float32, count=usable // 4)
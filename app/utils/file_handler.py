@@ -1,7 +1,11 @@
 """파일 업로드 및 처리 유틸리티"""
+import hashlib
 import os
+import shutil
 from fastapi import UploadFile
-from pydub import AudioSegment
+from starlette.concurrency import run_in_threadpool
+
+from config import UPLOAD_CHUNK_SIZE
 
 
 def get_unique_filepath(base_dir: str, base_name: str, ext: str) -> str:
@@ -16,10 +20,12 @@ def get_unique_filepath(base_dir: str, base_name: str, ext: str) -> str:
     return os.path.abspath(candidate)
 
 
-def save_upload_file(upload_file: UploadFile, base_name: str, upload_dir: str) -> str:
+async def save_upload_file(upload_file: UploadFile, base_name: str, upload_dir: str, digest=None) -> str:
     """
     파일 저장 (중복 시 이름 자동 변경)
     base_name에 확장자가 포함되어 있으면 추가하지 않음
+    UPLOAD_CHUNK_SIZE 단위로 나누어 기록하므로 파일 크기와 무관하게 메모리 사용량이 일정함
+    digest(hashlib 객체)를 주면 기록하면서 내용 해시도 함께 계산 (파일을 다시 읽지 않음)
     """
     upload_ext = os.path.splitext(upload_file.filename)[1].lower()
     base_root, base_ext = os.path.splitext(base_name)
@@ -29,38 +35,65 @@ def save_upload_file(upload_file: UploadFile, base_name: str, upload_dir: str) -
 
     save_path = get_unique_filepath(upload_dir, base_root, ext)
     with open(save_path, "wb") as f:
-        f.write(upload_file.file.read())
+        while True:
+            chunk = await upload_file.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            if digest is not None:
+                digest.update(chunk)
+            await run_in_threadpool(f.write, chunk)
     os.chmod(save_path, 0o666)
     return os.path.abspath(save_path)
 
 
-def merge_chunks(original_filename: str, total_chunks: int, ext: str, upload_dir: str) -> str:
+def _zero_copy(src_fd: int, dst_fd: int, size: int) -> bool:
+    """커널 내부 복사(copy_file_range, 없으면 sendfile)로 src 전체를 dst 현재 위치에 기록"""
+    copied = 0
+    if hasattr(os, "copy_file_range"):
+        while copied < size:
+            sent = os.copy_file_range(src_fd, dst_fd, size - copied, copied)
+            if sent == 0:
+                break
+            copied += sent
+    elif hasattr(os, "sendfile"):
+        while copied < size:
+            sent = os.sendfile(dst_fd, src_fd, copied, size - copied)
+            if sent == 0:
+                break
+            copied += sent
+    return copied == size
+
+
+def copy_file_contents(src, dst) -> None:
     """
-    조각난 파일 합치기 (기본 이름: original_filename, 중복 시 _1, _2 등 추가)
+    src 파일 내용을 dst 끝에 이어 붙임
+    가능하면 커널 내부 복사를 사용해 유저 공간 버퍼를 거치지 않고,
+    지원되지 않는 환경에서는 UPLOAD_CHUNK_SIZE 버퍼로 복사
     """
-    base_name = os.path.splitext(original_filename)[0]
-    merged_path = get_unique_filepath(upload_dir, base_name, ext)
-
-    with open(merged_path, "wb") as merged:
-        for i in range(total_chunks):
-            part_path = os.path.join(upload_dir, f"{original_filename}_chunk_{i}{ext}")
-            with open(part_path, "rb") as part:
-                merged.write(part.read())
-            os.remove(part_path)
-    os.chmod(merged_path, 0o666)
-    return os.path.abspath(merged_path)
+    dst.flush()
+    start = dst.seek(0, os.SEEK_END)
+    size = os.fstat(src.fileno()).st_size
+    try:
+        if _zero_copy(src.fileno(), dst.fileno(), size):
+            dst.seek(0, os.SEEK_END)
+            return
+    except OSError:
+        pass
 
+    # 실패 시 부분 기록분을 되돌리고 일반 복사
+    dst.truncate(start)
+    dst.seek(start)
+    src.seek(0)
+    shutil.copyfileobj(src, dst, UPLOAD_CHUNK_SIZE)
 
-def convert_to_wav(file_path: str) -> str:
-    """mp4 -> wav 변환, wav는 그대로 반환"""
-    ext = os.path.splitext(file_path)[1].lower()
-    if ext == ".mp4":
-        wav_path = file_path.rsplit(".", 1)[0] + ".wav"
-        audio = AudioSegment.from_file(file_path, format="mp4")
-        audio.export(wav_path, format="wav")
-        return wav_path
-    elif ext == ".wav":
-        return file_path
-    else:
-        raise ValueError("지원되지 않는 파일 형식입니다. wav 또는 mp4만 허용됩니다.")
 
+def file_sha256(file_path: str) -> str:
+    """파일 내용의 SHA-256 (UPLOAD_CHUNK_SIZE 단위로 읽음)"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        while True:
+            block = f.read(UPLOAD_CHUNK_SIZE)
+            if not block:
+                break
+            digest.update(block)
+    return digest.hexdigest()
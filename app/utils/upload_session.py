@@ -0,0 +1,204 @@
+"""재개 가능한 분할 업로드 세션 관리
+
+세션마다 UPLOAD_DIR/sessions/{upload_id}/ 디렉토리를 사용합니다.
+- manifest.json : 원본 파일명, 확장자, 전체 청크 수
+- received      : 청크 수만큼의 바이트맵 (i번째 바이트가 1이면 i번 청크 수신 완료)
+- chunk_{i}     : 수신된 청크 데이터
+
+청크 수신 여부는 바이트맵 한 바이트만 읽고 쓰므로 업로드 디렉토리의 파일 수와 무관합니다.
+마지막 청크 수신 후 UPLOAD_SESSION_TTL이 지난 미완료 세션은 새 세션을 만들 때 함께 정리합니다.
+"""
+import json
+import os
+import re
+import shutil
+import threading
+import time
+import uuid
+
+from fastapi import UploadFile
+
+from config import UPLOAD_SESSION_TTL
+from utils.file_handler import save_upload_file, get_unique_filepath, copy_file_contents
+
+SESSION_DIR_NAME = "sessions"
+MANIFEST_NAME = "manifest.json"
+BITMAP_NAME = "received"
+_SESSION_ID_PATTERN = re.compile(r"[0-9A-Za-z_-]{1,64}")
+# 만료 세션 정리 주기 (초)
+_CLEANUP_INTERVAL = 60
+_cleanup_lock = threading.Lock()
+_last_cleanup = 0.0
+
+
+def _session_dir(upload_id: str, upload_dir: str) -> str:
+    if not _SESSION_ID_PATTERN.fullmatch(upload_id):
+        raise FileNotFoundError(f"업로드 세션을 찾을 수 없습니다: {upload_id}")
+    return os.path.join(upload_dir, SESSION_DIR_NAME, upload_id)
+
+
+def _read_manifest(session_dir: str) -> dict:
+    try:
+        with open(os.path.join(session_dir, MANIFEST_NAME), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"업로드 세션을 찾을 수 없습니다: {os.path.basename(session_dir)}")
+
+
+def _read_bitmap(session_dir: str) -> bytes:
+    with open(os.path.join(session_dir, BITMAP_NAME), "rb") as f:
+        return f.read()
+
+
+def _last_activity(path: str) -> float:
+    # 청크를 저장하면 디렉토리와 바이트맵의 수정 시각이 갱신됨
+    try:
+        return max(os.path.getmtime(path), os.path.getmtime(os.path.join(path, BITMAP_NAME)))
+    except FileNotFoundError:
+        return os.path.getmtime(path)
+
+
+def cleanup_sessions(upload_dir: str, ttl: float = UPLOAD_SESSION_TTL) -> int:
+    """마지막 활동 후 ttl(초)이 지난 세션(및 중단된 생성/병합 임시 디렉토리) 삭제, 삭제한 수 반환"""
+    sessions_root = os.path.join(upload_dir, SESSION_DIR_NAME)
+    if not os.path.isdir(sessions_root):
+        return 0
+    now = time.time()
+    removed = 0
+    with os.scandir(sessions_root) as it:
+        for entry in it:
+            if not entry.is_dir():
+                continue
+            try:
+                expired = now - _last_activity(entry.path) > ttl
+            except FileNotFoundError:
+                # 병합 등으로 이미 삭제됨
+                continue
+            if expired:
+                shutil.rmtree(entry.path, ignore_errors=True)
+                removed += 1
+    return removed
+
+
+def _maybe_cleanup(upload_dir: str):
+    global _last_cleanup
+    with _cleanup_lock:
+        now = time.time()
+        if now - _last_cleanup < _CLEANUP_INTERVAL:
+            return
+        _last_cleanup = now
+    cleanup_sessions(upload_dir)
+
+
+def create_session(filename: str, total_chunks: int, upload_dir: str, upload_id: str = None) -> dict:
+    """
+    업로드 세션 생성
+    upload_id를 지정하면 해당 id로 생성하며, 이미 존재하면 기존 세션을 그대로 반환
+    """
+    if total_chunks <= 0:
+        raise ValueError("total_chunks는 1 이상이어야 합니다.")
+    _maybe_cleanup(upload_dir)
+
+    upload_id = upload_id or uuid.uuid4().hex
+    session_dir = _session_dir(upload_id, upload_dir)
+    if os.path.exists(os.path.join(session_dir, MANIFEST_NAME)):
+        return _read_manifest(session_dir)
+
+    manifest = {
+        "upload_id": upload_id,
+        "filename": filename,
+        "ext": os.path.splitext(filename)[1].lower(),
+        "total_chunks": total_chunks,
+        "created_at": time.time(),
+    }
+
+    # 임시 디렉토리에 manifest와 바이트맵을 만든 뒤 이름 변경으로 원자적으로 배치
+    staging_dir = os.path.join(upload_dir, SESSION_DIR_NAME, f".staging_{uuid.uuid4().hex}")
+    os.makedirs(staging_dir)
+    with open(os.path.join(staging_dir, BITMAP_NAME), "wb") as f:
+        f.truncate(total_chunks)
+    with open(os.path.join(staging_dir, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False)
+
+    try:
+        os.rename(staging_dir, session_dir)
+    except OSError:
+        # 같은 id의 세션이 동시에 생성된 경우 먼저 생성된 세션 사용
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        return _read_manifest(session_dir)
+    return manifest
+
+
+async def save_chunk(upload_id: str, chunk_index: int, upload_file: UploadFile, upload_dir: str) -> dict:
+    """청크 저장 후 바이트맵에 수신 표시 (순서 무관, 동시 업로드 가능, 재전송 시 덮어씀)"""
+    session_dir = _session_dir(upload_id, upload_dir)
+    manifest = _read_manifest(session_dir)
+    total_chunks = manifest["total_chunks"]
+    if not 0 <= chunk_index < total_chunks:
+        raise ValueError(f"chunk_index는 0 이상 {total_chunks} 미만이어야 합니다.")
+
+    # 임시 파일에 기록한 뒤 교체해서 전송 중인 청크가 완료로 보이지 않도록 함
+    part_path = await save_upload_file(upload_file, f"chunk_{chunk_index}_{uuid.uuid4().hex}.part", session_dir)
+    os.replace(part_path, os.path.join(session_dir, f"chunk_{chunk_index}"))
+
+    with open(os.path.join(session_dir, BITMAP_NAME), "r+b") as f:
+        f.seek(chunk_index)
+        f.write(b"\x01")
+
+    return get_session_status(upload_id, upload_dir)
+
+
+def reset_session(upload_id: str, upload_dir: str) -> dict:
+    """수신 표시를 모두 지우고 처음부터 다시 받음 (이미 받은 청크 파일은 다시 받을 때 덮어씀)"""
+    session_dir = _session_dir(upload_id, upload_dir)
+    manifest = _read_manifest(session_dir)
+    with open(os.path.join(session_dir, BITMAP_NAME), "r+b") as f:
+        f.write(bytes(manifest["total_chunks"]))
+    return get_session_status(upload_id, upload_dir)
+
+
+def get_session_status(upload_id: str, upload_dir: str) -> dict:
+    """세션의 수신 현황 (누락된 청크 인덱스 포함)"""
+    session_dir = _session_dir(upload_id, upload_dir)
+    manifest = _read_manifest(session_dir)
+    bitmap = _read_bitmap(session_dir)
+    missing = [i for i, received in enumerate(bitmap) if not received]
+    return {
+        "upload_id": upload_id,
+        "filename": manifest["filename"],
+        "total_chunks": manifest["total_chunks"],
+        "received_chunks": manifest["total_chunks"] - len(missing),
+        "missing_chunks": missing,
+        "complete": not missing,
+    }
+
+
+def finalize_session(upload_id: str, upload_dir: str) -> str:
+    """
+    모든 청크를 하나의 파일로 합치고 세션 디렉토리 삭제
+    동시에 여러 번 호출되어도 한 번만 병합되며, 나머지 호출은 FileNotFoundError
+    """
+    session_dir = _session_dir(upload_id, upload_dir)
+    status = get_session_status(upload_id, upload_dir)
+    if not status["complete"]:
+        raise ValueError(f"누락된 청크가 있습니다: {status['missing_chunks']}")
+
+    # 디렉토리 이름 변경으로 병합 권한을 원자적으로 획득
+    merging_dir = f"{session_dir}.merging.{uuid.uuid4().hex}"
+    try:
+        os.rename(session_dir, merging_dir)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"업로드 세션을 찾을 수 없습니다: {upload_id}")
+
+    try:
+        manifest = _read_manifest(merging_dir)
+        base_name = os.path.splitext(os.path.basename(manifest["filename"]))[0]
+        merged_path = get_unique_filepath(upload_dir, base_name, manifest["ext"])
+        with open(merged_path, "wb") as merged:
+            for i in range(manifest["total_chunks"]):
+                with open(os.path.join(merging_dir, f"chunk_{i}"), "rb") as part:
+                    copy_file_contents(part, merged)
+        os.chmod(merged_path, 0o666)
+    finally:
+        shutil.rmtree(merging_dir, ignore_errors=True)
+    return os.path.abspath(merged_path)
@@ -0,0 +1,95 @@
+"""에너지 기반 음성 구간 검출(VAD)
+
+긴 침묵 구간을 음성 인식에서 제외하고, 남은 음성을 침묵 경계에서 잘라
+여러 조각으로 나누어 병렬로 인식할 수 있도록 합니다.
+구간은 모두 샘플 인덱스 (start, end) 로 표현합니다.
+"""
+import numpy as np
+
+FRAME_SECONDS = 0.03        # 에너지 계산 프레임 길이
+NOISE_PERCENTILE = 10       # 배경 잡음 레벨 추정용 백분위
+SPEECH_MARGIN_DB = 12.0     # 잡음 레벨보다 이만큼 크면 음성으로 판단
+MIN_SPEECH_DB = -50.0       # 이보다 작은 프레임은 항상 침묵 (dBFS)
+MIN_SILENCE_SECONDS = 0.5   # 이보다 짧은 침묵은 음성 구간에 포함
+MIN_SPEECH_SECONDS = 0.25   # 이보다 짧은 음성 구간은 잡음으로 보고 제거
+PAD_SECONDS = 0.2           # 음성 구간 앞뒤 여유
+
+
+def detect_speech_regions(audio: np.ndarray, sample_rate: int) -> list:
+    """음성 구간 목록 [(start, end), ...] 반환 (샘플 인덱스, 시간 순)"""
+    frame = max(1, int(FRAME_SECONDS * sample_rate))
+    num_frames = len(audio) // frame
+    if num_frames == 0:
+        return []
+
+    frames = audio[:num_frames * frame].reshape(num_frames, frame).astype(np.float64)
+    rms = np.sqrt(np.mean(frames ** 2, axis=1))
+    db = 20 * np.log10(np.maximum(rms, 1e-10))
+
+    threshold = max(np.percentile(db, NOISE_PERCENTILE) + SPEECH_MARGIN_DB, MIN_SPEECH_DB)
+    is_speech = db > threshold
+
+    # 음성 프레임 연속 구간 찾기
+    edges = np.diff(np.concatenate(([0], is_speech.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+
+    # 짧은 침묵으로 나뉜 구간 병합
+    min_gap = int(MIN_SILENCE_SECONDS / FRAME_SECONDS)
+    merged = []
+    for start, end in zip(starts, ends):
+        if merged and start - merged[-1][1] < min_gap:
+            merged[-1][1] = end
+        else:
+            merged.append([start, end])
+
+    min_len = int(MIN_SPEECH_SECONDS / FRAME_SECONDS)
+    pad = int(PAD_SECONDS * sample_rate)
+    regions = []
+    for start, end in merged:
+        if end - start < min_len:
+            continue
+        s = max(0, start * frame - pad)
+        e = min(len(audio), end * frame + pad)
+        if regions and s <= regions[-1][1]:
+            regions[-1] = (regions[-1][0], e)
+        else:
+            regions.append((s, e))
+    return regions
+
+
+def split_speech_chunks(regions: list, sample_rate: int, max_chunk_seconds: float) -> list:
+    """
+    음성 구간들을 순서대로 묶어 조각 목록 [[(start, end), ...], ...] 반환
+    한 조각의 음성 길이 합은 max_chunk_seconds 이하 (조각 경계는 항상 침묵 구간)
+    하나의 음성 구간이 max_chunk_seconds보다 길면 그 구간만 고정 길이로 분할
+    """
+    max_len = int(max_chunk_seconds * sample_rate)
+    chunks = []
+    current, current_len = [], 0
+
+    for start, end in regions:
+        pieces = [(s, min(s + max_len, end)) for s in range(start, end, max_len)]
+        for s, e in pieces:
+            if current and current_len + (e - s) > max_len:
+                chunks.append(current)
+                current, current_len = [], 0
+            current.append((s, e))
+            current_len += e - s
+
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def map_chunk_time(t: float, chunk_regions: list, sample_rate: int) -> float:
+    """침묵을 제거하고 이어 붙인 조각 안의 시각(초)을 원본 오디오 시각(초)으로 변환"""
+    offset = 0.0
+    for start, end in chunk_regions:
+        length = (end - start) / sample_rate
+        if t <= offset + length:
+            return float(start / sample_rate + (t - offset))
+        offset += length
+    # 조각 끝을 넘어서는 타임스탬프는 마지막 구간 기준으로 연장
+    last_end = chunk_regions[-1][1]
+    return float(last_end / sample_rate + (t - offset))
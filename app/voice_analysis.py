@@ -1,74 +1,92 @@
 import parselmouth
 import numpy as np
 
+from acoustic_context import AcousticContext
+
 class SoundAnalyzer:
-    def __init__(self, snd_path, threshold=60):
-        self.snd = parselmouth.Sound(snd_path)
+    def __init__(self, snd, threshold=60, sample_rate=None):
+        """
+        snd: 파일 경로, mono PCM 배열 (배열이면 sample_rate 필요) 또는 AcousticContext
+        AcousticContext를 넘기면 다른 분석과 Sound/Intensity/Pitch를 공유
+        """
+        if isinstance(snd, AcousticContext):
+            context = snd
+        elif isinstance(snd, np.ndarray):
+            context = AcousticContext(snd, sample_rate)
+        else:
+            context = AcousticContext.from_sound(parselmouth.Sound(snd))
+        self.snd = context.sound
         self.threshold = threshold
-        self.intensity = self.snd.to_intensity()
-        self.pitch = self.snd.to_pitch()
+        self.intensity = context.intensity()
+        self.pitch = context.pitch()
     
     def evaluate_intensity(self):
-        values = self.intensity.values[0]
+        return evaluate_intensity_values(self.intensity.values[0], self.threshold)
 
-        q1 = np.percentile(values, 10)
-        q3 = np.percentile(values, 90)
-        iqr = q3 - q1
-        lower_bound = q1 - 1.5 * iqr
-        upper_bound = q3 + 1.5 * iqr
+    def evaluate_pitch_score(self):
+        return evaluate_pitch_values(self.pitch.selected_array['frequency'])
 
-        # IQR를 사용하여 이상치 제거
-        filtered_values = values[(values >= lower_bound) & (values <= upper_bound)]
-        avg_db = np.mean(filtered_values)
 
-        ratio = avg_db / self.threshold
+def evaluate_intensity_values(values: np.ndarray, threshold=60):
+    """Intensity 프레임 값(dB) 배열로 목소리 크기 등급 계산 (저장된 특징으로 재채점 가능)"""
+    q1 = np.percentile(values, 10)
+    q3 = np.percentile(values, 90)
+    iqr = q3 - q1
+    lower_bound = q1 - 1.5 * iqr
+    upper_bound = q3 + 1.5 * iqr
 
-        if 0.95 <= ratio:
-            intensity_grade = "A"
-            intensity_comment = "적절한 목소리 크기"
-        elif 0.90 <= ratio:
-            intensity_grade = "B"
-            intensity_comment = "조금 작은 목소리"
-        elif 0.85 <= ratio:
-            intensity_grade = "C"
-            intensity_comment = "작은 목소리"
-        else:
-            intensity_grade = "D"
-            intensity_comment = "너무 작은 목소리"
+    # IQR를 사용하여 이상치 제거
+    filtered_values = values[(values >= lower_bound) & (values <= upper_bound)]
+    avg_db = np.mean(filtered_values)
 
-        return intensity_grade, avg_db, intensity_comment
+    ratio = avg_db / threshold
 
+    if 0.95 <= ratio:
+        intensity_grade = "A"
+        intensity_comment = "적절한 목소리 크기"
+    elif 0.90 <= ratio:
+        intensity_grade = "B"
+        intensity_comment = "조금 작은 목소리"
+    elif 0.85 <= ratio:
+        intensity_grade = "C"
+        intensity_comment = "작은 목소리"
+    else:
+        intensity_grade = "D"
+        intensity_comment = "너무 작은 목소리"
 
-    def evaluate_pitch_score(self):
-        pitch_values = self.pitch.selected_array['frequency']
-        pitch_values = pitch_values[pitch_values > 0]
+    return intensity_grade, avg_db, intensity_comment
 
-        q1 = np.percentile(pitch_values, 25)
-        q3 = np.percentile(pitch_values, 75)
-        iqr = q3 - q1
-        lower_bound = q1 - 1.5 * iqr
-        upper_bound = q3 + 1.5 * iqr
-        filtered_pitch = pitch_values[(pitch_values >= lower_bound) & (pitch_values <= upper_bound)]
 
-        if len(filtered_pitch) == 0:
-            return "D", 0, "N/A"
+def evaluate_pitch_values(pitch_values: np.ndarray):
+    """Pitch 프레임 주파수(Hz, 무성음은 0) 배열로 억양 등급 계산 (저장된 특징으로 재채점 가능)"""
+    pitch_values = pitch_values[pitch_values > 0]
 
-        pitch_std = np.std(filtered_pitch)
-        pitch_range = np.max(filtered_pitch) - np.min(filtered_pitch)
+    q1 = np.percentile(pitch_values, 25)
+    q3 = np.percentile(pitch_values, 75)
+    iqr = q3 - q1
+    lower_bound = q1 - 1.5 * iqr
+    upper_bound = q3 + 1.5 * iqr
+    filtered_pitch = pitch_values[(pitch_values >= lower_bound) & (pitch_values <= upper_bound)]
 
-        # 기준 예시 (단위: Hz, 발표 환경에 따라 조절 가능)
-        if pitch_std > 40 and pitch_range > 100:
-            pitch_grade = "A"
-            pitch_comment = "표현력 우수"
-        elif pitch_std > 25 and pitch_range > 70:
-            pitch_grade = "B"
-            pitch_comment = "표현력 적절"
-        elif pitch_std > 10 and pitch_range > 40:
-            pitch_grade = "C"
-            pitch_comment = "조금 단조로움"
-        else:
-            pitch_grade = "D"
-            pitch_comment = "단조로움"
-        
-        avg_pitch = np.mean(filtered_pitch) if len(filtered_pitch) > 0 else 0
-        return pitch_grade, avg_pitch, pitch_comment
\ No newline at end of file
+    if len(filtered_pitch) == 0:
+        return "D", 0, "N/A"
+
+    pitch_std = np.std(filtered_pitch)
+    pitch_range = np.max(filtered_pitch) - np.min(filtered_pitch)
+
+    # 기준 예시 (단위: Hz, 발표 환경에 따라 조절 가능)
+    if pitch_std > 40 and pitch_range > 100:
+        pitch_grade = "A"
+        pitch_comment = "표현력 우수"
+    elif pitch_std > 25 and pitch_range > 70:
+        pitch_grade = "B"
+        pitch_comment = "표현력 적절"
+    elif pitch_std > 10 and pitch_range > 40:
+        pitch_grade = "C"
+        pitch_comment = "조금 단조로움"
+    else:
+        pitch_grade = "D"
+        pitch_comment = "단조로움"
+    
+    avg_pitch = np.mean(filtered_pitch) if len(filtered_pitch) > 0 else 0
+    return pitch_grade, avg_pitch, pitch_comment
\ No newline at end of file
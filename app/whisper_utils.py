@@ -1,11 +1,168 @@
-import whisper
+import multiprocessing
+import threading
+import time
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from math import gcd
+from scipy.signal import resample_poly
 
+from config import (
+    STT_BACKEND, STT_MODEL_SIZE, STT_COMPUTE_TYPE, STT_CPU_THREADS,
+    STT_VAD_ENABLED, STT_CHUNK_SECONDS, STT_PARALLEL_WORKERS,
+)
+from model_registry import registry
+from utils.vad import detect_speech_regions, split_speech_chunks, map_chunk_time
 
-model = whisper.load_model("medium")
+WHISPER_SAMPLE_RATE = 16000  # 모든 백엔드의 입력 샘플링 레이트
 
-def transcribe_audio(wav_path: str, language: str = "ko") -> dict:
-    return model.transcribe(wav_path, language=language, word_timestamps=False)
+
+class OpenAIWhisperBackend:
+    """openai-whisper (PyTorch) 백엔드"""
+    name = "openai-whisper"
+
+    def __init__(self, model_size: str = STT_MODEL_SIZE, cpu_threads: int = STT_CPU_THREADS, **kwargs):
+        import whisper
+
+        if cpu_threads > 0:
+            import torch
+            torch.set_num_threads(cpu_threads)
+        self.model = whisper.load_model(model_size)
+
+    def transcribe(self, audio: np.ndarray, language: str = "ko") -> dict:
+        return self.model.transcribe(audio, language=language, word_timestamps=False)
+
+
+class FasterWhisperBackend:
+    """faster-whisper (CTranslate2) 백엔드 - CPU에서 int8 양자화로 빠르게 동작"""
+    name = "faster-whisper"
+
+    def __init__(
+        self,
+        model_size: str = STT_MODEL_SIZE,
+        compute_type: str = STT_COMPUTE_TYPE,
+        cpu_threads: int = STT_CPU_THREADS,
+        **kwargs,
+    ):
+        from faster_whisper import WhisperModel
+
+        self.model = WhisperModel(model_size, device="cpu", compute_type=compute_type, cpu_threads=cpu_threads)
+
+    def transcribe(self, audio: np.ndarray, language: str = "ko") -> dict:
+        """openai-whisper와 같은 모양의 결과 반환 (segments에 start, end, text, avg_logprob 포함)"""
+        segments, info = self.model.transcribe(audio, language=language, word_timestamps=False)
+        segments = [
+            {
+                "id": seg.id,
+                "start": seg.start,
+                "end": seg.end,
+                "text": seg.text,
+                "avg_logprob": seg.avg_logprob,
+                "compression_ratio": seg.compression_ratio,
+                "no_speech_prob": seg.no_speech_prob,
+            }
+            for seg in segments
+        ]
+        return {
+            "text": "".join(seg["text"] for seg in segments),
+            "segments": segments,
+            "language": info.language,
+        }
+
+
+STT_BACKENDS = {
+    OpenAIWhisperBackend.name: OpenAIWhisperBackend,
+    FasterWhisperBackend.name: FasterWhisperBackend,
+}
+
+
+def create_stt_backend(name: str = STT_BACKEND, **kwargs):
+    """설정에 맞는 음성 인식 백엔드 생성 (kwargs: model_size, compute_type, cpu_threads)"""
+    if name not in STT_BACKENDS:
+        raise ValueError(f"지원되지 않는 음성 인식 백엔드입니다: {name} (가능: {list(STT_BACKENDS)})")
+    return STT_BACKENDS[name](**kwargs)
+
+
+# 모델은 import 시점이 아니라 첫 사용(또는 서버 시작 워밍업) 때 로딩
+registry.register("stt", create_stt_backend)
+
+
+def get_stt_backend():
+    return registry.get("stt")
+
+def transcribe_audio(audio, language: str = "ko", sample_rate: int = WHISPER_SAMPLE_RATE) -> dict:
+    """
+    음성 인식
+    - audio: 파일 경로 또는 mono float32 PCM 배열 (배열이면 재디코딩 없이 바로 사용)
+    - STT_VAD_ENABLED이면 침묵을 제거하고 조각 단위로 인식 (transcribe_long_audio)
+    """
+    if isinstance(audio, str):
+        from utils.audio import decode_audio
+        audio = decode_audio(audio, WHISPER_SAMPLE_RATE)
+    elif sample_rate != WHISPER_SAMPLE_RATE:
+        g = gcd(WHISPER_SAMPLE_RATE, sample_rate)
+        audio = resample_poly(audio, WHISPER_SAMPLE_RATE // g, sample_rate // g).astype(np.float32)
+
+    if STT_VAD_ENABLED:
+        return transcribe_long_audio(audio, language=language)
+    return get_stt_backend().transcribe(audio, language=language)
+
+
+# --- 긴 녹음: 침묵 제거 + 조각 병렬 인식 ---
+_stt_pool = None
+_stt_pool_lock = threading.Lock()
+
+
+def _get_stt_pool():
+    """조각 인식용 프로세스풀 (각 프로세스가 첫 조각을 받을 때 자체 모델을 로딩)"""
+    global _stt_pool
+    with _stt_pool_lock:
+        if _stt_pool is None and STT_PARALLEL_WORKERS > 0:
+            _stt_pool = ProcessPoolExecutor(
+                max_workers=STT_PARALLEL_WORKERS, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _stt_pool
+
+
+def _transcribe_chunk(audio: np.ndarray, language: str) -> dict:
+    return get_stt_backend().transcribe(audio, language=language)
+
+
+def transcribe_long_audio(audio: np.ndarray, language: str = "ko", max_chunk_seconds: float = STT_CHUNK_SECONDS) -> dict:
+    """
+    침묵 구간을 제거하고 음성을 침묵 경계에서 max_chunk_seconds 이하 조각으로 나누어 인식
+    - STT_PARALLEL_WORKERS > 0 이면 조각을 프로세스풀에서 병렬 인식
+    - 각 조각의 segment 시각을 원본 오디오 기준으로 보정해서 하나의 결과로 합침
+      (calculate_wpm / calculate_pronunciation_score에 그대로 사용 가능)
+    """
+    regions = detect_speech_regions(audio, WHISPER_SAMPLE_RATE)
+    chunks = split_speech_chunks(regions, WHISPER_SAMPLE_RATE, max_chunk_seconds)
+    if not chunks:
+        return {"text": "", "segments": [], "language": language}
+
+    chunk_audios = [np.concatenate([audio[start:end] for start, end in chunk]) for chunk in chunks]
+    pool = _get_stt_pool()
+    if pool is not None and len(chunks) > 1:
+        results = list(pool.map(_transcribe_chunk, chunk_audios, [language] * len(chunks)))
+    else:
+        stt_backend = get_stt_backend()
+        results = [stt_backend.transcribe(chunk_audio, language=language) for chunk_audio in chunk_audios]
+
+    segments = []
+    for chunk, result in zip(chunks, results):
+        for seg in result.get("segments", []):
+            seg = dict(seg)
+            seg["start"] = map_chunk_time(seg.get("start", 0), chunk, WHISPER_SAMPLE_RATE)
+            seg["end"] = map_chunk_time(seg.get("end", 0), chunk, WHISPER_SAMPLE_RATE)
+            seg["id"] = len(segments)
+            seg.pop("seek", None)
+            seg.pop("tokens", None)
+            segments.append(seg)
+
+    return {
+        "text": "".join(result.get("text", "") for result in results),
+        "segments": segments,
+        "language": language,
+    }
 
 def calculate_pronunciation_score(segments, threshold=-1.0):
     """Whisper segments 기반 발음 점수 계산"""
@@ -47,7 +204,7 @@ def calculate_wpm(segments):
         total_time += segment_duration
 
     if total_time == 0:
-        return 0.0
+        return 0.0, *grade_wpm_korean(0.0)
 
     wpm = (total_words / total_time) * 60  # 초 -> 분 환산
     wpm_grade, wpm_comment = grade_wpm_korean(wpm)
@@ -66,4 +223,38 @@ def grade_wpm_korean(wpm):
         return "C", comment
     else:
         comment = "많이 느림" if wpm < 70 else "많이 빠름"
-        return "D", comment
\ No newline at end of file
+        return "D", comment
+
+
+if __name__ == "__main__":
+    # --- 백엔드 실시간 계수(RTF) 비교 ---
+    # 사용법: python whisper_utils.py <음성/영상 파일> [백엔드 ...]
+    # RTF = 인식 소요 시간 / 오디오 길이 (1보다 작으면 실시간보다 빠름)
+    import sys
+    from utils.audio import decode_audio
+
+    if len(sys.argv) < 2:
+        print("사용법: python whisper_utils.py <파일> [openai-whisper faster-whisper ...]")
+        sys.exit(1)
+
+    audio = decode_audio(sys.argv[1], WHISPER_SAMPLE_RATE)
+    duration = len(audio) / WHISPER_SAMPLE_RATE
+    names = sys.argv[2:] or list(STT_BACKENDS)
+
+    print(f"오디오 길이: {duration:.1f}s, 모델: {STT_MODEL_SIZE}, compute_type: {STT_COMPUTE_TYPE}, threads: {STT_CPU_THREADS}")
+    for name in names:
+        load_started = time.perf_counter()
+        bench_backend = create_stt_backend(name)
+        load_time = time.perf_counter() - load_started
+
+        started = time.perf_counter()
+        result = bench_backend.transcribe(audio, language="ko")
+        elapsed = time.perf_counter() - started
+
+        segments = result.get("segments", [])
+        pron_score, _, _ = calculate_pronunciation_score(segments)
+        wpm, _, _ = calculate_wpm(segments)
+        print(
+            f"{name:>15} | 로딩 {load_time:6.1f}s | 인식 {elapsed:7.1f}s | RTF {elapsed / duration:.3f} "
+            f"| 세그먼트 {len(segments)} | 발음 점수 {pron_score:.4f} | WPM {wpm:.1f}"
+        )
@@ -0,0 +1,19 @@
+import os
+import sys
+
+# app 모듈은 app 디렉토리를 기준으로 import (uvicorn main:app 실행 방식과 동일)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app"))
+
+import pytest
+
+
+@pytest.fixture
+def main(tmp_path, monkeypatch):
+    """API 모듈 (업로드 디렉토리는 테스트마다 tmp_path), MediaPipe / Praat이 설치된 환경에서만 import 가능"""
+    for module in ("mediapipe", "parselmouth"):
+        pytest.importorskip(module)
+    monkeypatch.setenv("UPLOAD_DIR", str(tmp_path))
+    monkeypatch.setenv("MODEL_WARMUP", "false")
+    import main
+    monkeypatch.setattr(main, "UPLOAD_DIR", str(tmp_path))
+    return main
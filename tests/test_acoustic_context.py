@@ -0,0 +1,68 @@
+import threading
+
+import numpy as np
+import pytest
+
+pytest.importorskip("parselmouth")
+
+from acoustic_context import AcousticContext  # noqa: E402
+from anxiety.voice_feature import PITCH_CEILING, PITCH_FLOOR, extract_features_by_window  # noqa: E402
+from scoring import acoustic_features  # noqa: E402
+from voice_analysis import SoundAnalyzer  # noqa: E402
+
+SAMPLE_RATE = 16000
+
+
+@pytest.fixture
+def context():
+    t = np.arange(3 * SAMPLE_RATE) / SAMPLE_RATE
+    audio = 0.3 * np.sin(2 * np.pi * 150 * t) + 0.1 * np.sin(2 * np.pi * 300 * t)
+    return AcousticContext(audio.astype(np.float32), SAMPLE_RATE)
+
+
+def test_prosody_consumers_share_memoized_objects(context):
+    analyzer = SoundAnalyzer(context)
+    features = acoustic_features(context)
+
+    assert analyzer.snd is context.sound
+    assert analyzer.pitch is context.pitch()
+    assert analyzer.intensity is context.intensity()
+    np.testing.assert_array_equal(features["pitch"], analyzer.pitch.selected_array["frequency"])
+
+
+def test_voice_anxiety_reuses_context_sound_and_pitch(context):
+    sound = context.sound
+    extract_features_by_window(context, mode="whole")
+    pitch = context.pitch(PITCH_FLOOR, PITCH_CEILING)
+    point_process = context.point_process(PITCH_FLOOR, PITCH_CEILING)
+
+    # 두 번째 호출과 억양 분석은 같은 Sound / Pitch / PointProcess 객체를 그대로 사용
+    extract_features_by_window(context, mode="whole")
+    SoundAnalyzer(context)
+    assert context.sound is sound
+    assert context.pitch(PITCH_FLOOR, PITCH_CEILING) is pitch
+    assert context.point_process(PITCH_FLOOR, PITCH_CEILING) is point_process
+
+
+def test_pitch_settings_are_cached_separately(context):
+    # 억양 등급(기본 75-600Hz)과 불안도(75-500Hz)의 Pitch는 설정이 달라 별개 객체
+    assert context.pitch() is not context.pitch(PITCH_FLOOR, PITCH_CEILING)
+    assert context.pitch() is context.pitch(75.0, 600.0)
+
+
+def test_concurrent_consumers_get_one_object(context):
+    results = []
+    barrier = threading.Barrier(8)
+
+    def consume():
+        barrier.wait()
+        results.append(context.point_process(PITCH_FLOOR, PITCH_CEILING))
+
+    threads = [threading.Thread(target=consume) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(results) == 8
+    assert all(result is results[0] for result in results)
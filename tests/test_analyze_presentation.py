@@ -0,0 +1,39 @@
+import pytest
+
+pytest.importorskip("openai")
+
+import gpt  # noqa: E402
+
+
+@pytest.fixture
+def routes(monkeypatch):
+    """analyze_presentation이 선택한 처리 방식 기록"""
+    called = []
+    monkeypatch.setattr(gpt, "analyze_long_transcript", lambda *a, **k: called.append("long") or ("", {}))
+    monkeypatch.setattr(gpt, "analyze_transcript_combined", lambda *a, **k: called.append("combined") or ("", {}))
+    monkeypatch.setattr(gpt, "correct_transcript", lambda *a, **k: called.append("correct") or "")
+    monkeypatch.setattr(gpt, "get_chat_response", lambda *a, **k: called.append("separate") or {})
+    return called
+
+
+@pytest.mark.parametrize("mode, expected", [("combined", ["combined"]), ("separate", ["correct", "separate"])])
+def test_short_transcript_follows_mode(routes, mode, expected):
+    gpt.analyze_presentation("가" * 99, mode=mode, long_transcript_chars=100)
+    assert routes == expected
+
+
+def test_long_transcript_overrides_mode_and_logs(routes, capsys):
+    gpt.analyze_presentation("가" * 100, mode="combined", long_transcript_chars=100)
+    assert routes == ["long"]
+    assert "LLM_ANALYSIS_MODE=combined" in capsys.readouterr().out
+
+
+def test_long_transcript_threshold_zero_disables_map_reduce(routes):
+    gpt.analyze_presentation("가" * 10000, mode="combined", long_transcript_chars=0)
+    assert routes == ["combined"]
+
+
+def test_unknown_mode_is_rejected_before_any_call(routes):
+    with pytest.raises(ValueError):
+        gpt.analyze_presentation("가" * 10000, mode="bogus", long_transcript_chars=100)
+    assert routes == []
@@ -0,0 +1,51 @@
+import os
+import stat
+import sys
+import textwrap
+import time
+
+import numpy as np
+import pytest
+
+from utils.audio import decode_audio
+
+
+@pytest.fixture
+def fake_ffmpeg(tmp_path, monkeypatch):
+    """PATH 맨 앞에 둔 ffmpeg 대역 스크립트 (body: 파이썬 코드)"""
+    def install(body: str):
+        script = tmp_path / "ffmpeg"
+        script.write_text(f"#!{sys.executable}\nimport sys, time\n" + textwrap.dedent(body))
+        script.chmod(script.stat().st_mode | stat.S_IEXEC)
+        monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ['PATH']}")
+    return install
+
+
+def test_large_stderr_does_not_block_decoding(fake_ffmpeg, tmp_path):
+    # 파이프 버퍼(약 64KB)보다 많은 경고를 먼저 쓴 뒤 PCM 출력
+    fake_ffmpeg("""
+        sys.stderr.write("warning: corrupt frame\\n" * 20000)
+        sys.stderr.flush()
+        sys.stdout.buffer.write(bytes(4 * 16000))
+    """)
+    audio = decode_audio(str(tmp_path / "talk.wav"), timeout=10)
+    assert np.array_equal(audio, np.zeros(16000, dtype=np.float32))
+
+
+def test_failure_reports_stderr(fake_ffmpeg, tmp_path):
+    fake_ffmpeg("""
+        sys.stderr.write("x" * 100000 + "invalid data found\\n")
+        sys.exit(1)
+    """)
+    with pytest.raises(RuntimeError, match="invalid data found"):
+        decode_audio(str(tmp_path / "talk.wav"), timeout=10)
+
+
+def test_hung_ffmpeg_is_killed_after_timeout(fake_ffmpeg, tmp_path):
+    fake_ffmpeg("""
+        time.sleep(60)
+    """)
+    started = time.monotonic()
+    with pytest.raises(RuntimeError, match="시간 초과"):
+        decode_audio(str(tmp_path / "talk.wav"), timeout=0.5)
+    assert time.monotonic() - started < 10
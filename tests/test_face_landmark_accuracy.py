@@ -0,0 +1,55 @@
+"""샘플링 / 축소 / ROI 분석의 랜드마크 정확도 확인 (실제 얼굴 영상 필요)
+
+FACE_CLIP_PATH 환경변수로 얼굴이 나오는 영상을 지정하면, 기본 설정(VISUAL_ANALYSIS_FPS, VISUAL_MAX_WIDTH,
+ROI)으로 추출한 랜드마크와 EAR을 모든 프레임을 원본 크기로 분석한 결과와 비교합니다.
+영상 분석 기본값을 바꿀 때는 이 테스트를 실제 발표 영상으로 실행해 확인합니다.
+"""
+import os
+
+import numpy as np
+import pytest
+
+CLIP = os.getenv("FACE_CLIP_PATH")
+pytestmark = pytest.mark.skipif(not CLIP, reason="FACE_CLIP_PATH가 지정되지 않음")
+
+# 랜드마크 오차 허용 범위 (양쪽 눈 바깥쪽 끝 사이 거리 대비)
+MEDIAN_ERROR_RATIO = 0.03
+P95_ERROR_RATIO = 0.08
+EAR_MEAN_ABS_ERROR = 0.02
+
+
+@pytest.fixture(scope="module")
+def landmarks():
+    from anxiety.facial_feature import extract_landmarks
+    full = extract_landmarks(CLIP, analysis_fps=0, max_width=0, use_roi=False)
+    fast = extract_landmarks(CLIP)
+    assert full is not None and fast is not None, "영상을 열 수 없음"
+    return full, fast
+
+
+def test_sampled_landmarks_match_full_rate(landmarks):
+    from anxiety.facial_feature import RIGHT_EYE_SLICE, LEFT_EYE_SLICE
+    (full_indices, full_points, _, _), (fast_indices, fast_points, _, _) = landmarks
+
+    # 전체 분석은 모든 프레임을 포함하므로 샘플 프레임 위치의 값과 비교
+    reference = full_points[np.searchsorted(full_indices, fast_indices)]
+    both = ~np.isnan(reference[:, 0, 0]) & ~np.isnan(fast_points[:, 0, 0])
+    full_rate = np.mean(~np.isnan(reference[:, 0, 0]))
+    assert full_rate > 0.5, "영상에서 얼굴이 충분히 검출되지 않음"
+    assert np.mean(both) >= full_rate - 0.05
+
+    interocular = np.linalg.norm(
+        reference[both][:, RIGHT_EYE_SLICE][:, 0] - reference[both][:, LEFT_EYE_SLICE][:, 3], axis=1
+    )
+    error = np.linalg.norm(fast_points[both] - reference[both], axis=2) / interocular[:, None]
+    assert np.median(error) < MEDIAN_ERROR_RATIO
+    assert np.percentile(error, 95) < P95_ERROR_RATIO
+
+
+def test_interpolated_ear_matches_full_rate(landmarks):
+    from anxiety.facial_feature import calculate_ear_series
+    (full_indices, full_points, total, _), (fast_indices, fast_points, _, _) = landmarks
+
+    full_ear = np.interp(np.arange(total), full_indices, calculate_ear_series(full_points))
+    fast_ear = np.interp(np.arange(total), fast_indices, calculate_ear_series(fast_points))
+    assert np.mean(np.abs(full_ear - fast_ear)) < EAR_MEAN_ABS_ERROR
@@ -0,0 +1,154 @@
+import math
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+pytest.importorskip("cv2")
+pytest.importorskip("mediapipe")
+
+from anxiety import facial_feature as ff  # noqa: E402
+
+NUM_LANDMARKS = 478
+
+
+# --- 벡터화 이전의 프레임 단위 구현 (비교 기준) ---
+def _old_point(landmarks, idx, frame_shape):
+    landmark = landmarks[idx]
+    return (int(landmark.x * frame_shape[1]), int(landmark.y * frame_shape[0]))
+
+
+def _old_distance(p1, p2):
+    return math.sqrt((p1[0] - p2[0]) ** 2 + (p1[1] - p2[1]) ** 2)
+
+
+def _old_eye_ear(landmarks, indices, frame_shape):
+    p1 = _old_point(landmarks, indices[3], frame_shape)
+    p4 = _old_point(landmarks, indices[0], frame_shape)
+    p2 = _old_point(landmarks, indices[1], frame_shape)
+    p6 = _old_point(landmarks, indices[5], frame_shape)
+    p3 = _old_point(landmarks, indices[2], frame_shape)
+    p5 = _old_point(landmarks, indices[4], frame_shape)
+    horizontal = _old_distance(p1, p4)
+    return (_old_distance(p2, p6) + _old_distance(p3, p5)) / (2.0 * horizontal) if horizontal else 0.0
+
+
+def _old_ear(landmarks, frame_shape):
+    right = _old_eye_ear(landmarks, ff.RIGHT_EYE_INDICES, frame_shape)
+    left = _old_eye_ear(landmarks, ff.LEFT_EYE_INDICES, frame_shape)
+    if right > 0 and left > 0: return (left + right) / 2.0
+    if right > 0: return right
+    if left > 0: return left
+    return 0.0
+
+
+def _old_samples(frames):
+    """frames: [(landmarks 또는 None, crop_box)] → (EAR 목록, 코끝 좌표 목록)"""
+    last_good_ear = ff.DEFAULT_EAR
+    ears, noses = [], []
+    for landmarks, crop_box in frames:
+        current_ear = last_good_ear
+        nose_tip = None
+        if landmarks is not None:
+            crop_shape = (crop_box[3] - crop_box[1], crop_box[2] - crop_box[0])
+            current_ear = _old_ear(landmarks, crop_shape)
+            last_good_ear = current_ear if current_ear > 0 else last_good_ear
+            nose = _old_point(landmarks, ff.NOSE_TIP_INDEX, crop_shape)
+            nose_tip = (nose[0] + crop_box[0], nose[1] + crop_box[1])
+        ears.append(current_ear)
+        noses.append(nose_tip)
+    return ears, noses
+
+
+def _old_nose_displacement(frame_indices, nose_points, total_frames):
+    displacement = np.zeros(total_frames)
+    for k in range(1, len(frame_indices)):
+        prev_point, point = nose_points[k - 1], nose_points[k]
+        if prev_point is None or point is None:
+            continue
+        start, end = frame_indices[k - 1], frame_indices[k]
+        displacement[start + 1:end + 1] = _old_distance(point, prev_point) / (end - start)
+    return displacement
+
+
+# --- 입력 생성 ---
+def _random_landmarks(rng):
+    coords = rng.uniform(-0.05, 1.05, size=(NUM_LANDMARKS, 2))
+    return [SimpleNamespace(x=x, y=y) for x, y in coords]
+
+
+def _closed_eye(landmarks, indices):
+    """눈 가로 길이를 0으로 만든 랜드마크 (EAR 0)"""
+    landmarks[indices[3]] = SimpleNamespace(x=landmarks[indices[0]].x, y=landmarks[indices[0]].y)
+
+
+def _random_frames(rng, count):
+    frames = []
+    for i in range(count):
+        roll = rng.random()
+        x0, y0 = (0, 0) if roll < 0.3 else (int(rng.integers(0, 400)), int(rng.integers(0, 300)))
+        crop_box = (x0, y0, x0 + int(rng.integers(40, 640)), y0 + int(rng.integers(40, 480)))
+        if roll < 0.15:
+            frames.append((None, crop_box))
+            continue
+        landmarks = _random_landmarks(rng)
+        if roll > 0.85:
+            _closed_eye(landmarks, ff.RIGHT_EYE_INDICES)
+        if roll > 0.92:
+            _closed_eye(landmarks, ff.LEFT_EYE_INDICES)
+        frames.append((landmarks, crop_box))
+    return frames
+
+
+def _new_points(frames):
+    nan = np.full((len(ff.LANDMARK_INDICES), 2), np.nan)
+    return np.array([nan if lm is None else ff._landmark_points(lm, box) for lm, box in frames])
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_ear_series_matches_per_frame_calculation(seed):
+    rng = np.random.default_rng(seed)
+    frames = _random_frames(rng, 300)
+    # 첫 얼굴 감지 전 구간과 양쪽 눈이 모두 감긴 구간도 포함
+    frames[:3] = [(None, (0, 0, 640, 480))] * 3
+
+    expected, _ = _old_samples(frames)
+    actual = ff.calculate_ear_series(_new_points(frames))
+
+    np.testing.assert_allclose(actual, expected, rtol=1e-12, atol=0)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_nose_displacement_matches_per_sample_interpolation(seed):
+    rng = np.random.default_rng(100 + seed)
+    frames = _random_frames(rng, 120)
+    frame_indices = np.cumsum(rng.integers(1, 5, size=len(frames))) + int(rng.integers(0, 3))
+    total_frames = int(frame_indices[-1]) + int(rng.integers(0, 10))
+
+    _, old_noses = _old_samples(frames)
+    expected = _old_nose_displacement(list(frame_indices), old_noses, total_frames)
+    actual = ff.calculate_nose_displacement(
+        frame_indices, _new_points(frames)[:, ff.NOSE_TIP_SLOT], total_frames,
+    )
+
+    np.testing.assert_allclose(actual, expected, rtol=1e-12, atol=0)
+
+
+def test_empty_and_single_sample():
+    assert len(ff.calculate_ear_series(np.zeros((0, len(ff.LANDMARK_INDICES), 2)))) == 0
+    displacement = ff.calculate_nose_displacement(np.array([3]), np.array([[1.0, 2.0]]), 10)
+    assert np.array_equal(displacement, np.zeros(10))
+
+
+def test_worker_ready_check_runs_once_per_process():
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    context = multiprocessing.get_context("spawn")
+    workers = 2
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=ff.warmup_face_mesh_pool) as pool:
+        with context.Manager() as manager:
+            barrier = manager.Barrier(workers)
+            futures = [pool.submit(ff.face_mesh_worker_ready, barrier, 60) for _ in range(workers)]
+            pids = {future.result(timeout=120) for future in futures}
+    assert len(pids) == workers
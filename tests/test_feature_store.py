@@ -0,0 +1,49 @@
+import hashlib
+
+import numpy as np
+import pytest
+
+from feature_store import load_features, load_features_by_hash, save_features
+
+
+def _hash(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def _features(value: float) -> dict:
+    return {"segments": [{"id": 0, "text": "안녕하세요"}], "intensity": np.full(5, value), "fps": 30.0}
+
+
+def test_save_and_load(tmp_path):
+    save_features("job-1", _hash("a"), _features(1.0), store_dir=str(tmp_path))
+    features = load_features("job-1", store_dir=str(tmp_path))
+    assert features["content_hash"] == _hash("a")
+    assert features["segments"] == [{"id": 0, "text": "안녕하세요"}]
+    assert features["fps"] == 30.0
+    assert np.array_equal(features["intensity"], np.ones(5))
+
+
+def test_load_by_content_hash(tmp_path):
+    save_features("job-1", _hash("a"), _features(1.0), store_dir=str(tmp_path))
+    save_features("job-2", _hash("b"), _features(2.0), store_dir=str(tmp_path))
+
+    assert np.array_equal(load_features_by_hash(_hash("a"), store_dir=str(tmp_path))["intensity"], np.ones(5))
+    assert np.array_equal(load_features_by_hash(_hash("b"), store_dir=str(tmp_path))["intensity"], np.full(5, 2.0))
+
+
+def test_load_by_content_hash_missing(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        load_features_by_hash(_hash("a"), store_dir=str(tmp_path))
+    with pytest.raises(FileNotFoundError):
+        load_features_by_hash("../job-1", store_dir=str(tmp_path))
+    with pytest.raises(FileNotFoundError):
+        load_features_by_hash(None, store_dir=str(tmp_path))
+
+
+def test_stale_hash_index_is_ignored(tmp_path):
+    # 같은 job_id에 다른 내용의 특징을 다시 저장하면 이전 내용 해시로는 찾지 않음
+    save_features("job-1", _hash("a"), _features(1.0), store_dir=str(tmp_path))
+    save_features("job-1", _hash("b"), _features(2.0), store_dir=str(tmp_path))
+    with pytest.raises(FileNotFoundError):
+        load_features_by_hash(_hash("a"), store_dir=str(tmp_path))
+    assert load_features_by_hash(_hash("b"), store_dir=str(tmp_path))["content_hash"] == _hash("b")
@@ -0,0 +1,233 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+pytest.importorskip("openai")
+
+from openai import APIStatusError, AsyncOpenAI  # noqa: E402
+
+import gpt  # noqa: E402
+
+
+def _completion(content: str) -> httpx.Response:
+    return httpx.Response(200, json={
+        "id": "chatcmpl-test", "object": "chat.completion", "created": 0, "model": "gpt-4o-mini",
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+    })
+
+
+def _stream(parts: list) -> httpx.Response:
+    lines = []
+    for part in parts:
+        chunk = {
+            "id": "chatcmpl-test", "object": "chat.completion.chunk", "created": 0, "model": "gpt-4o-mini",
+            "choices": [{"index": 0, "delta": {"content": part}, "finish_reason": None}],
+        }
+        lines.append(f"data: {json.dumps(chunk)}\n\n")
+    lines.append("data: [DONE]\n\n")
+    return httpx.Response(200, content="".join(lines).encode(), headers={"content-type": "text/event-stream"})
+
+
+@pytest.fixture
+def mock_openai(monkeypatch):
+    """
+    LLM 루프의 클라이언트를 httpx.MockTransport 스텁으로 교체
+    install(handler, concurrency)로 설치하고, 요청 본문(JSON) 목록을 반환
+    """
+    installed = []
+
+    def install(handler, concurrency: int = gpt.GPT_MAX_CONCURRENCY):
+        requests = []
+
+        async def record(request: httpx.Request):
+            requests.append(json.loads(request.content))
+            response = handler(request, len(requests))
+            if asyncio.iscoroutine(response):
+                response = await response
+            return response
+
+        http_client = httpx.AsyncClient(transport=httpx.MockTransport(record))
+        client = AsyncOpenAI(api_key="test", base_url="http://llm.test/v1", http_client=http_client, max_retries=0)
+        monkeypatch.setattr(gpt, "_client", client)
+        monkeypatch.setattr(gpt, "_semaphore", asyncio.Semaphore(concurrency))
+        installed.append(client)
+        return requests
+
+    monkeypatch.setattr(gpt, "_retry_delay", lambda error, attempt: 0)
+    yield install
+    for client in installed:
+        asyncio.run_coroutine_threadsafe(client.close(), gpt._get_loop()).result(timeout=5)
+
+
+def test_call_gpt_returns_content(mock_openai):
+    requests = mock_openai(lambda request, n: _completion("```json\n{\"a\": 1}\n```"))
+    assert gpt.call_gpt("안녕", temperature=0) == '{"a": 1}'
+    assert requests[0]["messages"] == [{"role": "user", "content": "안녕"}]
+
+
+def test_concurrency_is_limited_by_semaphore(mock_openai):
+    in_flight = 0
+    peak = 0
+
+    async def handler(request, n):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.05)
+        in_flight -= 1
+        return _completion(json.loads(request.content)["messages"][0]["content"])
+
+    requests = mock_openai(handler, concurrency=2)
+    prompts = [f"prompt {i}" for i in range(6)]
+
+    assert gpt.call_gpt_many(prompts, temperature=0) == prompts
+    assert len(requests) == 6
+    assert peak == 2
+
+
+@pytest.mark.parametrize("status", [429, 503])
+def test_retries_rate_limit_and_server_errors(mock_openai, status):
+    requests = mock_openai(lambda request, n: httpx.Response(status, json={"error": {}}) if n < 3 else _completion("ok"))
+    assert gpt.call_gpt("안녕") == "ok"
+    assert len(requests) == 3
+
+
+def test_gives_up_after_max_retries(mock_openai, monkeypatch):
+    monkeypatch.setattr(gpt, "GPT_MAX_RETRIES", 2)
+    requests = mock_openai(lambda request, n: httpx.Response(503, json={"error": {}}))
+    with pytest.raises(APIStatusError):
+        gpt.call_gpt("안녕")
+    assert len(requests) == 3
+
+
+def test_client_errors_are_not_retried(mock_openai):
+    requests = mock_openai(lambda request, n: httpx.Response(400, json={"error": {}}))
+    with pytest.raises(APIStatusError):
+        gpt.call_gpt("안녕")
+    assert len(requests) == 1
+
+
+def test_cancelling_caller_cancels_request(mock_openai):
+    cancelled = []
+
+    async def handler(request, n):
+        try:
+            await asyncio.sleep(30)
+        except asyncio.CancelledError:
+            cancelled.append(n)
+            raise
+        return _completion("late")
+
+    mock_openai(handler, concurrency=1)
+
+    async def caller():
+        task = asyncio.create_task(gpt.call_gpt_async("안녕"))
+        await asyncio.sleep(0.2)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(caller())
+
+    # LLM 루프의 요청도 취소되어 동시 호출 슬롯이 반환됨
+    async def semaphore_free():
+        for _ in range(50):
+            if cancelled and not gpt._semaphore.locked():
+                return True
+            await asyncio.sleep(0.01)
+        return False
+
+    assert asyncio.run_coroutine_threadsafe(semaphore_free(), gpt._get_loop()).result(timeout=5)
+    assert cancelled == [1]
+
+
+def test_streaming_forwards_deltas(mock_openai):
+    mock_openai(lambda request, n: _stream(["안", "녕", "하세요"]))
+    deltas = []
+    assert gpt.call_gpt("안녕", on_delta=deltas.append) == "안녕하세요"
+    assert deltas == ["안", "녕", "하세요"]
+
+
+def test_stream_is_not_retried_after_partial_output(mock_openai):
+    class BrokenStream(httpx.AsyncByteStream):
+        async def __aiter__(self):
+            chunk = {
+                "id": "c", "object": "chat.completion.chunk", "created": 0, "model": "m",
+                "choices": [{"index": 0, "delta": {"content": "안"}, "finish_reason": None}],
+            }
+            yield f"data: {json.dumps(chunk)}\n\n".encode()
+            raise httpx.ReadError("connection lost")
+
+    requests = mock_openai(lambda request, n: httpx.Response(
+        200, stream=BrokenStream(), headers={"content-type": "text/event-stream"},
+    ))
+    deltas = []
+    with pytest.raises(Exception):
+        gpt.call_gpt("안녕", on_delta=deltas.append)
+    assert deltas == ["안"]
+    assert len(requests) == 1
+
+
+@pytest.fixture
+def llm_cache(tmp_path, monkeypatch):
+    from llm_cache import LLMCache
+    monkeypatch.setattr(gpt, "LLM_CACHE_ENABLED", True)
+    monkeypatch.setattr(gpt, "_cache", LLMCache(db_path=str(tmp_path / "llm_cache.db")))
+
+
+def test_unparseable_correction_is_not_cached(mock_openai, llm_cache):
+    requests = mock_openai(lambda request, n: _completion("교정 결과를 만들 수 없습니다") if n == 1
+                           else _completion('{"corrected_sentence": "안녕하세요"}'))
+    assert gpt.correct_stt_result("안녕하새요").startswith("[오류]")
+    # 실패한 응답은 캐시되지 않아 다시 호출하고, 파싱된 응답은 캐시에서 재사용
+    assert gpt.correct_stt_result("안녕하새요") == "안녕하세요"
+    assert gpt.correct_stt_result("안녕하새요") == "안녕하세요"
+    assert len(requests) == 2
+
+
+def test_invalid_combined_analysis_is_not_cached(mock_openai, llm_cache):
+    def handler(request, n):
+        template = json.loads(request.content)["messages"][0]["content"]
+        if "corrected_sentence)" in template:
+            return _completion('{"corrected_sentence": "안녕하세요"}')  # 스키마 검증 실패
+        if "STT 결과입니다" in template:
+            return _completion('{"corrected_sentence": "안녕하세요"}')
+        return _completion('{"adjusted_script": "안녕하세요", "feedback": {}, "predicted_questions": []}')
+
+    requests = mock_openai(handler)
+    for _ in range(2):
+        corrected, analysis = gpt.analyze_transcript_combined("안녕하새요")
+        assert corrected == "안녕하세요"
+        assert analysis["adjusted_script"] == "안녕하세요"
+    # 구조화 분석 응답만 매번 다시 호출되고, 대신 처리한 교정/분석 응답은 캐시됨
+    assert len(requests) == 4
+
+
+def _combined_fallback_handler(request, n):
+    prompt = json.loads(request.content)["messages"][0]["content"]
+    if "corrected_sentence)" in prompt:
+        return _stream(['{"corrected_sentence": ', '"안녕하세요"}'])  # 스키마 검증 실패
+    if "STT 결과입니다" in prompt:
+        return _completion('{"corrected_sentence": "안녕하세요"}')
+    return _stream(['{"adjusted_script": "안녕하세요", ', '"feedback": {}, "predicted_questions": []}'])
+
+
+def test_combined_fallback_resets_stream(mock_openai):
+    mock_openai(_combined_fallback_handler)
+    events = []
+    gpt.analyze_transcript_combined(
+        "안녕하새요", on_delta=lambda text: events.append(("delta", text)), on_reset=lambda: events.append(("reset",)),
+    )
+    reset = events.index(("reset",))
+    assert "".join(event[1] for event in events[:reset]) == '{"corrected_sentence": "안녕하세요"}'
+    assert json.loads("".join(event[1] for event in events[reset + 1:]))["adjusted_script"] == "안녕하세요"
+
+
+def test_combined_fallback_without_reset_does_not_stream_again(mock_openai):
+    mock_openai(_combined_fallback_handler)
+    deltas = []
+    corrected, analysis = gpt.analyze_transcript_combined("안녕하새요", on_delta=deltas.append)
+    assert "".join(deltas) == '{"corrected_sentence": "안녕하세요"}'
+    assert analysis["adjusted_script"] == "안녕하세요"
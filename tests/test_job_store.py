@@ -0,0 +1,117 @@
+import threading
+import time
+
+import pytest
+
+from job_store import STALE_JOB_ERROR, MemoryJobStore, SQLiteJobStore
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return MemoryJobStore()
+    return SQLiteJobStore(str(tmp_path / "jobs.sqlite3"))
+
+
+def test_create_and_get(store):
+    store.create("job1", {"status": "processing"})
+    assert store.get("job1") == {"status": "processing", "version": 1}
+    assert store.get_status("job1") == "processing"
+    assert store.get("missing") is None
+    assert store.get_status("missing") is None
+
+
+def test_transition_only_from_expected_status(store):
+    store.create("job1", {"status": "processing"})
+    assert store.transition("job1", "processing", {"status": "completed", "result": {"score": 1}})
+    # 이미 완료된 작업은 다시 전이되지 않음 (늦게 끝난 오류 처리가 결과를 덮어쓰지 않음)
+    assert not store.transition("job1", "processing", {"status": "error", "error": "late"})
+    assert store.get("job1") == {"status": "completed", "result": {"score": 1}, "version": 2}
+    assert not store.transition("missing", "processing", {"status": "completed"})
+
+
+def test_update_merges_fields_and_keeps_status(store):
+    store.create("job1", {"status": "processing"})
+    assert store.update("job1", {"progress": 0.5, "status": "completed", "version": 99})
+    assert store.get("job1") == {"status": "processing", "progress": 0.5, "version": 2}
+    assert not store.update("missing", {"progress": 1.0})
+
+
+def test_concurrent_transitions_have_single_winner(store):
+    store.create("job1", {"status": "processing"})
+    barrier = threading.Barrier(8)
+    wins = []
+
+    def finish(i):
+        barrier.wait()
+        if store.transition("job1", "processing", {"status": "completed", "result": {"worker": i}}):
+            wins.append(i)
+
+    threads = [threading.Thread(target=finish, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(wins) == 1
+    assert store.get("job1")["result"] == {"worker": wins[0]}
+
+
+def test_create_or_attach_reuses_inflight_job(store):
+    assert store.create_or_attach("job1", {"status": "processing"}, "key", max_age=60) == "job1"
+    assert store.create_or_attach("job2", {"status": "processing"}, "key", max_age=60) == "job1"
+    assert store.get("job2") is None
+
+    store.transition("job1", "processing", {"status": "completed", "result": {}})
+    assert store.create_or_attach("job3", {"status": "processing"}, "key", max_age=60) == "job3"
+
+
+def test_sqlite_store_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / "jobs.sqlite3")
+    SQLiteJobStore(path).create("job1", {"status": "processing"})
+    other = SQLiteJobStore(path)
+    assert other.transition("job1", "processing", {"status": "error", "error": "boom"})
+    assert SQLiteJobStore(path).get("job1") == {"status": "error", "error": "boom", "version": 2}
+
+
+def test_delete_removes_job_and_inflight_attach(store):
+    store.create_or_attach("job1", {"status": "processing"}, "key", max_age=60)
+    store.delete("job1")
+    assert store.get("job1") is None
+    assert store.create_or_attach("job2", {"status": "processing"}, "key", max_age=60) == "job2"
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def leased_store(request, tmp_path):
+    """lease가 짧은 저장소"""
+    if request.param == "memory":
+        return MemoryJobStore(lease=0.2)
+    return SQLiteJobStore(str(tmp_path / "jobs.sqlite3"), lease=0.2)
+
+
+def test_stale_processing_jobs_are_expired(leased_store):
+    leased_store.create("alive", {"status": "processing"})
+    leased_store.create("dead", {"status": "processing"})
+    leased_store.create("done", {"status": "completed", "result": {}})
+    time.sleep(0.3)
+    leased_store.heartbeat(["alive", "missing"])
+
+    assert leased_store.expire_stale() == 1
+    assert leased_store.get("dead") == {"status": "error", "error": STALE_JOB_ERROR, "version": 2}
+    assert leased_store.get_status("alive") == "processing"
+    assert leased_store.get("done")["status"] == "completed"
+    # 늦게 끝난 중단 작업이 오류를 덮어쓰지 않음
+    assert not leased_store.transition("dead", "processing", {"status": "completed", "result": {}})
+
+
+def test_create_or_attach_skips_stale_inflight_job(leased_store):
+    assert leased_store.create_or_attach("dead", {"status": "processing"}, "key", max_age=60) == "dead"
+    assert leased_store.create_or_attach("other", {"status": "processing"}, "key", max_age=60) == "dead"
+    time.sleep(0.3)
+    assert leased_store.create_or_attach("fresh", {"status": "processing"}, "key", max_age=60) == "fresh"
+
+    # heartbeat가 기록되는 작업에는 계속 합류
+    time.sleep(0.15)
+    leased_store.heartbeat(["fresh"])
+    time.sleep(0.1)
+    assert leased_store.create_or_attach("late", {"status": "processing"}, "key", max_age=60) == "fresh"
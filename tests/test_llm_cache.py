@@ -0,0 +1,59 @@
+import asyncio
+import threading
+
+from llm_cache import LLMCache, make_llm_cache_key
+
+
+def _key(prompt: str) -> str:
+    return make_llm_cache_key("gpt-4o-mini", "analysis", 1, prompt)
+
+
+def test_memory_and_disk_hits(tmp_path):
+    db_path = str(tmp_path / "llm.sqlite3")
+    cache = LLMCache(max_entries=1, db_path=db_path, ttl=60)
+    cache.put(_key("a"), "A")
+    cache.put(_key("b"), "B")  # 메모리에서 a 밀려남
+
+    assert cache.get(_key("b")) == "B"
+    assert cache.get(_key("a")) == "A"
+    assert cache.get(_key("c")) is None
+    stats = cache.stats()
+    assert (stats["memory_hits"], stats["disk_hits"], stats["misses"]) == (1, 1, 1)
+
+    # 다른 프로세스(인스턴스)와 디스크 캐시 공유
+    assert LLMCache(db_path=db_path, ttl=60).get(_key("b")) == "B"
+
+
+def test_expired_entries_are_not_returned(tmp_path):
+    cache = LLMCache(db_path=str(tmp_path / "llm.sqlite3"), ttl=-1)
+    cache.put(_key("a"), "A")
+    assert cache.get(_key("a")) is None
+
+
+def test_async_access_runs_sqlite_off_the_event_loop(tmp_path, monkeypatch):
+    db_path = str(tmp_path / "llm.sqlite3")
+    LLMCache(db_path=db_path, ttl=60).put(_key("a"), "A")
+    cache = LLMCache(db_path=db_path, ttl=60)
+
+    disk_threads = []
+    for name in ("_get_disk", "_put_disk"):
+        original = getattr(cache, name)
+
+        def wrapped(*args, _original=original):
+            disk_threads.append(threading.get_ident())
+            return _original(*args)
+
+        monkeypatch.setattr(cache, name, wrapped)
+
+    async def run():
+        loop_thread = threading.get_ident()
+        assert await cache.get_async(_key("a")) == "A"  # 디스크
+        assert await cache.get_async(_key("a")) == "A"  # 메모리 (스레드 사용 없음)
+        await cache.put_async(_key("b"), "B")
+        assert await cache.get_async(_key("b")) == "B"
+        return loop_thread
+
+    loop_thread = asyncio.run(run())
+    assert len(disk_threads) == 2
+    assert loop_thread not in disk_threads
+    assert LLMCache(db_path=db_path, ttl=60).get(_key("b")) == "B"
@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+
+SAMPLE_RATE = 16000
+
+
+@pytest.fixture
+def stub_analyzers(main, monkeypatch):
+    """Whisper / GPT / ffmpeg 대신 고정 결과를 돌려주는 분석 단계"""
+    t = np.arange(SAMPLE_RATE * 3) / SAMPLE_RATE
+    audio = (0.3 * np.sin(2 * np.pi * 150 * t)).astype(np.float32)
+    monkeypatch.setattr(main, "decode_audio", lambda path, sample_rate: audio)
+    monkeypatch.setattr(main, "transcribe_audio", lambda audio, **kwargs: {
+        "text": "안녕하세요", "segments": [{"id": 0, "start": 0.0, "end": 1.0, "text": "안녕하세요", "avg_logprob": -0.1}],
+    })
+    monkeypatch.setattr(main, "analyze_presentation", lambda *args, **kwargs: (
+        "안녕하세요", {"adjusted_script": "안녕하세요", "feedback": {}, "predicted_questions": ["질문"]},
+    ))
+    monkeypatch.setattr(main, "save_features", lambda *args: None)
+    return main
+
+
+@pytest.mark.parametrize("fail", [False, True])
+def test_upload_is_removed_after_job(stub_analyzers, tmp_path, monkeypatch, fail):
+    main = stub_analyzers
+    if fail:
+        def broken(path, sample_rate):
+            raise RuntimeError("decode failed")
+        monkeypatch.setattr(main, "decode_audio", broken)
+
+    save_path = tmp_path / "temp_job.wav"
+    save_path.write_bytes(b"RIFF")
+    main.jobs.create("job-cleanup", {"status": "processing"})
+    try:
+        main.process_audio_job("job-cleanup", str(save_path), '{"target_time": "3:00"}', "0" * 64)
+        assert main.jobs.get("job-cleanup")["status"] == ("error" if fail else "completed")
+    finally:
+        main.jobs.delete("job-cleanup")
+    assert not save_path.exists()
+
+
+class RecordingCache:
+    def __init__(self):
+        self.puts = {}
+
+    def put(self, key, result):
+        self.puts[key] = result
+
+
+def _fail_voice_anxiety(main, monkeypatch):
+    def broken(context):
+        raise RuntimeError("praat failed")
+    monkeypatch.setattr(main, "_voice_anxiety_stage", broken)
+
+
+def _llm_returns(corrected, analysis):
+    def apply(main, monkeypatch):
+        monkeypatch.setattr(main, "analyze_presentation", lambda *args, **kwargs: (corrected, analysis))
+    return apply
+
+
+@pytest.mark.parametrize("degrade, cached", [
+    (None, True),
+    (_fail_voice_anxiety, False),
+    (_llm_returns("안녕하세요", {"adjusted_script": None, "feedback": None, "predicted_questions": None}), False),
+    (_llm_returns("[오류] corrected_sentence 추출 실패", {
+        "adjusted_script": "안녕하세요", "feedback": {}, "predicted_questions": ["질문"],
+    }), False),
+])
+def test_only_complete_results_are_cached(stub_analyzers, tmp_path, monkeypatch, degrade, cached):
+    main = stub_analyzers
+    if degrade:
+        degrade(main, monkeypatch)
+    cache = RecordingCache()
+    monkeypatch.setattr(main, "result_cache", cache)
+
+    save_path = tmp_path / "temp_job.wav"
+    save_path.write_bytes(b"RIFF")
+    main.jobs.create("job-cache", {"status": "processing"})
+    try:
+        main.process_audio_job("job-cache", str(save_path), '{"target_time": "3:00"}', "0" * 64, cache_key="key")
+        # 캐시에 저장하지 않은 결과도 작업 결과로는 그대로 반환
+        assert main.jobs.get("job-cache")["status"] == "completed"
+    finally:
+        main.jobs.delete("job-cache")
+    assert ("key" in cache.puts) == cached
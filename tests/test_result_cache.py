@@ -0,0 +1,30 @@
+from result_cache import ResultCache, make_cache_key
+
+HASH = "ab" * 32
+
+
+def test_cache_key_depends_on_conditions_and_versions():
+    versions = {"scoring": 1, "prompts": {"analysis": 1}}
+    key = make_cache_key(HASH, ".wav", "5:00", versions)
+
+    assert key == make_cache_key(HASH, ".WAV", "5:00", dict(versions))
+    assert key != make_cache_key(HASH, ".wav", "3:00", versions)
+    assert key != make_cache_key(HASH, ".mp4", "5:00", versions)
+    assert key != make_cache_key(HASH, ".wav", "5:00", {**versions, "scoring": 2})
+    assert key != make_cache_key(HASH, ".wav", "5:00", {**versions, "prompts": {"analysis": 2}})
+
+
+def test_put_and_get(tmp_path):
+    cache = ResultCache(cache_dir=str(tmp_path), ttl=60, max_bytes=1 << 20)
+    key = make_cache_key(HASH, ".wav", "5:00", {"scoring": 1})
+    assert cache.get(key) is None
+
+    cache.put(key, {"transcription": "안녕하세요"})
+    assert cache.get(key) == {"transcription": "안녕하세요"}
+
+
+def test_expired_result_is_removed(tmp_path):
+    cache = ResultCache(cache_dir=str(tmp_path), ttl=-1, max_bytes=1 << 20)
+    cache.put("k", {"a": 1})
+    assert cache.get("k") is None
+    assert not any(tmp_path.iterdir())
@@ -0,0 +1,111 @@
+import os
+import threading
+import time
+
+import pytest
+
+from scheduler import AnalysisScheduler, QueueFullError, PRIORITY_AUDIO_ONLY, PRIORITY_VIDEO
+
+
+def _wait_until(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "조건이 시간 안에 충족되지 않음"
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def blocked_scheduler():
+    """슬롯 1개가 release 될 때까지 막혀 있는 스케줄러"""
+    release = threading.Event()
+    started = []
+    done = []
+
+    def job(job_id):
+        started.append(job_id)
+        release.wait(5)
+        done.append(job_id)
+
+    scheduler = AnalysisScheduler(slots=1, queue_size=2, estimated_duration=10.0)
+    scheduler.submit("running", job)
+    _wait_until(lambda: started == ["running"])
+    yield scheduler, job, release, started, done
+    release.set()
+
+
+def test_full_queue_raises_with_estimated_wait(blocked_scheduler):
+    scheduler, job, release, started, done = blocked_scheduler
+    assert scheduler.submit("queued1", job) == 0
+    assert scheduler.submit("queued2", job) == 1
+
+    with pytest.raises(QueueFullError) as exc_info:
+        scheduler.submit("rejected", job)
+    # 대기 2개 + 실행 중 1개, 슬롯 1개, 작업당 10초
+    assert exc_info.value.estimated_wait == pytest.approx(30.0)
+    assert scheduler.status("rejected") is None
+
+    release.set()
+    _wait_until(lambda: len(done) == 3)
+    assert started == ["running", "queued1", "queued2"]
+
+
+def test_audio_only_jobs_run_first_and_status_reports_position(blocked_scheduler):
+    scheduler, job, release, started, done = blocked_scheduler
+    scheduler.submit("video", job, priority=PRIORITY_VIDEO)
+    assert scheduler.submit("audio", job, priority=PRIORITY_AUDIO_ONLY) == 0
+    assert scheduler.status("video") == {"queue_position": 1, "queue_depth": 2, "estimated_wait_seconds": 20}
+
+    release.set()
+    _wait_until(lambda: len(done) == 3)
+    assert started == ["running", "audio", "video"]
+
+
+def test_job_ids_include_running_and_queued_jobs(blocked_scheduler):
+    scheduler, job, release, started, done = blocked_scheduler
+    scheduler.submit("queued1", job)
+    assert sorted(scheduler.job_ids()) == ["queued1", "running"]
+
+    release.set()
+    _wait_until(lambda: done == ["running", "queued1"])
+    _wait_until(lambda: scheduler.job_ids() == [])
+
+
+def test_failing_job_does_not_stop_worker():
+    ran = threading.Event()
+
+    def failing(job_id):
+        raise RuntimeError("boom")
+
+    scheduler = AnalysisScheduler(slots=1, queue_size=4, estimated_duration=1.0)
+    scheduler.submit("bad", failing)
+    scheduler.submit("good", lambda job_id: ran.set())
+    assert ran.wait(5)
+
+
+def test_analysis_returns_429_and_leaves_no_job_when_queue_is_full(main, monkeypatch):
+    from fastapi.testclient import TestClient
+
+    def reject(*args, **kwargs):
+        raise QueueFullError(estimated_wait=42.4)
+
+    created = []
+    create = main.jobs.create
+
+    def record_create(job_id, record):
+        created.append(job_id)
+        create(job_id, record)
+
+    monkeypatch.setattr(main.scheduler, "submit", reject)
+    monkeypatch.setattr(main.jobs, "create", record_create)
+    monkeypatch.setattr(main, "RESULT_CACHE_ENABLED", False)
+    client = TestClient(main.app)
+    response = client.post(
+        "/analysis", files={"video": ("talk.wav", os.urandom(1024))}, data={"metadata": '{"target_time": "3:00"}'}
+    )
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "42"
+    assert response.json()["estimated_wait_seconds"] == 42
+    assert len(created) == 1
+    assert main.jobs.get(created[0]) is None
+    assert not os.path.exists(os.path.join(main.UPLOAD_DIR, f"temp_{created[0]}.wav"))
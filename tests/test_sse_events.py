@@ -0,0 +1,32 @@
+import asyncio
+import json
+
+
+def _parse(message: str):
+    event, data = message.strip().split("\n")
+    return event[len("event: "):], json.loads(data[len("data: "):])
+
+
+def test_replayed_progress_older_than_snapshot_is_skipped(main):
+    from events import EventBroker
+
+    async def run():
+        broker = EventBroker()
+        for version in (2, 3, 4):
+            broker.publish("job:x", "progress", {"version": version, "progress": version / 10})
+        broker.publish("job:x", "delta", {"text": "안녕"})
+        subscription = broker.subscribe("job:x")
+        broker.publish("job:x", "progress", {"version": 5, "progress": 0.5})
+        broker.publish("job:x", "progress", {"version": 5, "progress": 0.5})
+        broker.publish("job:x", "result", {"ok": True})
+        broker.close("job:x")
+        # 클라이언트는 연결 직후 version 3 상태를 이미 받음
+        return [_parse(message) async for message in main._sse_events(subscription, version=3)]
+
+    events = asyncio.run(run())
+    assert events == [
+        ("progress", {"version": 4, "progress": 0.4}),
+        ("delta", {"text": "안녕"}),
+        ("progress", {"version": 5, "progress": 0.5}),
+        ("result", {"ok": True}),
+    ]
@@ -0,0 +1,110 @@
+import asyncio
+import io
+import os
+import time
+
+import pytest
+from fastapi import UploadFile
+
+from utils import upload_session
+from utils.upload_session import (
+    SESSION_DIR_NAME, cleanup_sessions, create_session, finalize_session, get_session_status, save_chunk,
+)
+
+
+def _send(upload_id, index, data, upload_dir):
+    upload_file = UploadFile(file=io.BytesIO(data), filename=f"part{index}.mp4")
+    return asyncio.run(save_chunk(upload_id, index, upload_file, str(upload_dir)))
+
+
+def test_chunks_reassemble_in_index_order(tmp_path):
+    parts = [b"first-", b"second-", b"third"]
+    manifest = create_session("talk.mp4", len(parts), str(tmp_path))
+    upload_id = manifest["upload_id"]
+
+    # 순서와 무관하게 도착하고, 재전송된 청크는 덮어씀
+    _send(upload_id, 2, parts[2], tmp_path)
+    _send(upload_id, 0, b"stale", tmp_path)
+    _send(upload_id, 0, parts[0], tmp_path)
+    status = get_session_status(upload_id, str(tmp_path))
+    assert status["missing_chunks"] == [1]
+    assert not status["complete"]
+
+    with pytest.raises(ValueError):
+        finalize_session(upload_id, str(tmp_path))
+
+    status = _send(upload_id, 1, parts[1], tmp_path)
+    assert status["complete"]
+    merged_path = finalize_session(upload_id, str(tmp_path))
+    with open(merged_path, "rb") as f:
+        assert f.read() == b"".join(parts)
+    assert os.path.splitext(merged_path)[1] == ".mp4"
+    assert not os.path.exists(os.path.join(tmp_path, SESSION_DIR_NAME, upload_id))
+
+    # 병합이 끝난 세션은 다시 병합할 수 없음
+    with pytest.raises(FileNotFoundError):
+        finalize_session(upload_id, str(tmp_path))
+
+
+def test_out_of_range_chunk_index_is_rejected(tmp_path):
+    upload_id = create_session("talk.wav", 2, str(tmp_path))["upload_id"]
+    with pytest.raises(ValueError):
+        _send(upload_id, 2, b"x", tmp_path)
+    with pytest.raises(ValueError):
+        _send(upload_id, -1, b"x", tmp_path)
+
+
+def test_create_session_with_existing_id_returns_existing(tmp_path):
+    first = create_session("talk.wav", 3, str(tmp_path), upload_id="fixed_id")
+    again = create_session("other.wav", 5, str(tmp_path), upload_id="fixed_id")
+    assert again == first
+
+
+def test_cleanup_removes_only_expired_sessions(tmp_path):
+    old_id = create_session("old.wav", 2, str(tmp_path))["upload_id"]
+    new_id = create_session("new.wav", 2, str(tmp_path))["upload_id"]
+    old_dir = os.path.join(tmp_path, SESSION_DIR_NAME, old_id)
+    past = time.time() - 3600
+    for path in (old_dir, os.path.join(old_dir, upload_session.BITMAP_NAME)):
+        os.utime(path, (past, past))
+
+    assert cleanup_sessions(str(tmp_path), ttl=60) == 1
+    with pytest.raises(FileNotFoundError):
+        get_session_status(old_id, str(tmp_path))
+    assert get_session_status(new_id, str(tmp_path))["total_chunks"] == 2
+
+
+def test_reset_session_clears_received_chunks(tmp_path):
+    upload_id = create_session("talk.wav", 2, str(tmp_path))["upload_id"]
+    _send(upload_id, 0, b"a", tmp_path)
+    _send(upload_id, 1, b"b", tmp_path)
+
+    status = upload_session.reset_session(upload_id, str(tmp_path))
+    assert status["missing_chunks"] == [0, 1]
+    assert not status["complete"]
+
+
+def test_legacy_upload_restarted_without_upload_id(main, monkeypatch):
+    from fastapi.testclient import TestClient
+
+    started = []
+    monkeypatch.setattr(main, "start_analysis_job", lambda job_id, save_path, metadata, content_hash: (
+        started.append(open(save_path, "rb").read()) or {"job_id": job_id}
+    ))
+    client = TestClient(main.app)
+
+    def send(index, data):
+        return client.post("/analysis", files={"video": ("blob.wav", data)}, data={
+            "metadata": "{}", "chunk_index": index, "total_chunks": 3, "original_filename": "talk.wav",
+        })
+
+    # 두 청크까지 보내고 중단한 뒤 처음부터 다시 보냄
+    assert send(0, b"old0-").json()["status"] == "chunk_received"
+    assert send(1, b"old1-").json()["status"] == "chunk_received"
+    assert send(0, b"new0-").json()["status"] == "chunk_received"
+    # 이전 시도의 1번 청크로는 완료되지 않음
+    assert send(2, b"new2").json()["status"] == "chunk_received"
+    assert started == []
+    assert send(1, b"new1-").status_code == 200
+    assert started == [b"new0-new1-new2"]
+
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from utils.vad import detect_speech_regions, map_chunk_time, split_speech_chunks
+
+SR = 16000
+
+
+def _tone(seconds, amplitude=0.3):
+    t = np.arange(int(seconds * SR)) / SR
+    return (amplitude * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+
+def _silence(seconds):
+    rng = np.random.default_rng(0)
+    return (1e-4 * rng.standard_normal(int(seconds * SR))).astype(np.float32)
+
+
+def test_map_chunk_time_skips_removed_silence():
+    # 조각 = 원본 1~2초 + 5~7초 (사이 3초 침묵 제거)
+    regions = [(1 * SR, 2 * SR), (5 * SR, 7 * SR)]
+    assert map_chunk_time(0.0, regions, SR) == pytest.approx(1.0)
+    assert map_chunk_time(0.5, regions, SR) == pytest.approx(1.5)
+    assert map_chunk_time(1.0, regions, SR) == pytest.approx(2.0)
+    assert map_chunk_time(1.5, regions, SR) == pytest.approx(5.5)
+    assert map_chunk_time(3.0, regions, SR) == pytest.approx(7.0)
+    # 조각 끝을 넘는 타임스탬프는 마지막 구간 끝에서 연장
+    assert map_chunk_time(3.25, regions, SR) == pytest.approx(7.25)
+
+
+def test_detect_speech_regions_finds_tones_between_long_silences():
+    audio = np.concatenate([_silence(2), _tone(1.5), _silence(3), _tone(2), _silence(1)])
+    regions = detect_speech_regions(audio, SR)
+
+    assert len(regions) == 2
+    expected = [(2.0, 3.5), (6.5, 8.5)]
+    for (start, end), (exp_start, exp_end) in zip(regions, expected):
+        # 앞뒤 여유(PAD_SECONDS) + 프레임 단위 오차
+        assert start / SR == pytest.approx(exp_start, abs=0.3)
+        assert end / SR == pytest.approx(exp_end, abs=0.3)
+
+
+def test_short_pause_does_not_split_region():
+    audio = np.concatenate([_silence(1), _tone(1), _silence(0.2), _tone(1), _silence(1)])
+    assert len(detect_speech_regions(audio, SR)) == 1
+
+
+def test_split_speech_chunks_respects_max_length_and_order():
+    regions = [(0, 3 * SR), (4 * SR, 6 * SR), (7 * SR, 19 * SR)]
+    chunks = split_speech_chunks(regions, SR, max_chunk_seconds=5)
+
+    for chunk in chunks:
+        assert sum(end - start for start, end in chunk) <= 5 * SR
+    flattened = [piece for chunk in chunks for piece in chunk]
+    # 모든 음성이 빠짐없이 순서대로 포함되고, 긴 구간만 고정 길이로 분할
+    assert flattened[0] == (0, 3 * SR)
+    assert sum(end - start for start, end in flattened) == sum(end - start for start, end in regions)
+    assert all(a[1] <= b[0] for a, b in zip(flattened, flattened[1:]))
+
+
+def test_chunk_timestamps_map_back_to_original_audio():
+    regions = [(int(0.5 * SR), 2 * SR), (4 * SR, int(5.5 * SR))]
+    (chunk,) = split_speech_chunks(regions, SR, max_chunk_seconds=10)
+    # 이어 붙인 오디오의 2초 지점 = 첫 구간 1.5초 + 두 번째 구간 0.5초 → 원본 4.5초
+    assert map_chunk_time(2.0, chunk, SR) == pytest.approx(4.5)
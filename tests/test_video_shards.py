@@ -0,0 +1,94 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+cv2 = pytest.importorskip("cv2")
+pytest.importorskip("mediapipe")
+
+from anxiety import facial_feature  # noqa: E402
+
+FPS = 30
+FRAMES = 150
+
+
+@pytest.fixture(scope="module")
+def numbered_clip(tmp_path_factory):
+    """프레임마다 내용이 다른 mp4 (프레임 간 압축)"""
+    path = str(tmp_path_factory.mktemp("video") / "numbered.mp4")
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"mp4v"), FPS, (160, 120))
+    for i in range(FRAMES):
+        frame = np.zeros((120, 160, 3), np.uint8)
+        frame[:, :, 1] = (i * 7) % 256
+        cv2.putText(frame, str(i), (10, 80), cv2.FONT_HERSHEY_SIMPLEX, 1.5, (255, 255, 255), 3)
+        writer.write(frame)
+    writer.release()
+    return path
+
+
+@pytest.fixture(scope="module")
+def sequential_frames(numbered_clip):
+    cap = cv2.VideoCapture(numbered_clip)
+    frames = []
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    cap.release()
+    assert len(frames) == FRAMES
+    return frames
+
+
+def _decode(path, start, end, step=1):
+    frames = queue.Queue()
+    facial_feature._decode_frames(path, start, end, step, frames, threading.Event())
+    items = []
+    while True:
+        index, frame = frames.get_nowait()
+        if frame is None:
+            return items, index
+        items.append((index, frame))
+
+
+@pytest.mark.parametrize("start", [0, 37, 90])
+def test_shard_frames_match_sequential_decode(numbered_clip, sequential_frames, start):
+    items, end_index = _decode(numbered_clip, start, start + 30, step=3)
+    assert end_index == start + 30
+    assert [index for index, _ in items] == [i for i in range(start, start + 30) if i % 3 == 0]
+    for index, frame in items:
+        np.testing.assert_array_equal(frame, sequential_frames[index])
+
+
+def test_inexact_seek_falls_back_to_sequential_decode(numbered_clip, sequential_frames, monkeypatch):
+    real_capture = cv2.VideoCapture
+
+    class InexactSeekCapture:
+        """탐색하면 요청보다 5프레임 앞에 멈추는 디코더"""
+
+        def __init__(self, path):
+            self._cap = real_capture(path)
+
+        def set(self, prop, value):
+            return self._cap.set(prop, max(0, value - 5))
+
+        def __getattr__(self, name):
+            return getattr(self._cap, name)
+
+    monkeypatch.setattr(facial_feature.cv2, "VideoCapture", InexactSeekCapture)
+    items, _ = _decode(numbered_clip, 60, 70)
+    assert [index for index, _ in items] == list(range(60, 70))
+    for index, frame in items:
+        np.testing.assert_array_equal(frame, sequential_frames[index])
+
+
+def test_sharded_extraction_covers_each_sample_once(numbered_clip):
+    single = facial_feature.extract_landmarks(numbered_clip, analysis_fps=10)
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        sharded = facial_feature.extract_landmarks(numbered_clip, analysis_fps=10, executor=executor, shard_seconds=1.5)
+
+    np.testing.assert_array_equal(sharded[0], single[0])
+    assert sharded[2] == single[2] == FRAMES
+    assert sharded[1].shape == single[1].shape
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("parselmouth")
+
+from anxiety.voice_feature import extract_features_by_window  # noqa: E402
+
+SAMPLE_RATE = 16000
+
+
+def _voiced_signal(f0_per_second, tail_seconds=0.5, seed=0):
+    """초마다 기본 주파수가 다른 성대음 유사 신호 (f0 0은 무음에 가까운 잡음)"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(SAMPLE_RATE) / SAMPLE_RATE
+    parts = []
+    for f0 in f0_per_second:
+        if f0 == 0:
+            parts.append(0.001 * rng.standard_normal(SAMPLE_RATE))
+            continue
+        # 약간의 주기 흔들림(jitter)과 진폭 흔들림(shimmer)
+        frequency = f0 * (1 + 0.01 * np.sin(2 * np.pi * 3 * t))
+        phase = 2 * np.pi * np.cumsum(frequency) / SAMPLE_RATE
+        wave = sum((0.5 / k) * np.sin(k * phase) for k in range(1, 8))
+        parts.append(0.3 * wave * (1 + 0.05 * np.sin(2 * np.pi * 5 * t)))
+    parts.append(0.001 * rng.standard_normal(int(SAMPLE_RATE * tail_seconds)))
+    return np.concatenate(parts).astype(np.float32)
+
+
+@pytest.fixture(scope="module")
+def features():
+    signal = _voiced_signal([120, 0, 150, 180, 0, 210, 140, 160])
+    whole = extract_features_by_window(signal, sample_rate=SAMPLE_RATE, mode="whole")
+    window = extract_features_by_window(signal, sample_rate=SAMPLE_RATE, mode="window")
+    return whole, window
+
+
+def test_whole_signal_mode_has_same_shape(features):
+    whole, window = features
+    for whole_series, window_series in zip(whole, window):
+        # 8.5초 → 1초 윈도우 8개 (남는 구간은 제외)
+        assert whole_series.shape == window_series.shape == (8,)
+
+
+def test_whole_signal_mode_matches_per_window_f0(features):
+    (whole_f0, _, _), (window_f0, _, _) = features
+    np.testing.assert_allclose(whole_f0, window_f0, rtol=1e-3)
+    np.testing.assert_allclose(whole_f0, [120, 0, 150, 180, 0, 210, 140, 160], rtol=1e-3)
+    # 목소리가 끝난 직후의 무음 윈도우에 앞 윈도우 F0가 섞이지 않음
+    assert whole_f0[1] == whole_f0[4] == 0.0
+
+
+def test_whole_signal_mode_approximates_per_window_jitter_and_shimmer(features):
+    (_, whole_jitter, whole_shimmer), (_, window_jitter, window_shimmer) = features
+    # 윈도우 경계의 주기 몇 개만 다르므로 근사적으로 같음
+    np.testing.assert_allclose(whole_jitter, window_jitter, rtol=0.15, atol=1e-5)
+    np.testing.assert_allclose(whole_shimmer, window_shimmer, rtol=0.05, atol=1e-4)
+    assert np.array_equal(whole_jitter == 0, window_jitter == 0)